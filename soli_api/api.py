@@ -1,24 +1,45 @@
 """Main API module to define the FastAPI app and its configuration"""
 
 # imports
+import functools
 import logging
+import math
 import os
+import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 # packages
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from soli import SOLI
-from alea_llm_client import OpenAIModel, AnthropicModel, VLLMModel
+from alea_llm_client import BaseAIModel, OpenAIModel, AnthropicModel, VLLMModel
 
 # project imports
+import soli_api.routes.graph
 import soli_api.routes.info
 import soli_api.routes.root
 import soli_api.routes.search
 import soli_api.routes.taxonomy
 from soli_api.api_config import load_config
+from soli_api.cache import LRUCache
+from soli_api.closure import ClosureIndex
+from soli_api.embeddings import load_embedding_index
+from soli_api.executor import SearchExecutor, SearchQueueFullError
+from soli_api.graph_index import GraphIndex
+from soli_api.llm_batch import LLMBatchRunner, LLMBatchStore
+from soli_api.llm_cache import DEFAULT_RESULT_LIMIT, DEFAULT_TTL, LLMSearchCache
+from soli_api.llm_client import LLMUnavailableError, load_managed_llm
+from soli_api.llm_router import load_llm_router
+from soli_api.http_cache import ConditionalGetMiddleware, ontology_version
+from soli_api.materialize import ClassRenderCache
+from soli_api.reload import OntologyReloader, ParentReloader
+from soli_api.rerank import load_retriever
+from soli_api.search_engine import SearchEngine
+from soli_api.snapshot import load_snapshot, load_source, save_snapshot, snapshot_source
+from soli_api.suggest import SuggestIndex
 
 
 @asynccontextmanager
@@ -56,34 +77,322 @@ async def lifespan_handler(app_instance: FastAPI):
     log_handler.setFormatter(log_formatter)
     app_instance.state.logger.addHandler(log_handler)
 
-    # initialize the SOLI instance
-    app_instance.state.soli = initialize_soli(
-        app_instance.state.config["soli"],
-        app_instance.state.config["llm"],
+    # load the graph unless a pre-forking parent already did
+    if getattr(app_instance.state, "soli", None) is None:
+        initialize_state(app_instance)
+    else:
+        app_instance.state.logger.info("Using preloaded SOLI instance")
+
+    # start the search pool in this process; pools do not survive a fork
+    app_instance.state.search_executor = create_search_executor(
+        app_instance.state.config, app_instance.state.search_engine
+    )
+    app_instance.state.logger.info(
+        "Search executor started in %s mode with %d workers",
+        app_instance.state.search_executor.mode,
+        app_instance.state.search_executor.max_workers,
     )
 
-    # log it
+    # open the LLM search cache in this process; connections do not survive a fork
+    llm_cache_config = app_instance.state.config.get("llm_cache", {})
+    app_instance.state.llm_cache = LLMSearchCache(
+        llm_cache_config.get("path", None),
+        model=getattr(
+            app_instance.state.soli.llm,
+            "model",
+            app_instance.state.config["llm"].get("model", ""),
+        ),
+        ontology_version=app_instance.state.ontology_version,
+        ttl=llm_cache_config.get("ttl", DEFAULT_TTL),
+        retriever=load_retriever(
+            app_instance.state.search_engine,
+            app_instance.state.config.get("llm_rerank", {}),
+        ),
+        result_limit=llm_cache_config.get("result_limit", DEFAULT_RESULT_LIMIT),
+    )
     app_instance.state.logger.info(
-        "SOLI instance initialized with llm %s", app_instance.state.soli.llm.model
+        "Purged %d expired LLM search cache entries",
+        app_instance.state.llm_cache.purge_expired(),
+    )
+
+    # run batch LLM jobs in this process's event loop, recording them in the LLM
+    # search cache database so every worker can report on them
+    llm_batch_config = app_instance.state.config.get("llm_batch", {})
+    app_instance.state.llm_batch = LLMBatchRunner(
+        app_instance.state.llm_cache,
+        store=(
+            LLMBatchStore(llm_cache_config["path"])
+            if llm_cache_config.get("path", None) is not None
+            else None
+        ),
+        batch_size=llm_batch_config.get("batch_size", 8),
+        max_concurrency=llm_batch_config.get("max_concurrency", 4),
+        max_retries=llm_batch_config.get("max_retries", 3),
+        backoff=llm_batch_config.get("backoff", 1.0),
+        max_jobs=llm_batch_config.get("max_jobs", 16),
+        job_ttl=llm_batch_config.get("job_ttl", 3600),
     )
 
+    # reload the graph in the background on request or on a schedule; under a
+    # pre-forking parent, the parent reloads once and replaces the workers
+    if getattr(app_instance.state, "reload_parent", None) is not None:
+        app_instance.state.reloader = ParentReloader(
+            app_instance.state.reload_parent, app_instance.state.reload_status
+        )
+    else:
+        app_instance.state.reloader = OntologyReloader(
+            functools.partial(prepare_reload, app_instance),
+            poll_interval=app_instance.state.config.get("reload", {}).get(
+                "poll_interval", None
+            ),
+        )
+        app_instance.state.reloader.start_polling()
+
     yield
 
     # log shutdown
     app_instance.state.logger.info("Shutting down API")
+    app_instance.state.reloader.shutdown()
+    app_instance.state.search_executor.shutdown()
+    await app_instance.state.llm_batch.shutdown()
+    app_instance.state.llm_batch.close()
+    app_instance.state.llm_cache.close()
 
 
-def initialize_soli(soli_config: Dict[str, Any], llm_config: Dict[str, Any]) -> SOLI:
-    """Initialize SOLI instance based on configuration
+async def search_queue_full_handler(
+    _request: Request, exc: SearchQueueFullError
+) -> JSONResponse:
+    """Reject a search with 503 while the search pool's queue is full
 
     Args:
-        soli_config (Dict[str, Any]): SOLI configuration dictionary
-        llm_config (Dict[str, Any]): LLM configuration dictionary
+        _request (Request): FastAPI request object
+        exc (SearchQueueFullError): Queue full error
 
     Returns:
-        SOLI: Initialized SOLI instance
+        JSONResponse: 503 response asking the client to retry
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"message": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def llm_unavailable_handler(
+    _request: Request, exc: LLMUnavailableError
+) -> JSONResponse:
+    """Reject an LLM search that was refused or abandoned by the managed LLM client
+
+    Args:
+        _request (Request): FastAPI request object
+        exc (LLMUnavailableError): Queue full, circuit open or timeout error
+
+    Returns:
+        JSONResponse: 429, 503 or 504 response asking the client to retry
+    """
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"message": str(exc)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+def initialize_state(app_instance: FastAPI) -> None:
+    """Load the SOLI graph and build every structure derived from it on the app state
+
+    Args:
+        app_instance (FastAPI): FastAPI app instance with state.config set
+
+    Returns:
+        None
+    """
+    config = app_instance.state.config
+    logger = logging.getLogger("soli_api")
+
+    # initialize the SOLI instance
+    soli = initialize_soli(config["soli"], config["llm"])
+
+    # log it
+    logger.info("SOLI instance initialized with llm %s", soli.llm.model)
+
+    for name, value in build_state(config, soli).items():
+        setattr(app_instance.state, name, value)
+
+
+def build_state(
+    config: Dict[str, Any], soli: SOLI, version: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build every structure derived from a loaded SOLI graph
+
+    Args:
+        config (Dict[str, Any]): API configuration dictionary
+        soli (SOLI): Loaded SOLI instance
+        version (Optional[str]): Ontology version of soli, if already computed
+
+    Returns:
+        Dict[str, Any]: App state attributes by name, including the graph itself
+    """
+    logger = logging.getLogger("soli_api")
+    state: Dict[str, Any] = {"soli": soli}
+
+    # record the ontology version for cache validators
+    state["ontology_version"] = version or ontology_version(soli)
+    state["ontology_loaded"] = time.time()
+
+    # build the relation adjacency and hierarchy closure for graph queries
+    state["graph_index"] = GraphIndex(soli)
+    state["closure_index"] = ClosureIndex(state["graph_index"])
+
+    # build the typeahead index
+    state["suggest_index"] = SuggestIndex(soli)
+    state["search_engine"] = SearchEngine(
+        soli,
+        workers=config.get("search_executor", {}).get("scorer_workers", 1),
+        embedding_index=load_embedding_index(
+            soli,
+            config.get("embeddings", {}),
+            state["ontology_version"],
+        ),
+        closure_index=state["closure_index"],
+    )
+
+    # set up the response caches
+    cache_config = config.get("cache", {})
+    state["taxonomy_cache"] = LRUCache(
+        max_entries=cache_config.get("taxonomy_max_entries", 512)
+    )
+    state["search_cache"] = LRUCache(
+        max_entries=cache_config.get("search_max_entries", 4096),
+        max_bytes=cache_config.get("search_max_bytes", 64 * 1024 * 1024),
+        ttl=cache_config.get("search_ttl", 3600),
+    )
+    state["render_cache"] = ClassRenderCache(
+        soli,
+        mode=cache_config.get("materialize", "lazy"),
+        max_entries=cache_config.get("class_max_entries", 8192),
+        eager_formats=cache_config.get("materialize_formats", None),
+    )
+    if state["render_cache"].mode == "eager":
+        logger.info(
+            "Materialized %d class bodies",
+            state["render_cache"].materialize(),
+        )
+
+    return state
+
+
+def create_search_executor(
+    config: Dict[str, Any], search_engine: SearchEngine
+) -> SearchExecutor:
+    """Start the search pool described by the configuration
+
+    Args:
+        config (Dict[str, Any]): API configuration dictionary
+        search_engine (SearchEngine): Search engine over the loaded graph
+
+    Returns:
+        SearchExecutor: Search pool
+    """
+    executor_config = config.get("search_executor", {})
+    return SearchExecutor(
+        search_engine,
+        mode=executor_config.get("mode", "thread"),
+        max_workers=executor_config.get("max_workers", 4),
+        max_pending=executor_config.get("max_pending", 64),
+    )
+
+
+def reload_state(app_instance: FastAPI) -> Optional[Dict[str, Any]]:
+    """Load the SOLI graph again from its source and build its derived state
+
+    Nothing on the app state is changed here.
+
+    Args:
+        app_instance (FastAPI): FastAPI app instance with a loaded graph
+
+    Returns:
+        Optional[Dict[str, Any]]: App state attributes by name, or None if the
+            ontology has not changed
+    """
+    config = app_instance.state.config
+    logger = logging.getLogger("soli_api")
+
+    # keep the current LLM backends so their limits and breakers carry over
+    soli = refresh_soli(config["soli"], app_instance.state.soli.llm)
+
+    # skip indexing and the snapshot rewrite when nothing changed
+    version = ontology_version(soli)
+    if version == app_instance.state.ontology_version:
+        logger.info("Reloaded SOLI ontology is unchanged")
+        return None
+
+    state = build_state(config, soli, version)
+
+    # refresh the snapshot so the next start loads this version
+    snapshot_path = config["soli"].get("snapshot", {}).get("path", None)
+    if snapshot_path is not None:
+        save_snapshot(soli, snapshot_path, snapshot_source(config["soli"]))
+
+    return state
+
+
+def prepare_reload(app_instance: FastAPI) -> Optional[Callable[[], None]]:
+    """Load the SOLI graph again from its source and build its derived state
+
+    Runs off the event loop.  Nothing on the app state is changed here; the returned
+    function swaps the new state in and must be called on the event loop.
+
+    Args:
+        app_instance (FastAPI): FastAPI app instance with a loaded graph
+
+    Returns:
+        Optional[Callable[[], None]]: Function swapping in the new state, or None if
+            the ontology has not changed
+    """
+    config = app_instance.state.config
+    logger = logging.getLogger("soli_api")
+
+    state = reload_state(app_instance)
+    if state is None:
+        return None
+
+    retriever = load_retriever(state["search_engine"], config.get("llm_rerank", {}))
+
+    def swap() -> None:
+        """Replace the app state with the reloaded graph and its derived state
+
+        Returns:
+            None
+        """
+        old_executor = app_instance.state.search_executor
+        executor = create_search_executor(config, state["search_engine"])
+
+        # no awaits below, so no request sees a partly swapped state
+        for name, value in state.items():
+            setattr(app_instance.state, name, value)
+        app_instance.state.search_executor = executor
+        app_instance.state.llm_cache.set_ontology(state["ontology_version"], retriever)
+
+        # let searches already queued on the old graph finish there
+        old_executor.shutdown(cancel_pending=False)
+        logger.info(
+            "Swapped in SOLI ontology %s with %d classes",
+            state["ontology_version"],
+            len(state["soli"].classes),
+        )
+
+    return swap
+
+
+def create_llm(llm_config: Dict[str, Any]) -> Optional[BaseAIModel]:
+    """Create an LLM model from one backend's configuration
+
+    Args:
+        llm_config (Dict[str, Any]): LLM backend configuration dictionary
+
+    Returns:
+        Optional[BaseAIModel]: LLM model, or None for an unknown type
     """
-    # initialize an llm
     llm_engine = llm_config.get("type", "openai").lower().strip()
     llm_model = llm_config.get("model", "gpt-4o").lower().strip()
     llm_endpoint = llm_config.get("endpoint", None)
@@ -97,34 +406,81 @@ def initialize_soli(soli_config: Dict[str, Any], llm_config: Dict[str, Any]) ->
         }
         if llm_endpoint is not None:
             llm_args["endpoint"] = llm_endpoint
-        llm = OpenAIModel(**llm_args)
-    elif llm_engine in ("anthropic",):
+        return OpenAIModel(**llm_args)
+    if llm_engine in ("anthropic",):
         llm_args = {
             "model": llm_model,
             "api_key": llm_api_key,
         }
         if llm_endpoint is not None:
             llm_args["endpoint"] = llm_endpoint
-        llm = AnthropicModel(**llm_args)
-    elif llm_engine in ("vllm",):
+        return AnthropicModel(**llm_args)
+    if llm_engine in ("vllm",):
         llm_args = {
             "model": llm_model,
             "api_key": llm_api_key,
         }
         if llm_endpoint is not None:
             llm_args["endpoint"] = llm_endpoint
-        llm = VLLMModel(**llm_args)
-    else:
-        llm = None
+        return VLLMModel(**llm_args)
+    return None
 
-    return SOLI(
-        source_type=soli_config["source"],
-        github_repo_owner=soli_config["repository"].split("/")[0],
-        github_repo_name=soli_config["repository"].split("/")[1],
-        github_repo_branch=soli_config["branch"],
-        use_cache=True,
-        llm=llm,
-    )
+
+def initialize_soli(soli_config: Dict[str, Any], llm_config: Dict[str, Any]) -> SOLI:
+    """Initialize SOLI instance based on configuration
+
+    Args:
+        soli_config (Dict[str, Any]): SOLI configuration dictionary
+        llm_config (Dict[str, Any]): LLM configuration dictionary
+
+    Returns:
+        SOLI: Initialized SOLI instance
+    """
+    # create the primary llm and any further backends, each with its own limits
+    backends = []
+    for backend_config in [llm_config, *llm_config.get("backends", [])]:
+        backend = load_managed_llm(
+            create_llm(backend_config),
+            backend_config.get("client", llm_config.get("client", {})),
+        )
+        if backend is not None:
+            backends.append(backend)
+
+    # route calls between the backends by health and latency
+    llm = load_llm_router(backends, llm_config.get("routing", {}))
+
+    # load from a fresh local snapshot if one is configured
+    snapshot_config = soli_config.get("snapshot", {})
+    snapshot_path = snapshot_config.get("path", None)
+    if snapshot_path is not None:
+        soli = load_snapshot(
+            snapshot_path,
+            source=snapshot_source(soli_config),
+            max_age=snapshot_config.get("max_age", None),
+            llm=llm,
+        )
+        if soli is not None:
+            return soli
+
+    # otherwise load from the source and refresh the snapshot for the next start
+    soli = load_source(soli_config, llm=llm)
+    if snapshot_path is not None:
+        save_snapshot(soli, snapshot_path, snapshot_source(soli_config))
+
+    return soli
+
+
+def refresh_soli(soli_config: Dict[str, Any], llm: Optional[BaseAIModel]) -> SOLI:
+    """Load the SOLI graph from its source, bypassing the local snapshot and file cache
+
+    Args:
+        soli_config (Dict[str, Any]): SOLI configuration dictionary
+        llm (Optional[BaseAIModel]): LLM to attach to the SOLI instance
+
+    Returns:
+        SOLI: Loaded SOLI instance
+    """
+    return load_source(soli_config, llm=llm, use_cache=False)
 
 
 def get_app() -> FastAPI:
@@ -148,6 +504,12 @@ def get_app() -> FastAPI:
         lifespan=lifespan_handler,
     )
 
+    # Add ETag/Last-Modified validators and answer conditional GETs.
+    app_instance.add_middleware(
+        ConditionalGetMiddleware,  # type: ignore
+        policies=config.get("http_cache", {}),
+    )
+
     # Enable CORS as this is a public API by default.
     app_instance.add_middleware(
         CORSMiddleware,  # type: ignore
@@ -157,10 +519,20 @@ def get_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Shed search load instead of queueing without bound.
+    app_instance.add_exception_handler(
+        SearchQueueFullError, search_queue_full_handler  # type: ignore
+    )
+    app_instance.add_exception_handler(
+        LLMUnavailableError, llm_unavailable_handler  # type: ignore
+    )
+
     # Attach the routes
+    # search comes before root so /search is not taken for an IRI by /{iri}
     app_instance.include_router(soli_api.routes.info.router)
-    app_instance.include_router(soli_api.routes.root.router)
     app_instance.include_router(soli_api.routes.search.router)
+    app_instance.include_router(soli_api.routes.graph.router)
+    app_instance.include_router(soli_api.routes.root.router)
     app_instance.include_router(soli_api.routes.taxonomy.router)
 
     return app_instance
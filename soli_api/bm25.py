@@ -0,0 +1,242 @@
+"""
+Inverted index with BM25 ranking for searching class definitions.
+"""
+
+# imports
+import functools
+import heapq
+import math
+import re
+from typing import Container, Dict, Iterable, List, Optional, Tuple
+
+# project
+from soli_api.suggest import fold_text
+
+# BM25 parameters
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# alphanumeric runs in folded text
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# common English words that carry no ranking signal
+STOP_WORDS = frozenset(
+    (
+        "a an and are as at be been by for from has have in is it its of on or that "
+        "the their this to was were which with"
+    ).split()
+)
+
+# suffixes removed by the stemmer, longest first, with the shortest stem allowed
+SUFFIXES: Tuple[Tuple[str, str, int], ...] = (
+    ("ational", "ate", 3),
+    ("ization", "ize", 3),
+    ("fulness", "ful", 3),
+    ("iveness", "ive", 3),
+    ("ations", "ate", 3),
+    ("ments", "", 4),
+    ("ities", "", 4),
+    ("ation", "ate", 3),
+    ("ness", "", 3),
+    ("ment", "", 4),
+    ("ings", "", 3),
+    ("ies", "y", 2),
+    ("ity", "", 4),
+    ("ing", "", 3),
+    ("ers", "", 3),
+    ("ed", "", 3),
+    ("er", "", 3),
+    ("ly", "", 3),
+    ("s", "", 3),
+)
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """
+    Reduce a token to a crude stem by removing one common English suffix and then a
+    final "e", so "lease", "leases", "leased" and "leasing" share a stem.
+
+    Args:
+        token (str): Lowercase token
+
+    Returns:
+        str: Stemmed token
+    """
+    for suffix, replacement, min_stem in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= min_stem:
+            if suffix == "s" and token.endswith(("ss", "us", "is")):
+                break
+            token = token[: -len(suffix)] + replacement
+            break
+
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into folded, stemmed tokens without stop words.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        List[str]: Tokens
+    """
+    folded = text.lower() if text.isascii() else fold_text(text)
+    return [
+        stem(token)
+        for token in TOKEN_PATTERN.findall(folded)
+        if token not in STOP_WORDS
+    ]
+
+
+class BM25Index:
+    """
+    Inverted index over short documents, ranked with BM25.
+
+    Each posting stores its precomputed BM25 term weight and each term's postings are
+    ordered by weight, so a query only sums weights with top_k().
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[Tuple[int, str]],
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            documents (Iterable[Tuple[int, str]]): Document IDs and text
+            k1 (float): BM25 term frequency saturation
+            b (float): BM25 length normalization
+
+        Returns:
+            None
+        """
+        term_counts: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lengths: Dict[int, int] = {}
+        for doc_id, text in documents:
+            tokens = tokenize(text)
+            doc_lengths[doc_id] = len(tokens)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                term_counts.setdefault(token, []).append((doc_id, count))
+
+        self.num_docs = len(doc_lengths)
+        average_length = sum(doc_lengths.values()) / max(1, self.num_docs)
+
+        # postings as (weight, doc ID) sorted by descending weight
+        self._postings: Dict[str, List[Tuple[float, int]]] = {}
+        for token, postings in term_counts.items():
+            idf = math.log(
+                1.0 + (self.num_docs - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            weighted = []
+            for doc_id, count in postings:
+                length_norm = 1.0 - b + b * doc_lengths[doc_id] / average_length
+                weighted.append(
+                    (idf * count * (k1 + 1.0) / (count + k1 * length_norm), doc_id)
+                )
+            weighted.sort(key=lambda posting: -posting[0])
+            self._postings[token] = weighted
+
+    def __len__(self) -> int:
+        """
+        Get the number of indexed documents.
+
+        Returns:
+            int: Number of documents
+        """
+        return self.num_docs
+
+    def postings(self, token: str) -> List[Tuple[float, int]]:
+        """
+        Get the weighted postings for a stemmed token.
+
+        Args:
+            token (str): Token from tokenize()
+
+        Returns:
+            List[Tuple[float, int]]: BM25 weights and document IDs, best first
+        """
+        return self._postings.get(token, [])
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        Get the top documents for a query.
+
+        Args:
+            query (str): Query text
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Tuple[int, float]]: Document IDs and BM25 scores, best first
+        """
+        return top_k(
+            [(1.0, self.postings(token)) for token in dict.fromkeys(tokenize(query))],
+            limit,
+        )
+
+
+def top_k(
+    weighted_postings: List[Tuple[float, List[Tuple[float, int]]]],
+    limit: int,
+    allowed: Optional[Container[int]] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Sum boosted posting weights per document and keep the top k.
+
+    Posting lists are processed from the highest possible contribution down; once the
+    remaining lists cannot lift a document not yet seen into the top k, they only
+    update documents already scored.
+
+    Args:
+        weighted_postings (List[Tuple[float, List[Tuple[float, int]]]]): Boost and
+            weight-ordered postings for each query term and field
+        limit (int): Maximum number of results
+        allowed (Optional[Container[int]]): Document IDs to consider; None for all
+
+    Returns:
+        List[Tuple[int, float]]: Document IDs and scores, best first
+    """
+    weighted_postings = [
+        (boost, postings)
+        for boost, postings in weighted_postings
+        if postings and boost > 0
+    ]
+    if limit <= 0 or not weighted_postings:
+        return []
+
+    # lists with the largest possible contribution first
+    weighted_postings.sort(key=lambda item: -item[0] * item[1][0][0])
+    remaining_bound = sum(
+        boost * postings[0][0] for boost, postings in weighted_postings
+    )
+
+    scores: Dict[int, float] = {}
+    accepting = True
+    for boost, postings in weighted_postings:
+        if accepting and len(scores) >= limit:
+            # a document not yet seen can score at most the remaining bound
+            kth_score = heapq.nlargest(limit, scores.values())[-1]
+            accepting = kth_score < remaining_bound
+
+        if accepting:
+            for weight, doc_id in postings:
+                if allowed is None or doc_id in allowed:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + boost * weight
+        else:
+            for weight, doc_id in postings:
+                if doc_id in scores:
+                    scores[doc_id] += boost * weight
+
+        remaining_bound -= boost * postings[0][0]
+
+    return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
@@ -0,0 +1,149 @@
+"""
+Registry of the top-level SOLI taxonomy branches, with request counters and
+latencies for the routes that serve them.
+"""
+
+# imports
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, Iterator, Tuple
+
+# packages
+from fastapi import HTTPException
+from soli import SOLITypes
+
+# project
+from soli_api.llm_client import LatencyTracker
+
+# branch names as used in API paths and parameters, e.g. area_of_law
+BRANCHES: Dict[str, SOLITypes] = {
+    soli_type.name.lower(): soli_type for soli_type in SOLITypes
+}
+
+# enumeration of branch names for request validation and the OpenAPI schema
+SOLIBranch = Enum(  # type: ignore
+    "SOLIBranch", {name.upper(): name for name in BRANCHES}, type=str
+)
+
+# plural names the /search/llm/* routes were first published under
+LLM_BRANCH_ALIASES: Dict[str, SOLITypes] = {
+    "area-of-law": SOLITypes.AREA_OF_LAW,
+    "asset-types": SOLITypes.ASSET_TYPE,
+    "communication-modalities": SOLITypes.COMMUNICATION_MODALITY,
+    "currencies": SOLITypes.CURRENCY,
+    "data-formats": SOLITypes.DATA_FORMAT,
+    "document-artifacts": SOLITypes.DOCUMENT_ARTIFACT,
+    "engagement-terms": SOLITypes.ENGAGEMENT_TERMS,
+    "events": SOLITypes.EVENT,
+    "governmental-bodies": SOLITypes.GOVERNMENTAL_BODY,
+    "industries": SOLITypes.INDUSTRY,
+    "legal-authorities": SOLITypes.LEGAL_AUTHORITIES,
+    "locations": SOLITypes.LOCATION,
+    "matter-narratives": SOLITypes.MATTER_NARRATIVE,
+    "matter-narrative-formats": SOLITypes.MATTER_NARRATIVE_FORMAT,
+    "objectives": SOLITypes.OBJECTIVES,
+    "player-actors": SOLITypes.ACTOR_PLAYER,
+    "standards-compatibilities": SOLITypes.STANDARDS_COMPATIBILITY,
+    "statuses": SOLITypes.STATUS,
+    "system-identifiers": SOLITypes.SYSTEM_IDENTIFIERS,
+}
+
+# every name a branch can be given in a path: area_of_law, area-of-law and aliases
+BRANCH_PATHS: Dict[str, SOLITypes] = {
+    **BRANCHES,
+    **{name.replace("_", "-"): soli_type for name, soli_type in BRANCHES.items()},
+    **LLM_BRANCH_ALIASES,
+}
+
+
+def branch_type(branch: str) -> SOLITypes:
+    """
+    Get the taxonomy branch named in a path.
+
+    Args:
+        branch (str): Branch name or alias
+
+    Returns:
+        SOLITypes: Taxonomy branch
+
+    Raises:
+        HTTPException: If the name is not a known branch
+    """
+    soli_type = BRANCH_PATHS.get(branch, None)
+    if soli_type is None:
+        raise HTTPException(status_code=404, detail=f"Unknown branch: {branch}")
+    return soli_type
+
+
+class BranchMetrics:
+    """
+    Request counts, error counts and recent latencies per route and branch.
+
+    Aliases of a branch are counted under its snake_case name.  Counters are kept
+    per worker process.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize empty counters.
+
+        Returns:
+            None
+        """
+        self.requests: Dict[Tuple[str, SOLITypes], int] = {}
+        self.errors: Dict[Tuple[str, SOLITypes], int] = {}
+        self.latency: Dict[Tuple[str, SOLITypes], LatencyTracker] = {}
+
+    @contextmanager
+    def track(self, route: str, soli_type: SOLITypes) -> Iterator[None]:
+        """
+        Count a request and record its latency; a request that raises also counts
+        as an error.
+
+        Streamed responses are timed until the response starts.
+
+        Args:
+            route (str): Route family, e.g. taxonomy or llm
+            soli_type (SOLITypes): Branch served
+
+        Returns:
+            Iterator[None]: Context for handling the request
+        """
+        key = (route, soli_type)
+        start_time = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors[key] = self.errors.get(key, 0) + 1
+            raise
+        finally:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.setdefault(key, LatencyTracker()).record(
+                time.perf_counter() - start_time
+            )
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get the counters for every route and branch that has served a request.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: Requests, errors and p50 and p95
+                latency in seconds, by route and then branch name
+        """
+        stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (route, soli_type), requests in sorted(
+            self.requests.items(), key=lambda item: (item[0][0], item[0][1].name)
+        ):
+            latency = self.latency[(route, soli_type)]
+            stats.setdefault(route, {})[soli_type.name.lower()] = {
+                "requests": requests,
+                "errors": self.errors.get((route, soli_type), 0),
+                "p50": latency.quantile(0.5),
+                "p95": latency.quantile(0.95),
+            }
+        return stats
+
+
+# counters for the branch routes of this worker
+BRANCH_METRICS = BranchMetrics()
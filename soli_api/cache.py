@@ -0,0 +1,193 @@
+"""
+Response caches for precomputed API payloads.
+"""
+
+# imports
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# default maximum number of entries per cache
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache of serialized response bodies.
+
+    The SOLI graph is immutable once loaded, so any payload derived from it can be
+    computed once and served as raw bytes until it is evicted.  Caches can also be
+    bounded by the total size of their values and expire entries after a TTL, and
+    they count hits, misses, evictions and expirations for monitoring.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries to keep; 0 disables caching
+            max_bytes (Optional[int]): Maximum total size of cached values; None for no limit
+            ttl (Optional[float]): Seconds before an entry expires; None for no expiry
+
+        Returns:
+            None
+        """
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, Tuple[bytes, Optional[float]]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """
+        Remove an entry and update the total size; the lock must be held.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            None
+        """
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            Optional[bytes]: Cached value, or None if the key is not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        """
+        Store a value, evicting the least recently used entries if the cache is full.
+
+        Values larger than max_bytes on their own are not cached.
+
+        Args:
+            key (Hashable): Cache key
+            value (bytes): Value to cache
+
+        Returns:
+            None
+        """
+        if self.max_entries == 0:
+            return
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires)
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], bytes]) -> bytes:
+        """
+        Get a cached value, computing and storing it with the factory on a miss.
+
+        Args:
+            key (Hashable): Cache key
+            factory (Callable[[], bytes]): Function to compute the value on a miss
+
+        Returns:
+            bytes: Cached or newly computed value
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache size and counters.
+
+        Returns:
+            Dict[str, int]: Entries, bytes, hits, misses, evictions and expirations
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Check if a key is cached without updating its recency.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            bool: True if the key is cached
+        """
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        """
+        Get the number of cached entries.
+
+        Returns:
+            int: Number of cached entries
+        """
+        with self._lock:
+            return len(self._entries)
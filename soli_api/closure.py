@@ -0,0 +1,304 @@
+"""
+Transitive closure of the SOLI class hierarchy for constant-time subsumption checks.
+
+The hierarchy has classes with several parents, so interval labels over a spanning
+tree cannot answer every ancestor query on their own.  Instead, every class keeps a
+table of all of its ancestors with their hop counts, and every class keeps the
+matching table of its descendants.  Both are built once from the sub_class_of
+adjacency when the graph is loaded.  "Is A a B?" is then a single lookup, and the
+ancestors or descendants of a class can be read at any depth without walking the
+graph again.
+
+The same pass records where each class sits in the hierarchy: its depth below the
+nearest root and the top-level SOLI branches it belongs to, so breadcrumbs can be
+served without fetching one parent at a time.
+"""
+
+# imports
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+# packages
+from soli import SOLITypes
+from soli.graph import SOLI_TYPE_IRIS
+
+# project
+from soli_api.graph_index import GraphIndex
+
+# default maximum number of paths returned by ClosureIndex.paths_to_root
+DEFAULT_MAX_PATHS = 100
+
+
+class ClosureIndex:
+    """
+    Ancestors and descendants of every class, with hop counts, over class indices.
+    """
+
+    def __init__(self, graph_index: GraphIndex) -> None:
+        """
+        Compute the closure of the sub_class_of relation.
+
+        Cycles in the hierarchy are tolerated: a class never counts as its own
+        ancestor or descendant.
+
+        Args:
+            graph_index (GraphIndex): Adjacency of the graph
+
+        Returns:
+            None
+        """
+        parents = graph_index.adjacency["sub_class_of"]
+        num_classes = len(graph_index.soli.classes)
+        self._parents = parents
+
+        # ancestors of each class in breadth-first order, nearest first
+        self._ancestors: List[Dict[int, int]] = []
+        for index in range(num_classes):
+            distances: Dict[int, int] = {index: 0}
+            frontier = deque([index])
+            while frontier:
+                current = frontier.popleft()
+                distance = distances[current] + 1
+                for parent in parents.neighbors(current):
+                    if parent not in distances:
+                        distances[parent] = distance
+                        frontier.append(parent)
+            del distances[index]
+            self._ancestors.append(distances)
+
+        # descendants of each class, nearest first, then by class index
+        descendant_lists: List[List[Tuple[int, int]]] = [[] for _ in range(num_classes)]
+        for index, ancestors in enumerate(self._ancestors):
+            for ancestor, distance in ancestors.items():
+                descendant_lists[ancestor].append((distance, index))
+        self._descendants: List[Dict[int, int]] = [
+            {index: distance for distance, index in sorted(descendants)}
+            for descendants in descendant_lists
+        ]
+
+        # hops to the nearest class without a parent, or to the furthest ancestor
+        # for classes that only reach a cycle
+        self.depths: List[int] = []
+        for index, ancestors in enumerate(self._ancestors):
+            depth = 0
+            for ancestor, distance in ancestors.items():
+                depth = distance
+                if not parents.neighbors(ancestor):
+                    break
+            self.depths.append(depth)
+
+        # root class of each top-level branch present in the graph
+        soli = graph_index.soli
+        self.branch_roots: Dict[SOLITypes, int] = {}
+        for soli_type in SOLITypes:
+            root_iri = soli.normalize_iri(SOLI_TYPE_IRIS[soli_type])
+            if root_iri in soli.iri_to_index:
+                self.branch_roots[soli_type] = soli.iri_to_index[root_iri]
+
+        # top-level branches each class is or descends from, in SOLITypes order
+        self.branches: List[Tuple[SOLITypes, ...]] = [
+            tuple(
+                soli_type
+                for soli_type, root in self.branch_roots.items()
+                if root == index or root in ancestors
+            )
+            for index, ancestors in enumerate(self._ancestors)
+        ]
+
+    def __len__(self) -> int:
+        """
+        Get the number of ancestor-descendant pairs.
+
+        Returns:
+            int: Number of pairs in the closure
+        """
+        return sum(len(ancestors) for ancestors in self._ancestors)
+
+    def ancestors(self, index: int, max_hops: Optional[int] = None) -> Dict[int, int]:
+        """
+        Get the ancestors of a class.
+
+        Args:
+            index (int): Class index
+            max_hops (Optional[int]): Leave out ancestors further away than this
+
+        Returns:
+            Dict[int, int]: Hop count of each ancestor, nearest first
+        """
+        ancestors = self._ancestors[index]
+        if max_hops is None:
+            return ancestors
+        return {
+            ancestor: distance
+            for ancestor, distance in ancestors.items()
+            if distance <= max_hops
+        }
+
+    def descendants(self, index: int, max_hops: Optional[int] = None) -> Dict[int, int]:
+        """
+        Get the descendants of a class.
+
+        Args:
+            index (int): Class index
+            max_hops (Optional[int]): Leave out descendants further away than this
+
+        Returns:
+            Dict[int, int]: Hop count of each descendant, nearest first
+        """
+        descendants = self._descendants[index]
+        if max_hops is None:
+            return descendants
+        return {
+            descendant: distance
+            for descendant, distance in descendants.items()
+            if distance <= max_hops
+        }
+
+    def branch(
+        self, soli_type: SOLITypes, max_hops: Optional[int] = None
+    ) -> Dict[int, int]:
+        """
+        Get the classes under the root of a top-level branch.
+
+        Args:
+            soli_type (SOLITypes): Branch
+            max_hops (Optional[int]): Leave out classes further below the root
+
+        Returns:
+            Dict[int, int]: Hop count of each class below the root, nearest first;
+                empty if the root is not in the graph
+        """
+        root = self.branch_roots.get(soli_type, None)
+        if root is None:
+            return {}
+        return self.descendants(root, max_hops)
+
+    def descendant_set(self, index: int) -> FrozenSet[int]:
+        """
+        Get the descendants of a class as a set.
+
+        Args:
+            index (int): Class index
+
+        Returns:
+            FrozenSet[int]: Descendant class indices
+        """
+        return frozenset(self._descendants[index])
+
+    def distance(self, index: int, ancestor: int) -> Optional[int]:
+        """
+        Get the number of hops up from a class to one of its ancestors.
+
+        Args:
+            index (int): Class index
+            ancestor (int): Class index of the possible ancestor
+
+        Returns:
+            Optional[int]: Hop count; 0 for the class itself, None if it is not an
+                ancestor
+        """
+        if index == ancestor:
+            return 0
+        return self._ancestors[index].get(ancestor, None)
+
+    def is_a(self, index: int, ancestor: int) -> bool:
+        """
+        Check if a class is the same as or a subclass of another class.
+
+        Args:
+            index (int): Class index
+            ancestor (int): Class index of the possible ancestor
+
+        Returns:
+            bool: True if the class is subsumed by the ancestor
+        """
+        return index == ancestor or ancestor in self._ancestors[index]
+
+    def common_ancestors(self, indices: Iterable[int]) -> Dict[int, int]:
+        """
+        Get the classes that every given class is or descends from.
+
+        Args:
+            indices (Iterable[int]): Class indices
+
+        Returns:
+            Dict[int, int]: Total hop count from the given classes to each common
+                ancestor, nearest first, then by class index
+        """
+        common: Optional[Dict[int, int]] = None
+        for index in dict.fromkeys(indices):
+            reachable = {index: 0, **self._ancestors[index]}
+            if common is None:
+                common = reachable
+            else:
+                common = {
+                    ancestor: distance + reachable[ancestor]
+                    for ancestor, distance in common.items()
+                    if ancestor in reachable
+                }
+        if not common:
+            return {}
+        return dict(sorted(common.items(), key=lambda item: (item[1], item[0])))
+
+    def lowest_common_ancestors(self, indices: Sequence[int]) -> List[int]:
+        """
+        Get the common ancestors of classes that are not an ancestor of another
+        common ancestor.
+
+        With several parents per class there can be more than one.  Classes in a
+        cycle are ancestors of each other, so only a common ancestor outside the
+        cycle can rule them out; if the lowest common ancestors form a cycle, every
+        class in it is returned.
+
+        Args:
+            indices (Sequence[int]): Class indices
+
+        Returns:
+            List[int]: Class indices, nearest to the given classes first
+        """
+        common = self.common_ancestors(indices)
+        return [
+            ancestor
+            for ancestor in common
+            if not any(
+                ancestor in self._ancestors[other]
+                and other not in self._ancestors[ancestor]
+                for other in common
+                if other != ancestor
+            )
+        ]
+
+    def paths_to_root(
+        self, index: int, max_paths: Optional[int] = DEFAULT_MAX_PATHS
+    ) -> Tuple[List[Tuple[int, ...]], bool]:
+        """
+        Get every sub_class_of path from a class up to a class without a parent.
+
+        Paths are found breadth-first, so shorter paths come first.  A path that
+        would revisit one of its own classes ends before the cycle.
+
+        Args:
+            index (int): Class index
+            max_paths (Optional[int]): Stop once this many paths are found
+
+        Returns:
+            Tuple[List[Tuple[int, ...]], bool]: Paths as class indices from the root
+                down to the class, and whether max_paths cut the search short
+        """
+        paths: List[Tuple[int, ...]] = []
+        partial_paths = deque([(index,)])
+        while partial_paths:
+            path = partial_paths.popleft()
+            next_parents = [
+                parent
+                for parent in self._parents.neighbors(path[-1])
+                if parent not in path
+            ]
+            if not next_parents:
+                if max_paths is not None and len(paths) >= max_paths:
+                    return paths, True
+                paths.append(path[::-1])
+                continue
+            for parent in next_parents:
+                partial_paths.append(path + (parent,))
+        return paths, False
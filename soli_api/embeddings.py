@@ -0,0 +1,469 @@
+"""
+Embedding index for semantic search over class labels and definitions.
+
+Every class is embedded once into a row of a contiguous float32 matrix saved as a .npy
+file and memory-mapped at startup, so workers share the pages and a query costs one
+embedding plus one matrix-vector product.  Embedding models are pluggable:
+
+* "hashing" (default): deterministic hashed word, word-pair and character trigram
+  features; needs nothing beyond numpy and is stable across runs, which suits tests.
+* "sentence-transformers:<model>": a local sentence-transformers model, e.g.
+  sentence-transformers:all-MiniLM-L6-v2.
+
+Build the matrix ahead of time with:
+
+    python -m soli_api.embeddings --output soli.embeddings.npy
+"""
+
+# imports
+import argparse
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Protocol, Tuple
+
+# packages
+import numpy as np
+from soli import SOLI, OWLClass
+
+# project
+from soli_api.api_config import load_config
+from soli_api.bm25 import tokenize
+from soli_api.http_cache import ontology_version
+from soli_api.snapshot import load_snapshot, load_source, snapshot_source
+
+# default number of hashed features
+DEFAULT_DIMENSION = 512
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+class Embedder(Protocol):
+    """
+    Model turning texts into L2-normalized float32 vectors.
+    """
+
+    # identifier stored with the matrix so a different model forces a rebuild
+    name: str
+
+    # vector dimension
+    dimension: int
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """
+        Embed texts.
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dimension), rows L2-normalized
+        """
+
+
+@functools.lru_cache(maxsize=262144)
+def hash_feature(feature: str, dimension: int) -> Tuple[int, float]:
+    """
+    Map a feature to a stable column and sign.
+
+    Args:
+        feature (str): Feature string
+        dimension (int): Number of columns
+
+    Returns:
+        Tuple[int, float]: Column index and +1.0 or -1.0
+    """
+    digest = int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+    return digest % dimension, 1.0 if digest >> 63 else -1.0
+
+
+class HashingEmbedder:
+    """
+    Deterministic embedder using signed feature hashing.
+
+    Stemmed words, adjacent word pairs and character trigrams are hashed into a fixed
+    number of columns with log-scaled counts, so related wordings ("leases", "leasing")
+    and misspellings still overlap.
+    """
+
+    def __init__(self, dimension: int = DEFAULT_DIMENSION) -> None:
+        """
+        Initialize the embedder.
+
+        Args:
+            dimension (int): Number of hashed features
+
+        Returns:
+            None
+        """
+        self.dimension = dimension
+        self.name = f"hashing:{dimension}"
+
+    def features(self, text: str) -> Dict[str, int]:
+        """
+        Count the features of a text.
+
+        Args:
+            text (str): Text
+
+        Returns:
+            Dict[str, int]: Feature counts
+        """
+        tokens = tokenize(text)
+        counts: Dict[str, int] = {}
+        for index, token in enumerate(tokens):
+            features = [f"w:{token}"]
+            if index > 0:
+                features.append(f"b:{tokens[index - 1]} {token}")
+            padded = f"#{token}#"
+            features.extend(
+                f"c:{padded[start:start + 3]}" for start in range(len(padded) - 2)
+            )
+            for feature in features:
+                counts[feature] = counts.get(feature, 0) + 1
+        return counts
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """
+        Embed texts.
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dimension), rows L2-normalized
+        """
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self.features(text).items():
+                column, sign = hash_feature(feature, self.dimension)
+                vectors[row, column] += sign * (1.0 + math.log(count))
+        return normalize_rows(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """
+    Embedder backed by a local sentence-transformers model.
+    """
+
+    def __init__(self, model_name: str) -> None:
+        """
+        Load the model.
+
+        Args:
+            model_name (str): sentence-transformers model name or path
+
+        Returns:
+            None
+        """
+        # pylint: disable=import-outside-toplevel
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers:{model_name}"
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """
+        Embed texts.
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dimension), rows L2-normalized
+        """
+        return normalize_rows(
+            np.asarray(self.model.encode(texts, batch_size=64), dtype=np.float32)
+        )
+
+
+def normalize_rows(vectors: "np.ndarray") -> "np.ndarray":
+    """
+    Scale rows to unit length, leaving all-zero rows as they are.
+
+    Args:
+        vectors (np.ndarray): 2D float32 array
+
+    Returns:
+        np.ndarray: Normalized array
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return vectors / norms
+
+
+def load_embedder(model: str, dimension: int = DEFAULT_DIMENSION) -> Embedder:
+    """
+    Create the embedder named in the configuration.
+
+    Args:
+        model (str): "hashing" or "sentence-transformers:<model>"
+        dimension (int): Number of features for the hashing embedder
+
+    Returns:
+        Embedder: Embedding model
+    """
+    if model == "hashing":
+        return HashingEmbedder(dimension)
+    if model.startswith("sentence-transformers:"):
+        return SentenceTransformerEmbedder(model.split(":", 1)[1])
+    raise ValueError(f"Unknown embedding model: {model}")
+
+
+def class_text(owl_class: OWLClass) -> str:
+    """
+    Get the text embedded for a class.
+
+    Args:
+        owl_class (OWLClass): SOLI OWLClass object
+
+    Returns:
+        str: Labels followed by the definition
+    """
+    parts = [owl_class.label, owl_class.preferred_label]
+    parts.extend(owl_class.alternative_labels)
+    parts.append(owl_class.definition)
+    return ". ".join(part for part in parts if part)
+
+
+class EmbeddingIndex:
+    """
+    Class embeddings in a float32 matrix, one row per class index.
+    """
+
+    def __init__(self, embedder: Embedder, matrix: "np.ndarray") -> None:
+        """
+        Wrap an embedding matrix.
+
+        Args:
+            embedder (Embedder): Model used for the matrix and for queries
+            matrix (np.ndarray): float32 array of shape (number of classes, dimension)
+
+        Returns:
+            None
+        """
+        self.embedder = embedder
+        self.matrix = matrix
+
+    @classmethod
+    def build(cls, soli: SOLI, embedder: Embedder) -> "EmbeddingIndex":
+        """
+        Embed every class in the graph.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            embedder (Embedder): Embedding model
+
+        Returns:
+            EmbeddingIndex: New index
+        """
+        return cls(
+            embedder,
+            np.ascontiguousarray(
+                embedder.embed([class_text(owl_class) for owl_class in soli.classes]),
+                dtype=np.float32,
+            ),
+        )
+
+    def save(self, path: str, ontology_version: str) -> None:
+        """
+        Write the matrix as a .npy file with a JSON sidecar describing it.
+
+        Args:
+            path (str): Matrix file path
+            ontology_version (str): Version of the ontology the matrix was built from
+
+        Returns:
+            None
+        """
+        matrix_path = Path(path)
+        metadata_path = Path(f"{path}.json")
+        matrix_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write both files under names unique to this process, then rename them, so
+        # concurrent builds never share a partial file and readers never see one
+        temp_path = matrix_path.with_name(f".{matrix_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as output_file:
+            np.save(output_file, self.matrix)
+        os.replace(temp_path, matrix_path)
+
+        temp_path = metadata_path.with_name(f".{metadata_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps(
+                {
+                    "model": self.embedder.name,
+                    "ontology_version": ontology_version,
+                    "shape": list(self.matrix.shape),
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(temp_path, metadata_path)
+
+    @classmethod
+    def load(
+        cls, path: str, embedder: Embedder, ontology_version: str, num_classes: int
+    ) -> Optional["EmbeddingIndex"]:
+        """
+        Memory-map a saved matrix if it matches the model and ontology.
+
+        Args:
+            path (str): Matrix file path
+            embedder (Embedder): Embedding model
+            ontology_version (str): Version of the loaded ontology
+            num_classes (int): Number of classes in the loaded graph
+
+        Returns:
+            Optional[EmbeddingIndex]: Index, or None if the file is missing or stale
+        """
+        try:
+            metadata = json.loads(Path(f"{path}.json").read_text(encoding="utf-8"))
+            matrix = np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as error:
+            LOGGER.info("Embedding matrix %s not loaded: %s", path, error)
+            return None
+
+        expected = {
+            "model": embedder.name,
+            "ontology_version": ontology_version,
+            "shape": [num_classes, embedder.dimension],
+        }
+        if metadata != expected or list(matrix.shape) != expected["shape"]:
+            LOGGER.info("Embedding matrix %s is stale", path)
+            return None
+
+        return cls(embedder, matrix)
+
+    def search(
+        self, query: str, limit: int = 10, rows: Optional["np.ndarray"] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Get the classes most similar to a query by cosine similarity.
+
+        Args:
+            query (str): Query text
+            limit (int): Maximum number of results
+            rows (Optional[np.ndarray]): Class indices to consider; None for all
+
+        Returns:
+            List[Tuple[int, float]]: Class indices and similarities, best first
+        """
+        if limit <= 0:
+            return []
+
+        query_vector = self.embedder.embed([query])[0]
+        if not query_vector.any():
+            return []
+
+        scores = (self.matrix if rows is None else self.matrix[rows]) @ query_vector
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        class_indices = top if rows is None else rows[top]
+        return [
+            (int(class_index), float(scores[position]))
+            for class_index, position in zip(class_indices, top)
+        ]
+
+
+def load_embedding_index(
+    soli: SOLI, embeddings_config: Dict, ontology_version: str
+) -> Optional[EmbeddingIndex]:
+    """
+    Load or build the embedding index described by the configuration.
+
+    Args:
+        soli (SOLI): SOLI graph object
+        embeddings_config (Dict): The "embeddings" configuration block
+        ontology_version (str): Version of the loaded ontology
+
+    Returns:
+        Optional[EmbeddingIndex]: Index, or None if disabled
+    """
+    model = embeddings_config.get("model", None)
+    if model is None:
+        return None
+
+    embedder = load_embedder(
+        model, dimension=embeddings_config.get("dimension", DEFAULT_DIMENSION)
+    )
+    path = embeddings_config.get("path", None)
+    if path is not None:
+        index = EmbeddingIndex.load(path, embedder, ontology_version, len(soli))
+        if index is not None:
+            return index
+
+    index = EmbeddingIndex.build(soli, embedder)
+    if path is not None:
+        index.save(path, ontology_version)
+        # serve from the mapped file so forked workers share its pages
+        index = EmbeddingIndex.load(path, embedder, ontology_version, len(soli))
+    return index
+
+
+def main() -> None:
+    """
+    Build the embedding matrix for the graph configured in config.json.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        description="Embed every SOLI class for semantic search."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Matrix file path; defaults to embeddings.path in config.json",
+    )
+    args = parser.parse_args()
+
+    config = load_config()
+    embeddings_config = dict(config.get("embeddings", {}))
+    embeddings_config["path"] = args.output or embeddings_config.get("path", None)
+    if embeddings_config["path"] is None:
+        parser.error("--output is required when embeddings.path is not configured")
+    if embeddings_config.get("model", None) is None:
+        parser.error("embeddings.model is not configured")
+
+    # load the graph the way the API does, preferring a fresh snapshot
+    soli_config = config["soli"]
+    snapshot_config = soli_config.get("snapshot", {})
+    soli = None
+    if snapshot_config.get("path", None) is not None:
+        soli = load_snapshot(
+            snapshot_config["path"],
+            source=snapshot_source(soli_config),
+            max_age=snapshot_config.get("max_age", None),
+        )
+    if soli is None:
+        soli = load_source(soli_config)
+
+    index = EmbeddingIndex.build(
+        soli,
+        load_embedder(
+            embeddings_config["model"],
+            dimension=embeddings_config.get("dimension", DEFAULT_DIMENSION),
+        ),
+    )
+    index.save(embeddings_config["path"], ontology_version(soli))
+    print(
+        f"Wrote {index.matrix.shape[0]} x {index.matrix.shape[1]} embeddings "
+        f"to {embeddings_config['path']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
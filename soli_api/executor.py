@@ -0,0 +1,203 @@
+"""
+Bounded worker pools for CPU-bound searches.
+
+The fuzzy searches are synchronous and scan every label or definition,
+so running them inside an async handler blocks the event loop and every other request
+on the worker.  SearchExecutor runs them in a thread pool, or in a pool of forked
+processes that inherit the loaded search engine read-only for parallelism beyond the GIL, and
+rejects new work once too many searches are queued.
+"""
+
+# imports
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List, Optional
+
+# packages
+from soli import SOLI
+
+# project
+from soli_api.search_engine import SearchEngine
+
+# supported pool modes
+EXECUTOR_MODES = ("thread", "process")
+
+# SearchEngine methods that may be run in the pool
+SEARCH_METHODS = (
+    "search",
+    "search_by_prefix",
+    "search_by_label",
+    "search_by_definition",
+    "search_semantic",
+)
+
+# default pool size and maximum number of searches running or waiting
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+
+# search engine inherited by forked pool processes
+_WORKER_ENGINE: Optional[SearchEngine] = None
+
+
+class SearchQueueFullError(Exception):
+    """
+    Raised when a search is submitted while the pool's queue is full.
+    """
+
+
+def _pack_result(result: Any) -> Any:
+    """
+    Replace classes in a search result with their IRIs for the trip back from a process.
+
+    Args:
+        result (Any): OWLClass or (OWLClass, score) tuple
+
+    Returns:
+        Any: IRI or (IRI, score) tuple
+    """
+    if isinstance(result, tuple):
+        return result[0].iri, result[1]
+    return result.iri
+
+
+def _unpack_result(soli: SOLI, result: Any) -> Any:
+    """
+    Resolve the IRIs in a packed search result against the local graph.
+
+    Args:
+        soli (SOLI): SOLI graph object
+        result (Any): IRI or (IRI, score) tuple
+
+    Returns:
+        Any: OWLClass or (OWLClass, score) tuple
+    """
+    if isinstance(result, tuple):
+        return soli[result[0]], result[1]
+    return soli[result]
+
+
+def _run_in_process(method: str, args: tuple, kwargs: dict) -> List[Any]:
+    """
+    Run a search on the inherited search engine inside a pool process.
+
+    Args:
+        method (str): SearchEngine method name
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+
+    Returns:
+        List[Any]: Packed search results
+    """
+    return [
+        _pack_result(result)
+        for result in getattr(_WORKER_ENGINE, method)(*args, **kwargs)
+    ]
+
+
+def _noop() -> None:
+    """
+    Empty task used to start the pool processes.
+
+    Returns:
+        None
+    """
+
+
+class SearchExecutor:
+    """
+    Run synchronous SearchEngine searches in a bounded thread or process pool.
+    """
+
+    def __init__(
+        self,
+        engine: SearchEngine,
+        mode: str = "thread",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        """
+        Start the pool.
+
+        Args:
+            engine (SearchEngine): Search engine over the loaded graph
+            mode (str): "thread" or "process"
+            max_workers (int): Number of threads or processes
+            max_pending (int): Maximum number of searches running or waiting
+
+        Returns:
+            None
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(
+                f"Invalid executor mode: {mode}. Must be one of {EXECUTOR_MODES}."
+            )
+
+        self.engine = engine
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.pending = 0
+
+        self._pool: Executor
+        if mode == "process":
+            # fork so the processes share the loaded engine copy-on-write
+            global _WORKER_ENGINE  # pylint: disable=global-statement
+            _WORKER_ENGINE = engine
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+            # with fork, the first task starts every process up front
+            self._pool.submit(_noop).result()
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="soli-search"
+            )
+
+    async def run(self, method: str, *args: Any, **kwargs: Any) -> List[Any]:
+        """
+        Run a SearchEngine method in the pool without blocking the event loop.
+
+        Args:
+            method (str): One of SEARCH_METHODS
+            *args (Any): Positional arguments for the method
+            **kwargs (Any): Keyword arguments for the method
+
+        Returns:
+            List[Any]: Search results as returned by the method
+
+        Raises:
+            SearchQueueFullError: If max_pending searches are already running or waiting
+        """
+        if method not in SEARCH_METHODS:
+            raise ValueError(f"Unsupported search method: {method}")
+        if self.pending >= self.max_pending:
+            raise SearchQueueFullError(
+                f"Search queue is full ({self.max_pending} pending)"
+            )
+
+        self.pending += 1
+        try:
+            if self.mode == "process":
+                future = self._pool.submit(_run_in_process, method, args, kwargs)
+                results = await asyncio.wrap_future(future)
+                return [_unpack_result(self.engine.soli, result) for result in results]
+
+            future = self._pool.submit(getattr(self.engine, method), *args, **kwargs)
+            return await asyncio.wrap_future(future)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """
+        Stop the pool without waiting for running searches.
+
+        Args:
+            cancel_pending (bool): Cancel searches that have not started instead of
+                letting them run before the pool exits
+
+        Returns:
+            None
+        """
+        self._pool.shutdown(wait=False, cancel_futures=cancel_pending)
@@ -0,0 +1,198 @@
+"""
+Compressed adjacency of the SOLI class graph for neighborhood and subgraph queries.
+
+Each relation is stored in compressed sparse row (CSR) form over class indices: an
+offsets array with one entry per class plus one, and a targets array holding every
+class's related class indices back to back.  The arrays are built once when the graph
+is loaded, so a k-hop expansion only slices integer arrays instead of resolving IRIs
+through the graph for every neighbor.
+"""
+
+# imports
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# packages
+from soli import SOLI, OWLClass
+
+# relations between classes, as named by the OWLClass fields that hold them
+RELATIONS: Tuple[str, ...] = (
+    "sub_class_of",
+    "parent_class_of",
+    "see_also",
+    "is_defined_by",
+)
+
+
+def related_iris(owl_class: OWLClass, relation: str) -> List[str]:
+    """
+    Get the IRIs a class is related to by one relation.
+
+    Args:
+        owl_class (OWLClass): SOLI OWLClass object
+        relation (str): One of RELATIONS
+
+    Returns:
+        List[str]: Related IRIs, which may not all be classes in the graph
+    """
+    value = getattr(owl_class, relation)
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class CSRAdjacency:
+    """
+    One relation's edges in compressed sparse row form over class indices.
+    """
+
+    def __init__(self, neighbor_lists: Iterable[Iterable[int]]) -> None:
+        """
+        Pack per-class neighbor lists into offset and target arrays.
+
+        Args:
+            neighbor_lists (Iterable[Iterable[int]]): Neighbor indices of each class,
+                in class index order
+
+        Returns:
+            None
+        """
+        self.offsets = array("l", [0])
+        self.targets = array("l")
+        for neighbors in neighbor_lists:
+            self.targets.extend(neighbors)
+            self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        """
+        Get the number of edges.
+
+        Returns:
+            int: Number of edges
+        """
+        return len(self.targets)
+
+    def neighbors(self, index: int) -> Sequence[int]:
+        """
+        Get the neighbors of a class.
+
+        Args:
+            index (int): Class index
+
+        Returns:
+            Sequence[int]: Neighbor class indices
+        """
+        return self.targets[self.offsets[index] : self.offsets[index + 1]]
+
+
+class GraphIndex:
+    """
+    Integer-ID adjacency for every relation in RELATIONS.
+    """
+
+    def __init__(self, soli: SOLI) -> None:
+        """
+        Build one CSR adjacency per relation.
+
+        IRIs that do not resolve to a class in the graph are left out, as are
+        duplicate edges.
+
+        Args:
+            soli (SOLI): SOLI graph object
+
+        Returns:
+            None
+        """
+        self.soli = soli
+        iri_to_index = soli.iri_to_index
+        self.adjacency: Dict[str, CSRAdjacency] = {
+            relation: CSRAdjacency(
+                dict.fromkeys(
+                    iri_to_index[iri]
+                    for iri in related_iris(owl_class, relation)
+                    if iri in iri_to_index
+                )
+                for owl_class in soli.classes
+            )
+            for relation in RELATIONS
+        }
+
+    def num_edges(self) -> int:
+        """
+        Get the number of edges over all relations.
+
+        Returns:
+            int: Number of edges
+        """
+        return sum(len(adjacency) for adjacency in self.adjacency.values())
+
+    def neighborhood(
+        self,
+        seeds: Iterable[int],
+        relations: Sequence[str] = RELATIONS,
+        hops: int = 1,
+        max_nodes: Optional[int] = None,
+    ) -> Tuple[Dict[int, int], bool]:
+        """
+        Find the classes within a number of hops of the seed classes.
+
+        Args:
+            seeds (Iterable[int]): Class indices to start from, at hop 0
+            relations (Sequence[str]): Relations to follow, from each class outward
+            hops (int): Maximum number of hops
+            max_nodes (Optional[int]): Stop once this many classes are found
+
+        Returns:
+            Tuple[Dict[int, int], bool]: Hop count of each class found, in
+                breadth-first order, and whether max_nodes cut the search short
+        """
+        adjacencies = [self.adjacency[relation] for relation in relations]
+        distances: Dict[int, int] = {}
+        frontier: deque = deque()
+        for seed in seeds:
+            if seed not in distances:
+                if max_nodes is not None and len(distances) >= max_nodes:
+                    return distances, True
+                distances[seed] = 0
+                frontier.append(seed)
+
+        while frontier:
+            index = frontier.popleft()
+            distance = distances[index]
+            if distance >= hops:
+                continue
+            for adjacency in adjacencies:
+                for neighbor in adjacency.neighbors(index):
+                    if neighbor not in distances:
+                        if max_nodes is not None and len(distances) >= max_nodes:
+                            return distances, True
+                        distances[neighbor] = distance + 1
+                        frontier.append(neighbor)
+
+        return distances, False
+
+    def edges(
+        self, nodes: Sequence[int], relations: Sequence[str] = RELATIONS
+    ) -> List[Tuple[int, int, str]]:
+        """
+        Get the edges between a set of classes, in the order the classes are given.
+
+        Args:
+            nodes (Sequence[int]): Class indices
+            relations (Sequence[str]): Relations to include
+
+        Returns:
+            List[Tuple[int, int, str]]: Source index, target index and relation
+        """
+        node_set = set(nodes)
+        adjacencies = [(relation, self.adjacency[relation]) for relation in relations]
+        return [
+            (index, neighbor, relation)
+            for index in dict.fromkeys(nodes)
+            for relation, adjacency in adjacencies
+            for neighbor in adjacency.neighbors(index)
+            if neighbor in node_set
+        ]
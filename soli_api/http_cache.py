@@ -0,0 +1,245 @@
+"""
+HTTP cache validators (ETag, Last-Modified, Cache-Control) for the SOLI API.
+
+Every GET response is a pure function of the loaded ontology and the request URL, so a
+strong ETag can be derived from the ontology content hash plus the path, query and
+Accept header.  The ETag says nothing about whether the resource exists, so the route
+handler always runs; only a 200 response whose validators match the conditional
+request is replaced by a 304 without a body.
+"""
+
+# imports
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+# packages
+from soli import SOLI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# route families, matched in order by path prefix or by the prefix without its
+# trailing slash, e.g. /search for the combined search route; unmatched paths are
+# "root"
+ROUTE_FAMILIES: List[Tuple[str, str]] = [
+    ("/search/llm/", "llm"),
+    ("/search/", "search"),
+    ("/taxonomy/", "taxonomy"),
+    ("/info/", "info"),
+]
+
+# paths that are never given validators
+EXCLUDED_PATHS = ("/", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json")
+
+# default Cache-Control policy per route family; None disables validators for the family
+DEFAULT_CACHE_POLICIES: Dict[str, Optional[str]] = {
+    "root": "public, max-age=86400",
+    "taxonomy": "public, max-age=86400",
+    "search": "public, max-age=3600",
+    "llm": None,
+    "info": None,
+}
+
+
+def ontology_version(soli: SOLI) -> str:
+    """
+    Compute a content hash of the loaded ontology.
+
+    Args:
+        soli (SOLI): SOLI graph object
+
+    Returns:
+        str: Hex digest identifying the ontology content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for owl_class in soli.classes:
+        digest.update(owl_class.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def route_family(path: str) -> Optional[str]:
+    """
+    Get the route family for a request path.
+
+    Args:
+        path (str): Request path
+
+    Returns:
+        Optional[str]: Route family name, or None if the path is excluded
+    """
+    if path in EXCLUDED_PATHS:
+        return None
+
+    for prefix, family in ROUTE_FAMILIES:
+        if path.startswith(prefix) or path == prefix.rstrip("/"):
+            return family
+
+    return "root"
+
+
+def compute_etag(version: str, scope: Scope) -> str:
+    """
+    Compute a strong ETag for a request against an ontology version.
+
+    Args:
+        version (str): Ontology content hash
+        scope (Scope): ASGI request scope
+
+    Returns:
+        str: Quoted ETag value
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(version.encode("utf-8"))
+    digest.update(scope["path"].encode("utf-8"))
+    digest.update(b"?" + scope.get("query_string", b""))
+    digest.update(b"\n" + Headers(scope=scope).get("accept", "").encode("latin-1"))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag using weak comparison.
+
+    Args:
+        if_none_match (str): If-None-Match header value
+        etag (str): Current ETag
+
+    Returns:
+        bool: True if the header matches the ETag
+    """
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    """
+    Check an If-Modified-Since header against the ontology load time.
+
+    Args:
+        if_modified_since (str): If-Modified-Since header value
+        last_modified (float): Ontology load time as a UNIX timestamp
+
+    Returns:
+        bool: True if the resource has not been modified since the header date
+    """
+    try:
+        return parsedate_to_datetime(if_modified_since).timestamp() >= int(
+            last_modified
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+class ConditionalGetMiddleware:
+    """
+    ASGI middleware adding cache validators and turning successful conditional GETs
+    into 304 responses.
+
+    Reads app.state.ontology_version and app.state.ontology_loaded, which are set in the
+    lifespan handler once the graph is loaded.
+    """
+
+    def __init__(
+        self, app: ASGIApp, policies: Optional[Dict[str, Optional[str]]] = None
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app (ASGIApp): Wrapped ASGI app
+            policies (Optional[Dict[str, Optional[str]]]): Cache-Control policy overrides per route family
+
+        Returns:
+            None
+        """
+        self.app = app
+        self.policies = {**DEFAULT_CACHE_POLICIES, **(policies or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Handle an ASGI request.
+
+        Args:
+            scope (Scope): ASGI request scope
+            receive (Receive): ASGI receive channel
+            send (Send): ASGI send channel
+
+        Returns:
+            None
+        """
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        family = route_family(scope["path"])
+        policy = self.policies.get(family, None) if family else None
+        state = scope["app"].state if "app" in scope else None
+        version = getattr(state, "ontology_version", None)
+        if policy is None or version is None:
+            await self.app(scope, receive, send)
+            return
+
+        # validators for this request
+        etag = compute_etag(version, scope)
+        last_modified = getattr(state, "ontology_loaded")
+        validator_headers = {
+            "etag": etag,
+            "last-modified": formatdate(last_modified, usegmt=True),
+            "cache-control": policy,
+            "vary": "Accept",
+        }
+
+        # whether the client's copy is current, if the handler succeeds
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match", None)
+        if_modified_since = request_headers.get("if-modified-since", None)
+        not_modified = (
+            if_none_match is not None and etag_matches(if_none_match, etag)
+        ) or (
+            if_none_match is None
+            and if_modified_since is not None
+            and not_modified_since(if_modified_since, last_modified)
+        )
+        replaced = False
+
+        async def send_with_validators(message: Message) -> None:
+            """
+            Add validators to successful responses, replacing them with a 304 when
+            the client's copy is current.  Other statuses pass through unchanged.
+
+            Args:
+                message (Message): ASGI message
+
+            Returns:
+                None
+            """
+            nonlocal replaced
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                if not_modified:
+                    replaced = True
+                    await send(
+                        {
+                            "type": "http.response.start",
+                            "status": 304,
+                            "headers": [
+                                (key.encode("latin-1"), value.encode("latin-1"))
+                                for key, value in validator_headers.items()
+                            ],
+                        }
+                    )
+                    return
+
+                response_headers = MutableHeaders(scope=message)
+                for key, value in validator_headers.items():
+                    if key not in response_headers:
+                        response_headers[key] = value
+            elif message["type"] == "http.response.body" and replaced:
+                # drop the body, ending the 304 with the handler's last chunk
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
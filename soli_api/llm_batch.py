@@ -0,0 +1,985 @@
+"""
+Background jobs classifying many texts against taxonomy branches with the LLM.
+
+Clients tagging thousands of texts used to send one /search/llm/* request per text
+and branch, so every text cost a full LLM call and bursts ran into provider rate
+limits.  A batch job instead packs several texts into each LLM call over the union of
+their candidates, runs at most max_concurrency calls at a time across all jobs,
+retries failed calls with exponential backoff, and shares results with the LLM
+search cache in both directions.
+
+A job runs in the worker process that accepted it.  Its status and finished items are
+written to the LLM search cache database as they change, so any worker sharing that
+file can answer polls and streams for it.
+"""
+
+# imports
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+# packages
+from alea_llm_client.llms.prompts.sections import format_instructions, format_prompt
+from soli import SOLI, OWLClass, SOLITypes
+from soli.graph import DEFAULT_MAX_TOKENS
+
+# project
+from soli_api.closure import ClosureIndex
+from soli_api.llm_cache import LLMSearchCache
+
+# job defaults
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_JOBS = 16
+DEFAULT_JOB_TTL = 60 * 60
+
+# seconds between checks for new items when streaming a job run by another worker
+DEFAULT_POLL_INTERVAL = 0.5
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+class BatchQueueFullError(Exception):
+    """
+    Raised when a job is submitted while max_jobs jobs are still running.
+    """
+
+
+async def search_by_llm_packed(
+    soli: SOLI,
+    queries: Sequence[str],
+    search_set: List[OWLClass],
+    limit: int = 10,
+    scale: int = 10,
+) -> List[List[Tuple[OWLClass, int | float]]]:
+    """
+    Search one set of classes for several queries in a single LLM call.
+
+    This is SOLI.search_by_llm with numbered queries; each result names the query it
+    is for.  A single query is passed to SOLI.search_by_llm unchanged.
+
+    Args:
+        soli (SOLI): SOLI graph object
+        queries (Sequence[str]): Query strings
+        search_set (List[OWLClass]): Classes to search
+        limit (int): Maximum number of results per query
+        scale (int): Scale for the LLM relevancy scoring
+
+    Returns:
+        List[List[Tuple[OWLClass, int | float]]]: Results for each query, in order
+
+    Raises:
+        RuntimeError: If the LLM is not configured or the call fails
+    """
+    if len(queries) == 1:
+        return [
+            await soli.search_by_llm(
+                query=queries[0], search_set=search_set, limit=limit, scale=scale
+            )
+        ]
+
+    if soli.llm is None:
+        raise RuntimeError("An LLM must be configured to use LLM search.")
+
+    prompt = format_prompt(
+        {
+            "items": soli.format_classes_for_llm(search_set),
+            "instructions": format_instructions(
+                [
+                    "Think carefully about the intent and context of each QUERY.",
+                    "Score the relevance of the ITEMS above to each numbered QUERY "
+                    f"below on a scale from 1 to {scale}.",
+                    "Only score items that are directly relevant to the query.",
+                    f"Include up to the {limit} most relevant items for each query.",
+                    "Return the items identified by iri with the number of the query "
+                    "they are relevant to, in order from most relevant to least "
+                    "relevant.",
+                    "If there are no relevant items for a query, return no items for "
+                    "it.",
+                    "Respond in JSON.  Carefully adhere to the SCHEMA below.",
+                ]
+            ),
+            "queries": "\n".join(
+                f"{number}. {' '.join(query.split())}"
+                for number, query in enumerate(queries, start=1)
+            ),
+            "schema": """{"results": [{"query": integer, "iri": string, "relevance": integer}]}""",
+        }
+    )
+
+    try:
+        llm_response = await soli.llm.json_async(
+            prompt,
+            system="You are a legal knowledge management platform searching for "
+            "relevant items in a taxonomy.\n"
+            "Always respond in JSON according to SCHEMA.",
+            max_tokens=DEFAULT_MAX_TOKENS * len(queries),
+        )
+    except Exception as e:
+        raise RuntimeError("Error searching with LLM.") from e
+
+    llm_response_data = llm_response.data
+    if isinstance(llm_response_data, dict) and "results" in llm_response_data:
+        llm_results = llm_response_data["results"]
+    elif isinstance(llm_response_data, list):
+        llm_results = llm_response_data
+    else:
+        llm_results = []
+
+    # keep the first score for each query and class, dropping unknown IRIs
+    search_results: List[List[Tuple[OWLClass, int | float]]] = [[] for _ in queries]
+    seen = set()
+    for result in llm_results:
+        if not isinstance(result, dict):
+            continue
+        number, iri = result.get("query", None), result.get("iri", None)
+        if (
+            not isinstance(number, int)
+            or not 1 <= number <= len(queries)
+            or iri not in soli.iri_to_index
+            or (number, iri) in seen
+        ):
+            continue
+        seen.add((number, iri))
+        search_results[number - 1].append((soli[iri], result.get("relevance", 0)))
+
+    return [
+        sorted(query_results, key=lambda item: -item[1])[:limit]
+        for query_results in search_results
+    ]
+
+
+class LLMBatchJob:
+    """
+    Progress and results of one batch job.
+
+    Each text and branch pair becomes one item once it is finished, holding either
+    the classified IRIs or an error; items are kept in completion order so clients
+    can poll or stream from an offset.
+    """
+
+    def __init__(
+        self,
+        texts: List[str],
+        branches: Tuple[SOLITypes, ...],
+        max_depth: int,
+        limit: int,
+        ontology_version: str,
+    ) -> None:
+        """
+        Initialize a queued job.
+
+        Args:
+            texts (List[str]): Texts to classify
+            branches (Tuple[SOLITypes, ...]): Branches to classify each text against
+            max_depth (int): Maximum depth of each branch
+            limit (int): Maximum number of classes per text and branch
+            ontology_version (str): Version of the ontology the job runs against
+
+        Returns:
+            None
+        """
+        self.job_id = uuid.uuid4().hex
+        self.texts = texts
+        self.branches = branches
+        self.max_depth = max_depth
+        self.limit = limit
+        self.ontology_version = ontology_version
+        self.status = "queued"
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.items: List[Dict[str, Any]] = []
+        self.failed = 0
+        self.cached = 0
+        self._changed = asyncio.Event()
+
+        # number of items written to the job store, serialized by the lock
+        self.saved = 0
+        self.save_lock = asyncio.Lock()
+
+    @property
+    def total(self) -> int:
+        """
+        Get the number of text and branch pairs in the job.
+
+        Returns:
+            int: Number of items when the job is finished
+        """
+        return len(self.texts) * len(self.branches)
+
+    @property
+    def done(self) -> bool:
+        """
+        Check if the job has finished.
+
+        Returns:
+            bool: True once every item is finished or the job was cancelled
+        """
+        return self.finished is not None
+
+    def add_item(
+        self,
+        index: int,
+        soli_type: SOLITypes,
+        results: Optional[List[Tuple[str, int | float]]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record a finished text and branch pair.
+
+        Args:
+            index (int): Position of the text in the job
+            soli_type (SOLITypes): Branch
+            results (Optional[List[Tuple[str, int | float]]]): IRIs and scores
+            error (Optional[str]): Error message if the pair failed
+
+        Returns:
+            None
+        """
+        self.items.append(
+            {
+                "index": index,
+                "branch": soli_type.name.lower(),
+                "results": [[iri, score] for iri, score in results or []],
+                "error": error,
+            }
+        )
+        if error is not None:
+            self.failed += 1
+        self._notify()
+
+    def finish(self, status: str) -> None:
+        """
+        Mark the job as finished.
+
+        Args:
+            status (str): Final status
+
+        Returns:
+            None
+        """
+        self.status = status
+        self.finished = time.time()
+        self._notify()
+
+    def _notify(self) -> None:
+        """
+        Wake up streams waiting for new items.
+
+        Returns:
+            None
+        """
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def stream_items(self, offset: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield items from an offset as they finish, until the job is done.
+
+        Args:
+            offset (int): Number of items to skip
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Finished items
+        """
+        position = offset
+        while True:
+            while position < len(self.items):
+                yield self.items[position]
+                position += 1
+            if self.done:
+                return
+            await self._changed.wait()
+
+    def summary(self, offset: int = 0) -> Dict[str, Any]:
+        """
+        Get the job status with the items finished after an offset.
+
+        Args:
+            offset (int): Number of items to skip
+
+        Returns:
+            Dict[str, Any]: Job status and items
+        """
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total": self.total,
+            "completed": len(self.items),
+            "failed": self.failed,
+            "cached": self.cached,
+            "created": self.created,
+            "finished": self.finished,
+            "items": self.items[offset:],
+        }
+
+
+class LLMBatchStore:
+    """
+    SQLite record of batch job status and items, shared by every worker using the
+    same database file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open or create the job tables.
+
+        Args:
+            path (str): SQLite database path
+
+        Returns:
+            None
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_batch_job ("
+            "job_id TEXT PRIMARY KEY, summary TEXT NOT NULL, finished REAL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_batch_item ("
+            "job_id TEXT NOT NULL, position INTEGER NOT NULL, item TEXT NOT NULL, "
+            "PRIMARY KEY (job_id, position))"
+        )
+
+    def save(
+        self,
+        summary: Dict[str, Any],
+        start: int,
+        items: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Write a job's status and the items finished since the last save.
+
+        Args:
+            summary (Dict[str, Any]): Job status from LLMBatchJob.summary(), without
+                items
+            start (int): Position of the first new item
+            items (List[Dict[str, Any]]): New items
+
+        Returns:
+            None
+        """
+        if self._connection is None:
+            return
+
+        job_id = summary["job_id"]
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO llm_batch_item (job_id, position, item) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (job_id, position, json.dumps(item))
+                        for position, item in enumerate(items, start=start)
+                    ],
+                )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO llm_batch_job (job_id, summary, finished) "
+                    "VALUES (?, ?, ?)",
+                    (job_id, json.dumps(summary), summary["finished"]),
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def load(self, job_id: str, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Read a job's status and the items finished after an offset.
+
+        Args:
+            job_id (str): Job ID
+            offset (int): Number of items to skip
+
+        Returns:
+            Optional[Dict[str, Any]]: Job status and items, or None if unknown
+        """
+        if self._connection is None:
+            return None
+
+        with self._lock:
+            # read both tables in one snapshot so the items match the status
+            self._connection.execute("BEGIN")
+            try:
+                row = self._connection.execute(
+                    "SELECT summary FROM llm_batch_job WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                rows = self._connection.execute(
+                    "SELECT item FROM llm_batch_item WHERE job_id = ? AND position >= ? "
+                    "ORDER BY position",
+                    (job_id, offset),
+                ).fetchall()
+            finally:
+                self._connection.execute("COMMIT")
+        if row is None:
+            return None
+
+        return {**json.loads(row[0]), "items": [json.loads(item) for item, in rows]}
+
+    def purge_expired(self, cutoff: float) -> int:
+        """
+        Delete jobs that finished before a cutoff.
+
+        Args:
+            cutoff (float): Time before which finished jobs are deleted
+
+        Returns:
+            int: Number of deleted jobs
+        """
+        if self._connection is None:
+            return 0
+
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM llm_batch_item WHERE job_id IN "
+                "(SELECT job_id FROM llm_batch_job WHERE finished <= ?)",
+                (cutoff,),
+            )
+            cursor = self._connection.execute(
+                "DELETE FROM llm_batch_job WHERE finished <= ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+
+        Returns:
+            None
+        """
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+            self._connection = None
+
+
+class ConcurrencySlot:
+    """
+    One acquired slot on a semaphore that can be released and reacquired, and is
+    released at most once per acquisition.
+    """
+
+    def __init__(self, semaphore: asyncio.Semaphore) -> None:
+        """
+        Wrap a slot the caller has already acquired.
+
+        Args:
+            semaphore (asyncio.Semaphore): Semaphore the slot was acquired on
+
+        Returns:
+            None
+        """
+        self._semaphore = semaphore
+        self.held = True
+
+    async def acquire(self) -> None:
+        """
+        Reacquire the slot if it was released.
+
+        Returns:
+            None
+        """
+        if not self.held:
+            await self._semaphore.acquire()
+            self.held = True
+
+    def release(self) -> None:
+        """
+        Release the slot if it is held.
+
+        Returns:
+            None
+        """
+        if self.held:
+            self._semaphore.release()
+            self.held = False
+
+
+class LLMBatchRunner:
+    """
+    Run batch jobs in the background with shared LLM concurrency and retries.
+    """
+
+    def __init__(
+        self,
+        llm_cache: LLMSearchCache,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        job_ttl: float = DEFAULT_JOB_TTL,
+        store: Optional[LLMBatchStore] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        """
+        Initialize the runner.
+
+        Args:
+            llm_cache (LLMSearchCache): Cache shared with the single-query LLM searches
+            batch_size (int): Maximum number of texts packed into one LLM call
+            max_concurrency (int): Maximum number of LLM calls in flight for all jobs
+            max_retries (int): Retries for a failed LLM call
+            backoff (float): Seconds before the first retry, doubled for each retry
+            max_jobs (int): Maximum number of unfinished jobs
+            job_ttl (float): Seconds a finished job's results are kept
+            store (Optional[LLMBatchStore]): Shared record of jobs for other workers;
+                None keeps jobs visible only to the worker running them
+            poll_interval (float): Seconds between store reads when streaming a job
+                run by another worker
+
+        Returns:
+            None
+        """
+        self.llm_cache = llm_cache
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_jobs = max_jobs
+        self.job_ttl = job_ttl
+        self.store = store
+        self.poll_interval = poll_interval
+        self.jobs: Dict[str, LLMBatchJob] = {}
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def submit(
+        self,
+        soli: SOLI,
+        closure_index: ClosureIndex,
+        texts: List[str],
+        branches: Tuple[SOLITypes, ...],
+        max_depth: int,
+        limit: int,
+    ) -> LLMBatchJob:
+        """
+        Queue a job, record it in the store and start it in the background.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            closure_index (ClosureIndex): Closure of the graph
+            texts (List[str]): Texts to classify
+            branches (Tuple[SOLITypes, ...]): Branches to classify each text against
+            max_depth (int): Maximum depth of each branch
+            limit (int): Maximum number of classes per text and branch
+
+        Returns:
+            LLMBatchJob: Queued job
+
+        Raises:
+            BatchQueueFullError: If max_jobs jobs are still running
+        """
+        await self.purge_expired()
+        if len(self._tasks) >= self.max_jobs:
+            raise BatchQueueFullError(
+                f"Too many batch jobs running ({self.max_jobs}); retry later"
+            )
+
+        job = LLMBatchJob(
+            texts, branches, max_depth, limit, self.llm_cache.ontology_version
+        )
+        self.jobs[job.job_id] = job
+        await self._save(job)
+        task = asyncio.ensure_future(self._run(soli, closure_index, job))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+        return job
+
+    async def summary(self, job_id: str, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a job and the items finished after an offset, from this
+        worker if it runs the job and from the store otherwise.
+
+        Args:
+            job_id (str): Job ID
+            offset (int): Number of items to skip
+
+        Returns:
+            Optional[Dict[str, Any]]: Job status and items, or None if unknown or
+                expired
+        """
+        job = self.jobs.get(job_id, None)
+        if job is not None:
+            return job.summary(offset)
+        if self.store is None:
+            return None
+        return await asyncio.to_thread(self.store.load, job_id, offset)
+
+    async def stream_items(
+        self, job_id: str, offset: int = 0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a job's items from an offset as they finish, then its final status
+        without items.
+
+        A job run by another worker is followed by reading the store every
+        poll_interval seconds.
+
+        Args:
+            job_id (str): Job ID
+            offset (int): Number of items to skip
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Finished items, then the job status
+        """
+        job = self.jobs.get(job_id, None)
+        if job is not None:
+            async for item in job.stream_items(offset):
+                yield item
+            yield {**job.summary(), "items": []}
+            return
+
+        position = offset
+        while True:
+            summary = await self.summary(job_id, position)
+            if summary is None:
+                return
+            for item in summary["items"]:
+                yield item
+            position += len(summary["items"])
+            if summary["finished"] is not None:
+                yield {**summary, "items": []}
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def purge_expired(self) -> int:
+        """
+        Forget finished jobs older than job_ttl, here and in the store.
+
+        Returns:
+            int: Number of forgotten jobs in this worker
+        """
+        cutoff = time.time() - self.job_ttl
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.finished is not None and job.finished <= cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.purge_expired, cutoff)
+            except sqlite3.Error:
+                LOGGER.exception("Could not purge expired LLM batch jobs")
+        return len(expired)
+
+    async def _save(self, job: LLMBatchJob) -> None:
+        """
+        Write the job status and its new items to the store.
+
+        Saves of one job run one at a time, so the store never goes back to an
+        older status.  A failed save is logged and retried with the next one.
+
+        Args:
+            job (LLMBatchJob): Job to save
+
+        Returns:
+            None
+        """
+        if self.store is None:
+            return
+
+        async with job.save_lock:
+            start, end = job.saved, len(job.items)
+            try:
+                await asyncio.to_thread(
+                    self.store.save,
+                    job.summary(end),
+                    start,
+                    job.items[start:end],
+                )
+                job.saved = end
+            except sqlite3.Error:
+                LOGGER.exception("Could not save LLM batch job %s", job.job_id)
+
+    async def shutdown(self) -> None:
+        """
+        Cancel running jobs and wait for them to record their status.
+
+        Returns:
+            None
+        """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self) -> None:
+        """
+        Close the job store.
+
+        Returns:
+            None
+        """
+        if self.store is not None:
+            self.store.close()
+
+    async def _run(
+        self, soli: SOLI, closure_index: ClosureIndex, job: LLMBatchJob
+    ) -> None:
+        """
+        Classify every text against every branch, reusing cached results.
+
+        A chunk's task is only created once it holds one of the max_concurrency
+        slots, so a large job does not start every chunk at once.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            closure_index (ClosureIndex): Closure of the graph
+            job (LLMBatchJob): Job to run
+
+        Returns:
+            None
+        """
+        job.status = "running"
+        tasks: List[asyncio.Task] = []
+        try:
+            for soli_type in job.branches:
+                keys = [
+                    self.llm_cache.cache_key(
+                        soli_type,
+                        text,
+                        job.max_depth,
+                        ontology_version=job.ontology_version,
+                    )
+                    for text in job.texts
+                ]
+                pending: List[Tuple[int, str]] = []
+                for (index, text), results in zip(
+                    enumerate(job.texts), await asyncio.to_thread(self._lookup, keys)
+                ):
+                    if results is not None:
+                        job.cached += 1
+                        job.add_item(index, soli_type, results[: job.limit])
+                    else:
+                        pending.append((index, text))
+                await self._save(job)
+
+                for start in range(0, len(pending), self.batch_size):
+                    await self._semaphore.acquire()
+                    slot = ConcurrencySlot(self._semaphore)
+                    task = asyncio.ensure_future(
+                        self._run_chunk(
+                            soli,
+                            closure_index,
+                            job,
+                            soli_type,
+                            pending[start : start + self.batch_size],
+                            slot,
+                        )
+                    )
+                    # also frees the slot if the task is cancelled before it starts
+                    task.add_done_callback(lambda _, slot=slot: slot.release())
+                    tasks.append(task)
+
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            job.finish("cancelled")
+            if self.store is not None:
+                # the loop is shutting down, so record the status without awaiting
+                try:
+                    self.store.save(
+                        job.summary(len(job.items)),
+                        job.saved,
+                        job.items[job.saved :],
+                    )
+                except sqlite3.Error:
+                    LOGGER.exception("Could not save LLM batch job %s", job.job_id)
+            raise
+
+        job.finish("failed" if job.failed == job.total else "completed")
+        await self._save(job)
+        LOGGER.info(
+            "LLM batch job %s %s: %d items, %d cached, %d failed",
+            job.job_id,
+            job.status,
+            job.total,
+            job.cached,
+            job.failed,
+        )
+
+    async def _run_chunk(
+        self,
+        soli: SOLI,
+        closure_index: ClosureIndex,
+        job: LLMBatchJob,
+        soli_type: SOLITypes,
+        chunk: List[Tuple[int, str]],
+        slot: ConcurrencySlot,
+    ) -> None:
+        """
+        Classify a chunk of texts against one branch in one LLM call, with retries.
+
+        The slot is released while waiting to retry and once the LLM call is done;
+        the task's done callback releases it if the chunk ends any other way.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            closure_index (ClosureIndex): Closure of the graph
+            job (LLMBatchJob): Job the chunk belongs to
+            soli_type (SOLITypes): Branch
+            chunk (List[Tuple[int, str]]): Positions and texts
+            slot (ConcurrencySlot): Concurrency slot acquired for the chunk
+
+        Returns:
+            None
+        """
+        texts = [text for _, text in chunk]
+        search_set = await asyncio.to_thread(
+            self._search_set, soli, closure_index, soli_type, texts, job.max_depth
+        )
+
+        for attempt in range(self.max_retries + 1):
+            await slot.acquire()
+            try:
+                # rank as many classes as a single search would, so the cached
+                # lists serve /search/llm pages too
+                chunk_results = await search_by_llm_packed(
+                    soli, texts, search_set, limit=self.llm_cache.result_limit
+                )
+                break
+            except RuntimeError as e:
+                if attempt == self.max_retries:
+                    slot.release()
+                    LOGGER.warning(
+                        "LLM batch job %s gave up on %d texts after %d attempts",
+                        job.job_id,
+                        len(chunk),
+                        attempt + 1,
+                    )
+                    for index, _ in chunk:
+                        job.add_item(index, soli_type, error=str(e))
+                    await self._save(job)
+                    return
+
+                # exponential backoff with jitter so retries from many chunks spread out
+                slot.release()
+                await asyncio.sleep(
+                    self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+                )
+        slot.release()
+
+        chunk_items = [
+            (index, text, [(owl_class.iri, score) for owl_class, score in results])
+            for (index, text), results in zip(chunk, chunk_results)
+        ]
+        await asyncio.to_thread(
+            self._store,
+            [
+                (
+                    self.llm_cache.cache_key(
+                        soli_type,
+                        text,
+                        job.max_depth,
+                        ontology_version=job.ontology_version,
+                    ),
+                    results,
+                )
+                for _, text, results in chunk_items
+            ],
+        )
+        for index, _, results in chunk_items:
+            job.add_item(index, soli_type, results[: job.limit])
+        await self._save(job)
+
+    def _lookup(self, keys: List[str]) -> List[Optional[List[Tuple[str, int | float]]]]:
+        """
+        Get cached results for several keys; runs in a worker thread.
+
+        A failed lookup counts as a miss for every key.
+
+        Args:
+            keys (List[str]): Cache keys
+
+        Returns:
+            List[Optional[List[Tuple[str, int | float]]]]: IRIs and scores for each
+                key, or None if not cached
+        """
+        try:
+            return [self.llm_cache.get(key) for key in keys]
+        except sqlite3.Error:
+            LOGGER.exception("LLM search cache lookup failed for a batch job")
+            return [None] * len(keys)
+
+    def _store(self, entries: List[Tuple[str, List[Tuple[str, int | float]]]]) -> None:
+        """
+        Store results in the LLM search cache; runs in a worker thread.
+
+        A failed store is logged; the job still records the results.
+
+        Args:
+            entries (List[Tuple[str, List[Tuple[str, int | float]]]]): Cache keys with
+                IRIs and scores
+
+        Returns:
+            None
+        """
+        try:
+            for key, results in entries:
+                self.llm_cache.put(key, results)
+        except sqlite3.Error:
+            LOGGER.exception("Could not store LLM batch results in the cache")
+
+    def _search_set(
+        self,
+        soli: SOLI,
+        closure_index: ClosureIndex,
+        soli_type: SOLITypes,
+        texts: List[str],
+        max_depth: int,
+    ) -> List[OWLClass]:
+        """
+        Get the classes to send to the LLM for a chunk of texts; runs in a worker
+        thread.
+
+        Without a retriever this is the whole branch; with one it is the union of each
+        text's candidates, so a packed call sees every class a single call would.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            closure_index (ClosureIndex): Closure of the graph
+            soli_type (SOLITypes): Branch
+            texts (List[str]): Texts in the chunk
+            max_depth (int): Maximum depth of the branch
+
+        Returns:
+            List[OWLClass]: Classes without duplicates
+        """
+        branch_classes = [
+            soli.classes[class_index]
+            for class_index in closure_index.branch(
+                soli_type, max_hops=max_depth if max_depth >= 0 else None
+            )
+        ]
+        retriever = self.llm_cache.retriever
+        candidates = (
+            [
+                owl_class
+                for text in texts
+                for owl_class in retriever.narrow(text, branch_classes)
+            ]
+            # a job submitted before a reload keeps its graph; the retriever does not
+            if retriever is not None and retriever.engine.soli is soli
+            else branch_classes
+        )
+        return list({owl_class.iri: owl_class for owl_class in candidates}.values())
@@ -0,0 +1,437 @@
+"""
+Persistent cache and request coalescing for LLM searches.
+"""
+
+# imports
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# packages
+from soli import SOLI, OWLClass, SOLITypes
+
+# project
+from soli_api.closure import ClosureIndex
+from soli_api.llm_client import LLMUnavailableError
+from soli_api.rerank import CandidateRetriever
+
+# default cache lifetime in seconds
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+# default number of ranked results requested from the LLM and cached per search
+DEFAULT_RESULT_LIMIT = 100
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for use in a cache key by folding case and whitespace.
+
+    Args:
+        query (str): Query string
+
+    Returns:
+        str: Normalized query
+    """
+    return " ".join(query.split()).casefold()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one in-flight call.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the in-flight table.
+
+        Returns:
+            None
+        """
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Check if a call for a key is in flight.
+
+        Args:
+            key (Hashable): Call key
+
+        Returns:
+            bool: True if a call is in flight
+        """
+        return key in self._in_flight
+
+    def __len__(self) -> int:
+        """
+        Get the number of calls in flight.
+
+        Returns:
+            int: Number of calls in flight
+        """
+        return len(self._in_flight)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable]):
+        """
+        Await the in-flight call for a key, starting it with the factory if needed.
+
+        The call runs as its own task, so a caller that is cancelled does not cancel
+        the call for the others waiting on it.
+
+        Args:
+            key (Hashable): Call key
+            factory (Callable[[], Awaitable]): Function starting the call
+
+        Returns:
+            Any: Result of the shared call
+        """
+        future = self._in_flight.get(key, None)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(future)
+
+
+class LLMSearchCache:
+    """
+    SQLite-backed cache of LLM search results with single-flight coalescing.
+
+    Results are stored as IRIs and scores keyed on the model, branch, depth, result
+    limit, candidate count, ontology version and normalized query, so they survive
+    restarts and are shared by every worker using the same database file.  Each
+    search asks the LLM for one ranked list of up to result_limit classes, and every
+    page of results is sliced from that list.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        model: str,
+        ontology_version: str,
+        ttl: Optional[float] = DEFAULT_TTL,
+        retriever: Optional[CandidateRetriever] = None,
+        result_limit: int = DEFAULT_RESULT_LIMIT,
+    ) -> None:
+        """
+        Open or create the cache database.
+
+        Args:
+            path (Optional[str]): SQLite database path; None disables persistence
+            model (str): LLM model name
+            ontology_version (str): Version of the loaded ontology
+            ttl (Optional[float]): Seconds before an entry expires; None for no expiry
+            retriever (Optional[CandidateRetriever]): Narrows each branch before the
+                LLM call; None sends the whole branch
+            result_limit (int): Maximum number of ranked results per search
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.model = model
+        self.ontology_version = ontology_version
+        self.ttl = ttl
+        self.retriever = retriever
+        self.result_limit = result_limit
+        self.single_flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        if path is not None:
+            self._connection = sqlite3.connect(
+                path, check_same_thread=False, isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_search ("
+                "key TEXT PRIMARY KEY, results TEXT NOT NULL, created REAL NOT NULL)"
+            )
+
+    def cache_key(
+        self,
+        soli_type: SOLITypes,
+        query: str,
+        max_depth: int,
+        ontology_version: Optional[str] = None,
+    ) -> str:
+        """
+        Get the cache key for an LLM search.
+
+        The key leaves out the page, so every page of a search is sliced from the
+        same ranked list.
+
+        Args:
+            soli_type (SOLITypes): Taxonomy branch searched
+            query (str): Query string
+            max_depth (int): Maximum depth of the branch
+            ontology_version (Optional[str]): Ontology version searched; the current
+                version if None
+
+        Returns:
+            str: Cache key
+        """
+        return json.dumps(
+            [
+                self.model,
+                soli_type.name,
+                max_depth,
+                self.result_limit,
+                self.retriever.max_candidates if self.retriever is not None else None,
+                ontology_version or self.ontology_version,
+                normalize_query(query),
+            ],
+            ensure_ascii=False,
+        )
+
+    def set_ontology(
+        self, ontology_version: str, retriever: Optional[CandidateRetriever]
+    ) -> None:
+        """
+        Key new searches on a reloaded ontology.
+
+        Entries for the previous version stay in the database until they expire but
+        are no longer looked up.  Searches already in flight finish on the previous
+        version.
+
+        Args:
+            ontology_version (str): Version of the reloaded ontology
+            retriever (Optional[CandidateRetriever]): Retriever over the reloaded graph
+
+        Returns:
+            None
+        """
+        self.ontology_version = ontology_version
+        self.retriever = retriever
+
+    def get(self, key: str) -> Optional[List[Tuple[str, int | float]]]:
+        """
+        Get cached results if they have not expired.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[List[Tuple[str, int | float]]]: IRIs and scores, or None
+        """
+        if self._connection is None:
+            return None
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT results, created FROM llm_search WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        results, created = row
+        if self.ttl is not None and created + self.ttl <= time.time():
+            return None
+        return [(iri, score) for iri, score in json.loads(results)]
+
+    def put(self, key: str, results: List[Tuple[str, int | float]]) -> None:
+        """
+        Store results.
+
+        Args:
+            key (str): Cache key
+            results (List[Tuple[str, int | float]]): IRIs and scores
+
+        Returns:
+            None
+        """
+        if self._connection is None:
+            return
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_search (key, results, created) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(results), time.time()),
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries.
+
+        Returns:
+            int: Number of deleted entries
+        """
+        if self._connection is None or self.ttl is None:
+            return 0
+
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM llm_search WHERE created <= ?", (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, coalesced calls and calls in flight
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self.single_flight),
+        }
+
+    @staticmethod
+    def _search_set(
+        soli: SOLI,
+        closure_index: ClosureIndex,
+        soli_type: SOLITypes,
+        query: str,
+        max_depth: int,
+        retriever: Optional[CandidateRetriever],
+    ) -> Tuple[List[OWLClass], List[OWLClass]]:
+        """
+        Get the classes of a branch and the candidates to send to the LLM.
+
+        Each class is listed once, nearest to the root first.  Scoring the branch
+        takes a while on large branches, so this is run in a worker thread.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            closure_index (ClosureIndex): Closure of the graph
+            soli_type (SOLITypes): Taxonomy branch to search
+            query (str): Query string
+            max_depth (int): Maximum depth of the branch
+            retriever (Optional[CandidateRetriever]): Narrows the branch; None sends
+                the whole branch
+
+        Returns:
+            Tuple[List[OWLClass], List[OWLClass]]: Branch classes and candidates
+        """
+        search_set = [
+            soli.classes[class_index]
+            for class_index in closure_index.branch(
+                soli_type, max_hops=max_depth if max_depth >= 0 else None
+            )
+        ]
+        if retriever is None:
+            return search_set, search_set
+        return search_set, retriever.narrow(query, search_set)
+
+    async def search(
+        self,
+        soli: SOLI,
+        closure_index: ClosureIndex,
+        soli_type: SOLITypes,
+        query: str,
+        max_depth: int,
+    ) -> List[Tuple[OWLClass, int | float]]:
+        """
+        Search a taxonomy branch with the LLM, using cached or in-flight results when
+        available.
+
+        The whole ranked list is returned; callers slice the page they need from it.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            closure_index (ClosureIndex): Closure of the graph
+            soli_type (SOLITypes): Taxonomy branch to search
+            query (str): Query string
+            max_depth (int): Maximum depth of the branch
+
+        Returns:
+            List[Tuple[OWLClass, int | float]]: Classes with their relevance scores,
+                best first
+        """
+        # hold on to the version's retriever in case the ontology is reloaded
+        retriever = self.retriever
+        limit = self.result_limit
+        key = self.cache_key(soli_type, query, max_depth)
+        try:
+            results = await asyncio.to_thread(self.get, key)
+        except sqlite3.Error:
+            LOGGER.exception("LLM search cache lookup failed; searching without it")
+            results = None
+        if results is not None:
+            self.hits += 1
+        else:
+            if key in self.single_flight:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+
+            async def call_llm() -> List[Tuple[str, int | float]]:
+                """
+                Run the LLM search on the branch, or on the retrieved candidates, and
+                store its results.
+
+                Returns:
+                    List[Tuple[str, int | float]]: IRIs and scores
+                """
+                search_set, candidates = await asyncio.to_thread(
+                    self._search_set,
+                    soli,
+                    closure_index,
+                    soli_type,
+                    query,
+                    max_depth,
+                    retriever,
+                )
+                if retriever is not None:
+                    LOGGER.info(
+                        "LLM search on %s sent %d of %d classes",
+                        soli_type.name,
+                        len(candidates),
+                        len(search_set),
+                    )
+
+                try:
+                    class_results = await soli.search_by_llm(
+                        query=query, search_set=candidates, limit=limit
+                    )
+                except RuntimeError as e:
+                    # surface refusals from the managed client instead of a 500
+                    if isinstance(e.__cause__, LLMUnavailableError):
+                        raise e.__cause__ from None
+                    raise
+                if retriever is not None:
+                    retriever.sample_recall(
+                        soli, query, search_set, candidates, limit, class_results
+                    )
+
+                llm_results = [
+                    (owl_class.iri, score) for owl_class, score in class_results
+                ]
+                try:
+                    await asyncio.to_thread(self.put, key, llm_results)
+                except sqlite3.Error:
+                    # the results are still good; they just won't be cached
+                    LOGGER.exception("Could not store LLM search results in the cache")
+                return llm_results
+
+            results = await self.single_flight.run(key, call_llm)
+
+        return [(soli[iri], score) for iri, score in results if soli[iri] is not None]
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+
+        Returns:
+            None
+        """
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+            self._connection = None
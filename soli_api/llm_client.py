@@ -0,0 +1,527 @@
+"""
+Managed access to the LLM backend.
+
+Every /search/llm/* request used to call the provider directly, so a traffic spike
+opened as many provider calls as there were requests and a slow provider held them
+open for up to the client library's ten minute timeout.  ManagedLLM wraps the model
+attached to the SOLI graph with a concurrency limit, a bounded wait queue with its own
+timeout, a per-call timeout and a circuit breaker, and gives it one pooled HTTP client sized to the
+concurrency limit.  Limits apply per worker process.
+"""
+
+# imports
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+# packages
+import httpx
+from alea_llm_client import BaseAIModel
+
+# defaults
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_QUEUE_TIMEOUT = 10.0
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# number of recent call latencies kept per model
+DEFAULT_LATENCY_WINDOW = 200
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+class LLMUnavailableError(Exception):
+    """
+    Raised when an LLM call is refused or abandoned to protect the API.
+    """
+
+    # HTTP status returned to the client
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: float = 1.0) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            message (str): Error message
+            retry_after (float): Seconds the client should wait before retrying
+
+        Returns:
+            None
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMQueueFullError(LLMUnavailableError):
+    """
+    Raised when too many LLM calls are already waiting for a slot, or a call waited
+    longer than the queue timeout for one.
+    """
+
+    status_code = 429
+
+
+class LLMCircuitOpenError(LLMUnavailableError):
+    """
+    Raised while the circuit breaker is open after repeated failures.
+    """
+
+    status_code = 503
+
+
+class LLMTimeoutError(LLMUnavailableError):
+    """
+    Raised when an LLM call takes longer than the per-call timeout.
+    """
+
+    status_code = 504
+
+
+class LatencyTracker:
+    """
+    Quantiles over a sliding window of recent call latencies.
+    """
+
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW) -> None:
+        """
+        Initialize an empty window.
+
+        Args:
+            window (int): Number of recent latencies to keep
+
+        Returns:
+            None
+        """
+        self._samples: Deque[float] = deque(maxlen=max(1, window))
+
+    def __len__(self) -> int:
+        """
+        Get the number of latencies in the window.
+
+        Returns:
+            int: Number of latencies
+        """
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """
+        Add a latency to the window.
+
+        Args:
+            seconds (float): Call latency in seconds
+
+        Returns:
+            None
+        """
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Get a latency quantile over the window.
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            Optional[float]: Latency in seconds, or None if nothing was recorded
+        """
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class CircuitBreaker:
+    """
+    Fail fast after consecutive failures, then let one trial call through.
+
+    The breaker opens after failure_threshold consecutive failures.  Once
+    reset_timeout seconds have passed it is half open: one trial call is allowed,
+    and its outcome closes or reopens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker
+            reset_timeout (float): Seconds before a trial call is allowed
+
+        Returns:
+            None
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """
+        Get the breaker state.
+
+        Returns:
+            str: "closed", "open" or "half_open"
+        """
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def retry_after(self) -> float:
+        """
+        Get the seconds until a trial call will be allowed.
+
+        Returns:
+            float: Seconds, 0 if calls are allowed now
+        """
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Check if a call may start, claiming the trial call when half open.
+
+        Returns:
+            bool: True if the call may start
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """
+        Give back the trial call of a call that ended without an outcome.
+
+        Returns:
+            None
+        """
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """
+        Close the breaker after a successful call.
+
+        Returns:
+            None
+        """
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """
+        Count a failed call, opening the breaker at the threshold or after a failed
+        trial call.
+
+        Returns:
+            None
+        """
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._trial_in_flight:
+                LOGGER.warning(
+                    "LLM circuit breaker opened after %d consecutive failures",
+                    self.failures,
+                )
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class ManagedLLM:
+    """
+    LLM model wrapper limiting concurrency, queueing, call time and failures.
+
+    It exposes json_async like the wrapped model, which is the call SOLI makes for
+    LLM searches, and forwards every other attribute to the model.
+    """
+
+    def __init__(
+        self,
+        llm: BaseAIModel,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+        timeout: float = DEFAULT_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        """
+        Wrap a model.
+
+        Args:
+            llm (BaseAIModel): Model to wrap
+            max_concurrency (int): Maximum number of calls in flight
+            max_queue (int): Maximum number of calls waiting for a slot
+            queue_timeout (float): Seconds a call may wait for a slot
+            timeout (float): Seconds before a call that holds a slot is abandoned
+            connect_timeout (float): Seconds to establish a provider connection
+            failure_threshold (int): Consecutive failures that open the breaker
+            reset_timeout (float): Seconds the breaker stays open
+
+        Returns:
+            None
+        """
+        self.llm = llm
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyTracker()
+        self.active = 0
+        self.queued = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # counters
+        self.calls = 0
+        self.rejected = 0
+        self.queue_timeouts = 0
+        self.timeouts = 0
+        self.failures = 0
+
+        # one pooled client per model, with as many connections as calls in flight
+        endpoint = getattr(llm, "endpoint", None)
+        if endpoint is not None and hasattr(llm, "async_client"):
+            llm.async_client = httpx.AsyncClient(
+                base_url=endpoint,
+                http2=True,
+                timeout=httpx.Timeout(timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Forward other attributes to the wrapped model.
+
+        Args:
+            name (str): Attribute name
+
+        Returns:
+            Any: Attribute of the wrapped model
+        """
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    async def json_async(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a JSON completion on the wrapped model within the limits.
+
+        Args:
+            *args (Any): Positional arguments for the model
+            **kwargs (Any): Keyword arguments for the model
+
+        Returns:
+            Any: The model's JSON response
+
+        Raises:
+            LLMUnavailableError: If the call is refused, times out or the breaker is open
+        """
+        return await self.call(self.json_completion, *args, **kwargs)
+
+    async def json_completion(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Send one JSON completion request to the wrapped model, without limits.
+
+        This is the only place that reaches into the client library.  The public
+        BaseAIModel.json_async goes through the library's retry wrapper, which sends
+        every successful request twice and sleeps between retries outside of any
+        timeout, so the single-request method behind it is called instead and
+        retries are left to callers such as the batch runner.
+
+        Args:
+            *args (Any): Positional arguments for the model
+            **kwargs (Any): Keyword arguments for the model
+
+        Returns:
+            Any: The model's JSON response
+        """
+        # pylint: disable=protected-access
+        return await self.llm._json_async(*args, **kwargs)
+
+    async def call(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Run a model call within the concurrency, queue, timeout and breaker limits.
+
+        The wait for a slot and the call itself are timed separately.  Only calls that
+        got a slot count towards the breaker, so a backlog in this process cannot
+        open it while the backend is healthy.
+
+        Args:
+            func (Callable[..., Awaitable[Any]]): Model coroutine function
+            *args (Any): Positional arguments
+            **kwargs (Any): Keyword arguments
+
+        Returns:
+            Any: Result of the call
+
+        Raises:
+            LLMUnavailableError: If the call is refused, waits too long for a slot,
+                times out or the breaker is open
+        """
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise LLMQueueFullError(
+                f"Too many LLM searches waiting ({self.max_queue}); retry later"
+            )
+        if self.breaker.state == "open":
+            self.rejected += 1
+            raise LLMCircuitOpenError(
+                "LLM backend is unavailable; failing fast",
+                retry_after=self.breaker.retry_after(),
+            )
+
+        await self._acquire_slot()
+        try:
+            # checked again with the slot held; this claims the trial call when half open
+            if not self.breaker.allow():
+                self.rejected += 1
+                raise LLMCircuitOpenError(
+                    "LLM backend is unavailable; failing fast",
+                    retry_after=self.breaker.retry_after(),
+                )
+            return await self._run_call(func, *args, **kwargs)
+        finally:
+            self._semaphore.release()
+
+    async def _acquire_slot(self) -> None:
+        """
+        Wait up to queue_timeout seconds for a slot.
+
+        Returns:
+            None
+
+        Raises:
+            LLMQueueFullError: If no slot was free in time
+        """
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError as e:
+            self.queue_timeouts += 1
+            raise LLMQueueFullError(
+                f"No LLM slot free within {self.queue_timeout:g} seconds; retry later"
+            ) from e
+        finally:
+            self.queued -= 1
+
+    async def _run_call(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Run the call in a held slot and record its outcome on the breaker.
+
+        Args:
+            func (Callable[..., Awaitable[Any]]): Model coroutine function
+            *args (Any): Positional arguments
+            **kwargs (Any): Keyword arguments
+
+        Returns:
+            Any: Result of the call
+
+        Raises:
+            LLMTimeoutError: If the call takes longer than timeout seconds
+        """
+        self.calls += 1
+        self.active += 1
+        start_time = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), self.timeout)
+        except asyncio.TimeoutError as e:
+            self.timeouts += 1
+            self.breaker.record_failure()
+            raise LLMTimeoutError(
+                f"LLM call exceeded {self.timeout:g} seconds",
+                retry_after=self.breaker.retry_after() or 1.0,
+            ) from e
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.active -= 1
+
+        self.latency.record(time.perf_counter() - start_time)
+        self.breaker.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the client counters and breaker state.
+
+        Returns:
+            Dict[str, Any]: Model, state, calls in flight and waiting, counters and
+                latency quantiles
+        """
+        return {
+            "model": getattr(self.llm, "model", ""),
+            "state": self.breaker.state,
+            "p50": self.latency.quantile(0.5),
+            "p95": self.latency.quantile(0.95),
+            "active": self.active,
+            "queued": self.queued,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "queue_timeouts": self.queue_timeouts,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+
+def load_managed_llm(
+    llm: Optional[BaseAIModel], client_config: Dict[str, Any]
+) -> Optional[ManagedLLM]:
+    """
+    Wrap a model with the limits described by the configuration.
+
+    Args:
+        llm (Optional[BaseAIModel]): Model, or None if no LLM is configured
+        client_config (Dict[str, Any]): The "llm_client" configuration block
+
+    Returns:
+        Optional[ManagedLLM]: Managed model, or None if llm is None
+    """
+    if llm is None:
+        return None
+
+    return ManagedLLM(
+        llm,
+        max_concurrency=client_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+        max_queue=client_config.get("max_queue", DEFAULT_MAX_QUEUE),
+        queue_timeout=client_config.get("queue_timeout", DEFAULT_QUEUE_TIMEOUT),
+        timeout=client_config.get("timeout", DEFAULT_TIMEOUT),
+        connect_timeout=client_config.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+        failure_threshold=client_config.get(
+            "failure_threshold", DEFAULT_FAILURE_THRESHOLD
+        ),
+        reset_timeout=client_config.get("reset_timeout", DEFAULT_RESET_TIMEOUT),
+    )
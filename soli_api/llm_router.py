@@ -0,0 +1,238 @@
+"""
+Routing of LLM calls across several configured backends.
+
+LLMRouter sits where a single model used to be attached to the SOLI graph.  Each call
+goes to the healthy backend with the lowest median latency.  If that backend fails,
+the call moves to the next one.  With hedging on, a second backend is also started
+when the first has not answered within its recent p95 latency, and the first answer
+wins.
+"""
+
+# imports
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List, Optional, Set
+
+# project
+from soli_api.llm_client import LLMCircuitOpenError, ManagedLLM
+
+# hedging defaults
+DEFAULT_HEDGE_QUANTILE = 0.95
+DEFAULT_HEDGE_MIN_DELAY = 0.5
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+class LLMRouter:
+    """
+    Send each LLM call to the best backend, with failover and optional hedging.
+    """
+
+    def __init__(
+        self,
+        backends: List[ManagedLLM],
+        hedge: bool = False,
+        hedge_quantile: float = DEFAULT_HEDGE_QUANTILE,
+        hedge_min_delay: float = DEFAULT_HEDGE_MIN_DELAY,
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            backends (List[ManagedLLM]): Backends in order of preference
+            hedge (bool): Whether to start a second backend when the first is slow
+            hedge_quantile (float): Latency quantile of the first backend to wait for
+                before hedging
+            hedge_min_delay (float): Minimum seconds to wait before hedging
+
+        Returns:
+            None
+        """
+        if not backends:
+            raise ValueError("At least one LLM backend is required.")
+
+        self.backends = backends
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.model = "|".join(dict.fromkeys(backend.model for backend in backends))
+
+        # counters
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Forward other attributes to the first backend.
+
+        Args:
+            name (str): Attribute name
+
+        Returns:
+            Any: Attribute of the first backend
+        """
+        if name == "backends":
+            raise AttributeError(name)
+        return getattr(self.backends[0], name)
+
+    def ranked_backends(self) -> List[ManagedLLM]:
+        """
+        Get the backends to try, best first.
+
+        Backends with an open circuit breaker are left out.  Closed backends come
+        before half-open ones, then lower median latency first.  Backends without
+        recent calls keep their configured order after those with latencies.
+
+        Returns:
+            List[ManagedLLM]: Backends to try
+        """
+        ranked = []
+        for position, backend in enumerate(self.backends):
+            state = backend.breaker.state
+            if state == "open":
+                continue
+            median = backend.latency.quantile(0.5)
+            ranked.append(
+                (
+                    state != "closed",
+                    median if median is not None else math.inf,
+                    position,
+                    backend,
+                )
+            )
+        ranked.sort(key=lambda item: item[:3])
+        return [item[3] for item in ranked]
+
+    def hedge_delay(self, backend: ManagedLLM) -> float:
+        """
+        Get the seconds to wait for a backend before hedging.
+
+        Args:
+            backend (ManagedLLM): Backend handling the call
+
+        Returns:
+            float: Seconds
+        """
+        latency = backend.latency.quantile(self.hedge_quantile)
+        return max(self.hedge_min_delay, latency or 0.0)
+
+    async def json_async(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a JSON completion on the best backend, failing over and hedging as
+        configured.
+
+        Args:
+            *args (Any): Positional arguments for the model
+            **kwargs (Any): Keyword arguments for the model
+
+        Returns:
+            Any: The first successful JSON response
+
+        Raises:
+            LLMUnavailableError: If every backend refused the call
+            Exception: The last backend's error if every backend failed
+        """
+        queue = self.ranked_backends()
+        if not queue:
+            raise LLMCircuitOpenError(
+                "All LLM backends are unavailable; failing fast",
+                retry_after=min(
+                    backend.breaker.retry_after() for backend in self.backends
+                ),
+            )
+
+        first_backend = queue[0]
+        task_backends: Dict[asyncio.Future, ManagedLLM] = {}
+        pending: Set[asyncio.Future] = set()
+        errors: List[BaseException] = []
+        hedged = False
+
+        def start_next() -> None:
+            """
+            Start the call on the next backend in the queue.
+
+            Returns:
+                None
+            """
+            backend = queue.pop(0)
+            task = asyncio.ensure_future(backend.json_async(*args, **kwargs))
+            task_backends[task] = backend
+            pending.add(task)
+
+        start_next()
+        try:
+            while pending:
+                timeout: Optional[float] = None
+                if self.hedge and not hedged and queue and len(pending) == 1:
+                    timeout = self.hedge_delay(first_backend)
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # the first backend is slower than usual; race a second one
+                    hedged = True
+                    self.hedged += 1
+                    start_next()
+                    continue
+
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if hedged and task_backends[task] is not first_backend:
+                            self.hedge_wins += 1
+                        return task.result()
+                    errors.append(error)
+                    LOGGER.warning(
+                        "LLM backend %s failed: %s", task_backends[task].model, error
+                    )
+
+                if not pending and queue:
+                    self.failovers += 1
+                    start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise errors[-1]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the state of every backend and the routing counters.
+
+        Returns:
+            Dict[str, Any]: Backend statistics and hedging and failover counters
+        """
+        return {
+            "backends": [backend.stats() for backend in self.backends],
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+        }
+
+
+def load_llm_router(
+    backends: List[ManagedLLM], routing_config: Dict[str, Any]
+) -> Optional[LLMRouter]:
+    """
+    Create the router described by the configuration.
+
+    Args:
+        backends (List[ManagedLLM]): Backends in order of preference
+        routing_config (Dict[str, Any]): The "llm.routing" configuration block
+
+    Returns:
+        Optional[LLMRouter]: Router, or None if no backend is configured
+    """
+    if not backends:
+        return None
+
+    return LLMRouter(
+        backends,
+        hedge=routing_config.get("hedge", False),
+        hedge_quantile=routing_config.get("hedge_quantile", DEFAULT_HEDGE_QUANTILE),
+        hedge_min_delay=routing_config.get("hedge_min_delay", DEFAULT_HEDGE_MIN_DELAY),
+    )
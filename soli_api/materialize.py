@@ -0,0 +1,155 @@
+"""
+Materialized class renderings for IRI resolution.
+"""
+
+# imports
+import json
+from typing import Dict, Iterable, Optional
+
+# packages
+from soli import SOLI, OWLClass
+
+# project
+from soli_api.cache import LRUCache
+from soli_api.templates.basic_html import render_tailwind_html
+
+# media types for each supported class format
+CLASS_MEDIA_TYPES: Dict[str, str] = {
+    "json": "application/json",
+    "jsonld": "application/ld+json",
+    "xml": "application/xml",
+    "markdown": "text/markdown",
+    "html": "text/html",
+}
+
+# formats rendered up front in eager mode; html is large and best left lazy
+DEFAULT_EAGER_FORMATS = ("json", "jsonld", "xml", "markdown")
+
+# supported materialization modes
+MATERIALIZE_MODES = ("off", "lazy", "eager")
+
+
+def render_class(owl_class: OWLClass, soli: SOLI, response_format: str) -> bytes:
+    """
+    Render a class in the requested format as response bytes.
+
+    Args:
+        owl_class (OWLClass): SOLI OWLClass object
+        soli (SOLI): SOLI graph object
+        response_format (str): One of the keys in CLASS_MEDIA_TYPES
+
+    Returns:
+        bytes: Rendered response body
+    """
+    if response_format == "json":
+        return owl_class.model_dump_json().encode("utf-8")
+    if response_format == "jsonld":
+        return json.dumps(
+            owl_class.to_jsonld(),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+    if response_format == "xml":
+        return owl_class.to_owl_xml().encode("utf-8")
+    if response_format == "markdown":
+        return owl_class.to_markdown().encode("utf-8")
+    if response_format == "html":
+        return render_tailwind_html(owl_class, soli).encode("utf-8")
+
+    raise ValueError(f"Unsupported class format: {response_format}")
+
+
+class ClassRenderCache:
+    """
+    Store of rendered class bodies so IRI resolution is a lookup instead of a re-render.
+
+    Modes:
+        - off: render on every request
+        - lazy: render on first request and keep up to max_entries bodies
+        - eager: render every class in the eager formats up front; other formats are lazy
+    """
+
+    def __init__(
+        self,
+        soli: SOLI,
+        mode: str = "lazy",
+        max_entries: int = 8192,
+        eager_formats: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Initialize the render cache.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            mode (str): Materialization mode; off, lazy or eager
+            max_entries (int): Maximum number of lazily rendered bodies to keep
+            eager_formats (Optional[Iterable[str]]): Formats to render up front in eager mode
+
+        Returns:
+            None
+        """
+        if mode not in MATERIALIZE_MODES:
+            raise ValueError(
+                f"Invalid materialize mode: {mode}. Must be one of {MATERIALIZE_MODES}."
+            )
+
+        self.soli = soli
+        self.mode = mode
+        self.eager_formats = tuple(eager_formats or DEFAULT_EAGER_FORMATS)
+        self._materialized: Dict[tuple, bytes] = {}
+        self._lazy = LRUCache(max_entries=0 if mode == "off" else max_entries)
+
+    def materialize(self) -> int:
+        """
+        Render every class in the eager formats.
+
+        Returns:
+            int: Number of rendered bodies
+        """
+        for owl_class in self.soli.classes:
+            for response_format in self.eager_formats:
+                self._materialized[(owl_class.iri, response_format)] = render_class(
+                    owl_class, self.soli, response_format
+                )
+        return len(self._materialized)
+
+    def get(self, owl_class: OWLClass, response_format: str) -> bytes:
+        """
+        Get the rendered body for a class, rendering it if needed.
+
+        Args:
+            owl_class (OWLClass): SOLI OWLClass object
+            response_format (str): One of the keys in CLASS_MEDIA_TYPES
+
+        Returns:
+            bytes: Rendered response body
+        """
+        key = (owl_class.iri, response_format)
+        content = self._materialized.get(key, None)
+        if content is not None:
+            return content
+
+        return self._lazy.get_or_set(
+            key, lambda: render_class(owl_class, self.soli, response_format)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the size and counters of the lazy rendering cache.
+
+        Returns:
+            Dict[str, int]: Entries, bytes, hits, misses, evictions and expirations
+        """
+        return self._lazy.stats()
+
+    def clear(self) -> None:
+        """
+        Drop all rendered bodies.
+
+        Returns:
+            None
+        """
+        self._materialized.clear()
+        self._lazy.clear()
@@ -0,0 +1,149 @@
+"""
+Models for the graph neighborhood, subgraph and hierarchy endpoints.
+"""
+
+# imports
+from enum import Enum
+from typing import List, Optional
+
+# packages
+from pydantic import BaseModel, Field
+
+# project
+from soli_api.branches import SOLIBranch
+
+# maximum number of hops from the seed classes
+MAX_HOPS = 5
+
+# default and maximum number of classes returned
+DEFAULT_MAX_NODES = 500
+MAX_NODES = 10000
+
+# maximum number of paths to the root returned for one class
+MAX_PATHS = 1000
+
+
+class GraphRelation(str, Enum):
+    """
+    Relations between classes that can be followed or exported.
+    """
+
+    SUB_CLASS_OF = "sub_class_of"
+    PARENT_CLASS_OF = "parent_class_of"
+    SEE_ALSO = "see_also"
+    IS_DEFINED_BY = "is_defined_by"
+
+
+class GraphNode(BaseModel):
+    """
+    Class in a graph response.
+    """
+
+    # IRI of the class
+    iri: str
+
+    # Label of the class
+    label: Optional[str]
+
+    # Number of hops from the nearest seed class
+    hops: int
+
+
+class GraphEdge(BaseModel):
+    """
+    Relation between two classes, read as "source relation target".
+    """
+
+    # IRI of the class holding the relation
+    source: str
+
+    # IRI of the related class
+    target: str
+
+    # Relation name
+    relation: GraphRelation
+
+
+class GraphResponse(BaseModel):
+    """
+    Classes and the relations between them.
+    """
+
+    nodes: List[GraphNode]
+
+    edges: List[GraphEdge]
+
+    # True if max_nodes stopped the expansion before every hop was explored
+    truncated: bool
+
+
+class SubgraphRequest(BaseModel):
+    """
+    Request for the subgraph around a set of classes.
+    """
+
+    # IRIs of the seed classes, in any form accepted by GET /{iri}
+    iris: List[str] = Field(..., min_length=1, max_length=MAX_NODES)
+
+    # Relations to follow and export; all relations if left out
+    relations: Optional[List[GraphRelation]] = None
+
+    # Number of hops to expand from the seed classes; 0 for the induced subgraph
+    hops: int = Field(0, ge=0, le=MAX_HOPS)
+
+    # Maximum number of classes to return
+    max_nodes: int = Field(DEFAULT_MAX_NODES, ge=1, le=MAX_NODES)
+
+
+class SubsumptionResponse(BaseModel):
+    """
+    Whether one class is the same as or a subclass of another.
+    """
+
+    # IRI of the class
+    iri: str
+
+    # IRI of the possible ancestor
+    ancestor: str
+
+    # True if the class is subsumed by the ancestor
+    is_a: bool
+
+    # Number of sub_class_of hops up to the ancestor; None if it is not one
+    hops: Optional[int]
+
+
+class PathClass(BaseModel):
+    """
+    Class on a path to the root of the hierarchy.
+    """
+
+    # IRI of the class
+    iri: str
+
+    # Label of the class
+    label: Optional[str]
+
+
+class HierarchyPosition(BaseModel):
+    """
+    Where a class sits in the class hierarchy.
+    """
+
+    # IRI of the class
+    iri: str
+
+    # Label of the class
+    label: Optional[str]
+
+    # Number of sub_class_of hops to the nearest root
+    depth: int
+
+    # Top-level branches the class is or descends from
+    branches: List[SOLIBranch]  # type: ignore
+
+    # Every path from a root down to the class, shortest first
+    paths: List[List[PathClass]]
+
+    # True if max_paths stopped the search before every path was found
+    truncated: bool
@@ -3,7 +3,7 @@ Models for the health check endpoint.
 """
 
 # imports
-from typing import Optional
+from typing import Dict, List, Optional
 
 # packages
 from pydantic import BaseModel
@@ -49,3 +49,159 @@ class HealthResponse(BaseModel):
 
     # Information about the SOLI graph
     soli_graph: SOLIGraphInfo
+
+
+class CacheStats(BaseModel):
+    """
+    Size and counters for one response cache.
+    """
+
+    # Number of cached entries
+    entries: int
+
+    # Total size of cached values in bytes
+    bytes: int
+
+    # Number of lookups served from the cache
+    hits: int
+
+    # Number of lookups that had to be computed
+    misses: int
+
+    # Number of entries evicted to stay within the size limits
+    evictions: int
+
+    # Number of entries dropped after their TTL
+    expirations: int
+
+
+class LLMCacheStats(BaseModel):
+    """
+    Counters for the LLM search cache.
+    """
+
+    # Number of searches answered from the cache
+    hits: int
+
+    # Number of searches that called the LLM
+    misses: int
+
+    # Number of searches that joined an identical call already in flight
+    coalesced: int
+
+    # Number of LLM calls currently in flight
+    in_flight: int
+
+
+class LLMClientStats(BaseModel):
+    """
+    State and counters for one managed LLM backend.
+    """
+
+    # Model name
+    model: str
+
+    # Circuit breaker state: closed, open or half_open
+    state: str
+
+    # Median and 95th percentile latency of recent successful calls in seconds
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+
+    # Number of calls in flight
+    active: int
+
+    # Number of calls waiting for a slot
+    queued: int
+
+    # Number of calls started
+    calls: int
+
+    # Number of calls refused because the queue was full or the breaker was open
+    rejected: int
+
+    # Number of calls refused after waiting queue_timeout seconds for a slot
+    queue_timeouts: int
+
+    # Number of calls abandoned after the timeout
+    timeouts: int
+
+    # Number of calls that failed
+    failures: int
+
+
+class LLMRoutingStats(BaseModel):
+    """
+    State of every LLM backend and counters for routing between them.
+    """
+
+    # Backends in the configured order
+    backends: List[LLMClientStats]
+
+    # Number of calls that started a hedged request on a second backend
+    hedged: int
+
+    # Number of hedged calls answered by the second backend first
+    hedge_wins: int
+
+    # Number of calls retried on another backend after a failure
+    failovers: int
+
+
+class BranchStats(BaseModel):
+    """
+    Request counters and latency of one taxonomy branch on one route.
+    """
+
+    # Number of requests served
+    requests: int
+
+    # Number of requests that raised an error, including 404s and 503s
+    errors: int
+
+    # Median and 95th percentile latency over recent requests, in seconds
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+
+
+class CacheStatsResponse(BaseModel):
+    """
+    Response model for the cache statistics endpoint, keyed by cache name.
+    """
+
+    # Statistics for each cache
+    caches: Dict[str, CacheStats]
+
+    # Counters for the LLM search cache
+    llm: LLMCacheStats
+
+
+class ReloadStatus(BaseModel):
+    """
+    Loaded ontology version and the status of background reloads.
+    """
+
+    # Content hash of the ontology being served
+    ontology_version: str
+
+    # Unix time the ontology being served was loaded
+    ontology_loaded: float
+
+    # Whether a reload is running
+    in_progress: bool
+
+    # Number of reloads that swapped in a new ontology
+    reloads: int
+
+    # Seconds between scheduled reloads; None if reloads only run on request
+    poll_interval: Optional[float] = None
+
+    # Unix times the last reload started and finished
+    last_started: Optional[float] = None
+    last_finished: Optional[float] = None
+
+    # Outcome of the last reload: swapped, unchanged or failed
+    last_result: Optional[str] = None
+
+    # Error of the last reload if it failed
+    last_error: Optional[str] = None
@@ -0,0 +1,93 @@
+"""
+Models for the batch LLM classification endpoints.
+"""
+
+# imports
+from typing import Annotated, List, Literal, Optional, Tuple
+
+# packages
+from pydantic import BaseModel, Field
+
+# project
+from soli_api.branches import SOLIBranch
+
+# maximum number of texts in one batch job
+MAX_BATCH_TEXTS = 10000
+
+# minimum and maximum length of each text, as for single LLM searches
+MIN_BATCH_TEXT_LENGTH = 2
+MAX_BATCH_TEXT_LENGTH = 1024
+
+
+class LLMBatchRequest(BaseModel):
+    """
+    Request to classify many texts against one or more taxonomy branches.
+    """
+
+    # Texts to classify
+    texts: List[
+        Annotated[
+            str,
+            Field(min_length=MIN_BATCH_TEXT_LENGTH, max_length=MAX_BATCH_TEXT_LENGTH),
+        ]
+    ] = Field(..., min_length=1, max_length=MAX_BATCH_TEXTS)
+
+    # Branches to classify each text against, e.g. area_of_law
+    branches: List[SOLIBranch] = Field(..., min_length=1)  # type: ignore
+
+    # Maximum depth of each branch
+    max_depth: int = Field(3, ge=1)
+
+    # Maximum number of classes per text and branch
+    limit: int = Field(10, ge=1, le=100)
+
+
+class LLMBatchItem(BaseModel):
+    """
+    Classes found for one text in one branch.
+    """
+
+    # Position of the text in the request
+    index: int
+
+    # Branch name
+    branch: str
+
+    # IRIs and relevance scores, most relevant first
+    results: List[Tuple[str, int | float]]
+
+    # Error message if the text could not be classified
+    error: Optional[str] = None
+
+
+class LLMBatchJobStatus(BaseModel):
+    """
+    Status of a batch job and the items finished so far.
+    """
+
+    # Job ID
+    job_id: str
+
+    # Job status
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+
+    # Number of text and branch pairs in the job
+    total: int
+
+    # Number of finished pairs
+    completed: int
+
+    # Number of pairs that failed
+    failed: int
+
+    # Number of pairs answered from the LLM search cache
+    cached: int
+
+    # Submission time as a Unix timestamp
+    created: float
+
+    # Completion time as a Unix timestamp
+    finished: Optional[float] = None
+
+    # Finished pairs in completion order, from the requested offset
+    items: List[LLMBatchItem]
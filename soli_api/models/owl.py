@@ -3,12 +3,15 @@ Models for the health check endpoint.
 """
 
 # imports
-from typing import List, Tuple
+from typing import Any, List, Literal, Tuple
 
 # packages
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from soli import OWLClass
 
+# maximum number of IRIs in a batch lookup
+MAX_BATCH_SIZE = 1000
+
 
 class OWLClassList(BaseModel):
     """
@@ -24,3 +27,51 @@ class OWLSearchResults(BaseModel):
     """
 
     results: List[Tuple[OWLClass, int | float]]
+
+
+class OWLBatchRequest(BaseModel):
+    """
+    Request for resolving many IRIs in one call.
+    """
+
+    # IRIs to resolve, in any form accepted by GET /{iri}
+    iris: List[str] = Field(..., max_length=MAX_BATCH_SIZE)
+
+    # Format of each returned class; xml, markdown and html are returned as strings
+    format: Literal["json", "jsonld", "xml", "markdown", "html"] = "json"
+
+
+class OWLBatchResults(BaseModel):
+    """
+    Classes found by a batch lookup, the IRIs that were not found and the IRIs of
+    classes that could not be rendered.
+    """
+
+    classes: List[Any]
+
+    missing: List[str]
+
+    failed: List[str] = []
+
+
+class OWLSuggestion(BaseModel):
+    """
+    Typeahead suggestion for a class.
+    """
+
+    # IRI of the class
+    iri: str
+
+    # Display label of the class
+    label: str
+
+    # Label or alternative label that matched the query
+    matched_label: str
+
+
+class OWLSuggestions(BaseModel):
+    """
+    Ranked typeahead suggestions, one per class.
+    """
+
+    suggestions: List[OWLSuggestion]
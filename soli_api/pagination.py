@@ -0,0 +1,164 @@
+"""
+Pagination and field projection for class listings and search results.
+"""
+
+# imports
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# packages
+from fastapi import HTTPException, Query
+from soli import OWLClass
+
+# project
+from soli_api.models.owl import OWLClassList, OWLSearchResults
+
+# fields that can be selected with ?fields=
+CLASS_FIELDS = tuple(OWLClass.model_fields.keys())
+
+# largest page that can be requested with ?limit=
+MAX_PAGE_LIMIT = 1000
+
+
+class PageParams:
+    """
+    Query parameters selecting a page of results and the class fields to return.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(
+            None,
+            ge=1,
+            le=MAX_PAGE_LIMIT,
+            description="Maximum number of results to return",
+        ),
+        offset: int = Query(0, ge=0, description="Number of results to skip"),
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated class fields to return, e.g. iri,label,definition",
+        ),
+    ) -> None:
+        """
+        Parse and validate the page parameters.
+
+        Args:
+            limit (Optional[int]): Maximum number of results to return
+            offset (int): Number of results to skip
+            fields (Optional[str]): Comma-separated class fields to return
+
+        Returns:
+            None
+        """
+        self.limit = limit
+        self.offset = offset
+        self.fields: Optional[Tuple[str, ...]] = None
+        if fields is not None:
+            self.fields = tuple(
+                dict.fromkeys(
+                    field.strip() for field in fields.split(",") if field.strip()
+                )
+            )
+            unknown_fields = [
+                field for field in self.fields if field not in CLASS_FIELDS
+            ]
+            if unknown_fields:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(unknown_fields)}",
+                )
+
+    @property
+    def stop(self) -> Optional[int]:
+        """
+        Get the index one past the last result on the page.
+
+        Returns:
+            Optional[int]: Stop index, or None if there is no limit
+        """
+        return None if self.limit is None else self.offset + self.limit
+
+    def key(self) -> Tuple[int, Optional[int], Optional[Tuple[str, ...]]]:
+        """
+        Get a hashable key for caching a page.
+
+        Returns:
+            Tuple[int, Optional[int], Optional[Tuple[str, ...]]]: Offset, limit and fields
+        """
+        return self.offset, self.limit, self.fields
+
+    def slice(self, items: Sequence[Any]) -> Sequence[Any]:
+        """
+        Select the page from a sequence of results.
+
+        Args:
+            items (Sequence[Any]): All results
+
+        Returns:
+            Sequence[Any]: Results on the page
+        """
+        return items[self.offset : self.stop]
+
+
+def project_class(owl_class: OWLClass, fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Get the selected fields of a class as a JSON-compatible dictionary.
+
+    Args:
+        owl_class (OWLClass): SOLI OWLClass object
+        fields (Iterable[str]): Fields to include
+
+    Returns:
+        Dict[str, Any]: Selected fields
+    """
+    return owl_class.model_dump(mode="json", include=set(fields))
+
+
+def serialize_class_list(classes: List[OWLClass], page: PageParams) -> bytes:
+    """
+    Serialize a page of classes as OWLClassList JSON.
+
+    Args:
+        classes (List[OWLClass]): All classes
+        page (PageParams): Page and field selection
+
+    Returns:
+        bytes: OWLClassList JSON
+    """
+    page_classes = page.slice(classes)
+    if page.fields is None:
+        return OWLClassList(classes=page_classes).model_dump_json().encode("utf-8")
+
+    return json.dumps(
+        {"classes": [project_class(c, page.fields) for c in page_classes]},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def serialize_search_results(
+    results: List[Tuple[OWLClass, int | float]], page: PageParams
+) -> bytes:
+    """
+    Serialize a page of scored search results as OWLSearchResults JSON.
+
+    Args:
+        results (List[Tuple[OWLClass, int | float]]): All results with scores
+        page (PageParams): Page and field selection
+
+    Returns:
+        bytes: OWLSearchResults JSON
+    """
+    page_results = page.slice(results)
+    if page.fields is None:
+        return OWLSearchResults(results=page_results).model_dump_json().encode("utf-8")
+
+    return json.dumps(
+        {
+            "results": [
+                [project_class(c, page.fields), score] for c, score in page_results
+            ]
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
@@ -0,0 +1,243 @@
+"""
+Background reload of the SOLI graph without restarting the worker.
+
+The new graph and everything derived from it are built in a worker thread while
+requests keep being served from the current state.  The new objects are then put on
+the app state in one step on the event loop.  Requests that already hold the old
+graph finish on it, and the old objects are freed once the last of them completes.
+
+A reload can be triggered by an admin request or by polling the source at a fixed
+interval.  Under the pre-forking server in soli_api.serve, workers do not reload on
+their own: the parent reloads the graph once and replaces the workers one at a time,
+so they keep sharing one copy of it.  Workers forward admin requests to the parent.
+"""
+
+# imports
+import asyncio
+import logging
+import os
+import signal
+import time
+from typing import Any, Callable, Dict, Optional
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+class ReloadInProgressError(Exception):
+    """
+    Raised when a reload is requested while another one is running.
+    """
+
+
+class OntologyReloader:
+    """
+    Run ontology reloads one at a time, off the request path.
+    """
+
+    def __init__(
+        self,
+        prepare: Callable[[], Optional[Callable[[], None]]],
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the reloader.
+
+        Args:
+            prepare (Callable[[], Optional[Callable[[], None]]]): Blocking function
+                that loads and indexes the new graph, returning a function that swaps
+                it in, or None if the ontology has not changed
+            poll_interval (Optional[float]): Seconds between scheduled reloads; None
+                reloads only on request
+
+        Returns:
+            None
+        """
+        self.prepare = prepare
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self._poll_task: Optional[asyncio.Task] = None
+
+        # status of the last reload
+        self.reloads = 0
+        self.last_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+        self.last_result: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def in_progress(self) -> bool:
+        """
+        Check if a reload is running.
+
+        Returns:
+            bool: True if a reload is running
+        """
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> asyncio.Task:
+        """
+        Start a reload in the background.
+
+        Returns:
+            asyncio.Task: Task finishing when the reload is done
+
+        Raises:
+            ReloadInProgressError: If a reload is already running
+        """
+        if self.in_progress:
+            raise ReloadInProgressError("An ontology reload is already running")
+
+        self._task = asyncio.ensure_future(self._reload())
+        return self._task
+
+    async def _reload(self) -> None:
+        """
+        Build the new state in a thread, then swap it in on the event loop.
+
+        Returns:
+            None
+        """
+        self.last_started = time.time()
+        self.last_error = None
+        LOGGER.info("Reloading SOLI ontology")
+        try:
+            swap = await asyncio.to_thread(self.prepare)
+            if swap is None:
+                self.last_result = "unchanged"
+            else:
+                swap()
+                self.reloads += 1
+                self.last_result = "swapped"
+        except Exception as e:  # pylint: disable=broad-except
+            # keep serving the current graph
+            LOGGER.exception("SOLI ontology reload failed")
+            self.last_result = "failed"
+            self.last_error = str(e)
+        finally:
+            self.last_finished = time.time()
+
+    def start_polling(self) -> None:
+        """
+        Start reloading every poll_interval seconds, if an interval is set.
+
+        Returns:
+            None
+        """
+        if self.poll_interval is not None and self._poll_task is None:
+            self._poll_task = asyncio.ensure_future(self._poll())
+
+    async def _poll(self) -> None:
+        """
+        Reload at every interval, skipping intervals where a reload is still running.
+
+        Returns:
+            None
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.start()
+            except ReloadInProgressError:
+                LOGGER.info("Skipping scheduled reload; one is already running")
+
+    def shutdown(self) -> None:
+        """
+        Stop polling and cancel a running reload.
+
+        The thread building a new graph cannot be interrupted; its result is dropped.
+
+        Returns:
+            None
+        """
+        for task in (self._poll_task, self._task):
+            if task is not None:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the reload status.
+
+        Returns:
+            Dict[str, Any]: Whether a reload is running, the number of completed
+                swaps and the times, result and error of the last reload
+        """
+        return {
+            "in_progress": self.in_progress,
+            "reloads": self.reloads,
+            "poll_interval": self.poll_interval,
+            "last_started": self.last_started,
+            "last_finished": self.last_finished,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+class ParentReloader:
+    """
+    Forward reload requests from a worker to its pre-forking parent.
+
+    The parent reloads on SIGHUP or on its own schedule, then replaces its workers,
+    so the status reported here is the parent's as of when this worker was forked.
+    """
+
+    def __init__(self, parent_pid: int, status: Dict[str, Any]) -> None:
+        """
+        Initialize the reloader.
+
+        Args:
+            parent_pid (int): Process ID of the pre-forking parent
+            status (Dict[str, Any]): Reload status of the parent, with the keys of
+                OntologyReloader.stats() except in_progress
+
+        Returns:
+            None
+        """
+        self.parent_pid = parent_pid
+        self.status = dict(status)
+
+    @property
+    def in_progress(self) -> bool:
+        """
+        Check if a reload is running; the parent does not fork workers while it is.
+
+        Returns:
+            bool: Always False
+        """
+        return False
+
+    def start(self) -> None:
+        """
+        Ask the parent to reload.
+
+        Returns:
+            None
+        """
+        LOGGER.info("Asking parent process %d to reload", self.parent_pid)
+        os.kill(self.parent_pid, signal.SIGHUP)
+
+    def start_polling(self) -> None:
+        """
+        Do nothing; the parent polls.
+
+        Returns:
+            None
+        """
+
+    def shutdown(self) -> None:
+        """
+        Do nothing; the parent runs the reloads.
+
+        Returns:
+            None
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the parent's reload status.
+
+        Returns:
+            Dict[str, Any]: Whether a reload is running, the number of completed
+                swaps and the times, result and error of the last reload
+        """
+        return {"in_progress": self.in_progress, **self.status}
@@ -0,0 +1,188 @@
+"""
+Candidate retrieval ahead of LLM reranking.
+
+The LLM searches used to send every class in a branch to the model, so prompts grew
+with the branch and max_depth.  CandidateRetriever narrows the branch to the top N
+classes with the local search engine first, so only those are sent for reranking.  If
+enabled, a sample of searches is also run against the full branch in the background to
+log how many of the LLM's picks the retriever kept (recall@N).  Each sample is a full,
+unnarrowed LLM call, so sampling is off by default and only a few samples may run at
+once.
+"""
+
+# imports
+import asyncio
+import logging
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# packages
+from soli import SOLI, OWLClass
+
+# project
+from soli_api.search_engine import SearchEngine
+
+# default number of candidates sent to the LLM
+DEFAULT_MAX_CANDIDATES = 50
+
+# default number of recall samples that may run at once
+DEFAULT_MAX_RECALL_SAMPLES = 1
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+class CandidateRetriever:
+    """
+    Narrow LLM search sets with the local search engine and measure recall.
+    """
+
+    def __init__(
+        self,
+        engine: SearchEngine,
+        max_candidates: int = DEFAULT_MAX_CANDIDATES,
+        recall_sample_rate: float = 0.0,
+        max_recall_samples: int = DEFAULT_MAX_RECALL_SAMPLES,
+    ) -> None:
+        """
+        Initialize the retriever.
+
+        Args:
+            engine (SearchEngine): Search engine over the loaded graph
+            max_candidates (int): Maximum number of classes sent to the LLM
+            recall_sample_rate (float): Fraction of narrowed searches also run against
+                the full branch to measure recall; 0 disables sampling
+            max_recall_samples (int): Maximum number of recall samples running at
+                once; searches picked for a sample while this many run are skipped
+
+        Returns:
+            None
+        """
+        self.engine = engine
+        self.max_candidates = max_candidates
+        self.recall_sample_rate = recall_sample_rate
+        self.max_recall_samples = max(0, max_recall_samples)
+        self._recall_tasks: Set[asyncio.Task] = set()
+
+    def narrow(self, query: str, search_set: List[OWLClass]) -> List[OWLClass]:
+        """
+        Get the candidates to send to the LLM for a query.
+
+        Args:
+            query (str): Query string
+            search_set (List[OWLClass]): Every class in the branch being searched
+
+        Returns:
+            List[OWLClass]: Up to max_candidates classes without duplicates, best
+                first, or the whole branch in its own order if it is small enough
+        """
+        soli = self.engine.soli
+        candidates = frozenset(
+            soli.iri_to_index[owl_class.iri] for owl_class in search_set
+        )
+        if len(candidates) <= self.max_candidates:
+            return list({owl_class.iri: owl_class for owl_class in search_set}.values())
+
+        return [
+            soli.classes[class_index]
+            for class_index in self.engine.retrieve(
+                query, candidates, self.max_candidates
+            )
+        ]
+
+    def sample_recall(
+        self,
+        soli: SOLI,
+        query: str,
+        search_set: List[OWLClass],
+        candidates: List[OWLClass],
+        limit: int,
+        results: List[Tuple[OWLClass, int | float]],
+    ) -> None:
+        """
+        For a sample of narrowed searches, rerun the LLM on the full branch in the
+        background and log the share of its results that were among the candidates.
+
+        Nothing is sampled while max_recall_samples samples are still running, so
+        sampling never adds more than that many full-branch calls to the LLM's load.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            query (str): Query string
+            search_set (List[OWLClass]): Every class in the branch
+            candidates (List[OWLClass]): Classes sent to the LLM
+            limit (int): Maximum number of results
+            results (List[Tuple[OWLClass, int | float]]): Results from the candidates
+
+        Returns:
+            None
+        """
+        if (
+            self.recall_sample_rate <= 0
+            or len(candidates) >= len(search_set)
+            or len(self._recall_tasks) >= self.max_recall_samples
+            or random.random() >= self.recall_sample_rate
+        ):
+            return
+
+        async def measure() -> None:
+            """
+            Run the full-branch search and log recall.
+
+            Returns:
+                None
+            """
+            try:
+                full_results = await soli.search_by_llm(
+                    query=query, search_set=search_set, limit=limit
+                )
+            except RuntimeError:
+                LOGGER.warning("LLM rerank recall sample failed for %r", query)
+                return
+
+            candidate_iris = {owl_class.iri for owl_class in candidates}
+            full_iris = [owl_class.iri for owl_class, _ in full_results]
+            kept = sum(1 for iri in full_iris if iri in candidate_iris)
+            overlap = len(set(full_iris) & {owl_class.iri for owl_class, _ in results})
+            LOGGER.info(
+                "LLM rerank recall@%d for %r: %.2f (%d/%d kept, %d shared results, "
+                "%d classes in branch)",
+                self.max_candidates,
+                query,
+                kept / len(full_iris) if full_iris else 1.0,
+                kept,
+                len(full_iris),
+                overlap,
+                len(search_set),
+            )
+
+        task = asyncio.ensure_future(measure())
+        self._recall_tasks.add(task)
+        task.add_done_callback(self._recall_tasks.discard)
+
+
+def load_retriever(
+    engine: SearchEngine, rerank_config: Dict[str, Any]
+) -> Optional[CandidateRetriever]:
+    """
+    Create the candidate retriever described by the configuration.
+
+    Args:
+        engine (SearchEngine): Search engine over the loaded graph
+        rerank_config (Dict[str, Any]): The "llm_rerank" configuration block
+
+    Returns:
+        Optional[CandidateRetriever]: Retriever, or None if candidates is 0 or null
+    """
+    max_candidates = rerank_config.get("candidates", DEFAULT_MAX_CANDIDATES)
+    if not max_candidates:
+        return None
+
+    return CandidateRetriever(
+        engine,
+        max_candidates=max_candidates,
+        recall_sample_rate=rerank_config.get("recall_sample_rate", 0.0),
+        max_recall_samples=rerank_config.get(
+            "max_recall_samples", DEFAULT_MAX_RECALL_SAMPLES
+        ),
+    )
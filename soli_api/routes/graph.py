@@ -0,0 +1,335 @@
+"""
+Graph neighborhood, subgraph and hierarchy routes.
+"""
+
+# imports
+from typing import Iterable, List, Optional, Sequence
+
+# packages
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from soli import SOLI
+from starlette.responses import Response
+
+# project
+from soli_api.closure import DEFAULT_MAX_PATHS, ClosureIndex
+from soli_api.graph_index import RELATIONS, GraphIndex
+from soli_api.models.graph import (
+    DEFAULT_MAX_NODES,
+    MAX_HOPS,
+    MAX_NODES,
+    MAX_PATHS,
+    GraphEdge,
+    GraphNode,
+    GraphRelation,
+    GraphResponse,
+    HierarchyPosition,
+    PathClass,
+    SubgraphRequest,
+    SubsumptionResponse,
+)
+from soli_api.models.owl import OWLClassList
+from soli_api.pagination import PageParams, serialize_class_list
+
+# API router
+router = APIRouter(prefix="/graph", tags=["graph"])
+
+
+def class_index(soli: SOLI, iri: str) -> int:
+    """
+    Get the index of a class from an IRI in any form accepted by GET /{iri}.
+
+    Args:
+        soli (SOLI): SOLI graph object
+        iri (str): IRI of the class
+
+    Returns:
+        int: Class index
+
+    Raises:
+        HTTPException: If the IRI is not a class in the graph
+    """
+    owl_class = soli[iri]
+    if owl_class is None:
+        raise HTTPException(status_code=404, detail=f"IRI not found: {iri}")
+    return soli.iri_to_index[owl_class.iri]
+
+
+def class_indices_response(
+    soli: SOLI, indices: Iterable[int], page: PageParams
+) -> Response:
+    """
+    Serialize a page of classes given by index as an OWLClassList response.
+
+    Args:
+        soli (SOLI): SOLI graph object
+        indices (Iterable[int]): Class indices, in response order
+        page (PageParams): Page and field selection
+
+    Returns:
+        Response: Serialized OWLClassList JSON
+    """
+    classes = soli.classes
+    return Response(
+        content=serialize_class_list([classes[index] for index in indices], page),
+        media_type="application/json",
+    )
+
+
+def relation_names(relations: Optional[List[GraphRelation]]) -> Sequence[str]:
+    """
+    Get the relation names selected by relation parameters.
+
+    Args:
+        relations (Optional[List[GraphRelation]]): Relation parameters
+
+    Returns:
+        Sequence[str]: Relation names; every relation if none were given
+    """
+    if not relations:
+        return RELATIONS
+    return tuple(dict.fromkeys(relation.value for relation in relations))
+
+
+def graph_response(
+    request: Request,
+    iris: List[str],
+    relations: Sequence[str],
+    hops: int,
+    max_nodes: int,
+) -> GraphResponse:
+    """
+    Expand seed classes by a number of hops and return the classes and edges found.
+
+    Args:
+        request (Request): FastAPI request object
+        iris (List[str]): IRIs of the seed classes
+        relations (Sequence[str]): Relations to follow and export
+        hops (int): Number of hops
+        max_nodes (int): Maximum number of classes
+
+    Returns:
+        GraphResponse: Classes with their hop counts and the edges between them
+    """
+    soli: SOLI = request.app.state.soli
+    graph_index: GraphIndex = request.app.state.graph_index
+
+    seeds = [class_index(soli, iri) for iri in iris]
+    distances, truncated = graph_index.neighborhood(
+        seeds, relations=relations, hops=hops, max_nodes=max_nodes
+    )
+    classes = soli.classes
+    return GraphResponse(
+        nodes=[
+            GraphNode(iri=classes[index].iri, label=classes[index].label, hops=distance)
+            for index, distance in distances.items()
+        ],
+        edges=[
+            GraphEdge(
+                source=classes[source].iri,
+                target=classes[target].iri,
+                relation=GraphRelation(relation),
+            )
+            for source, target, relation in graph_index.edges(
+                list(distances), relations
+            )
+        ],
+        truncated=truncated,
+    )
+
+
+@router.get("/neighborhood", tags=["graph"], response_model=GraphResponse)
+async def get_neighborhood(
+    request: Request,
+    iri: str,
+    hops: int = Query(1, ge=0, le=MAX_HOPS),
+    relation: Optional[List[GraphRelation]] = Query(None),
+    max_nodes: int = Query(DEFAULT_MAX_NODES, ge=1, le=MAX_NODES),
+) -> GraphResponse:
+    """
+    Get the classes within a number of hops of a class and the edges between them.
+
+    Args:
+        request (Request): FastAPI request object
+        iri (str): IRI of the class
+        hops (int): Number of hops
+        relation (Optional[List[GraphRelation]]): Relations to follow; all if omitted
+        max_nodes (int): Maximum number of classes
+
+    Returns:
+        GraphResponse: Classes with their hop counts and the edges between them
+    """
+    return graph_response(request, [iri], relation_names(relation), hops, max_nodes)
+
+
+@router.post("/subgraph", tags=["graph"], response_model=GraphResponse)
+async def get_subgraph(
+    request: Request, subgraph_request: SubgraphRequest
+) -> GraphResponse:
+    """
+    Get the subgraph around a set of classes: the classes within the given number
+    of hops of any of them and the selected relations between all of those classes.
+
+    Args:
+        request (Request): FastAPI request object
+        subgraph_request (SubgraphRequest): Seed IRIs, relations, hops and limit
+
+    Returns:
+        GraphResponse: Classes with their hop counts and the edges between them
+    """
+    return graph_response(
+        request,
+        subgraph_request.iris,
+        relation_names(subgraph_request.relations),
+        subgraph_request.hops,
+        subgraph_request.max_nodes,
+    )
+
+
+@router.get("/is-a", tags=["graph"], response_model=SubsumptionResponse)
+async def get_is_a(request: Request, iri: str, ancestor: str) -> SubsumptionResponse:
+    """
+    Check if a class is the same as or a subclass of another class, at any depth.
+
+    Args:
+        request (Request): FastAPI request object
+        iri (str): IRI of the class
+        ancestor (str): IRI of the possible ancestor
+
+    Returns:
+        SubsumptionResponse: Whether the class is subsumed and how many hops up
+    """
+    soli: SOLI = request.app.state.soli
+    closure_index: ClosureIndex = request.app.state.closure_index
+    index = class_index(soli, iri)
+    ancestor_index = class_index(soli, ancestor)
+    hops = closure_index.distance(index, ancestor_index)
+    return SubsumptionResponse(
+        iri=soli.classes[index].iri,
+        ancestor=soli.classes[ancestor_index].iri,
+        is_a=hops is not None,
+        hops=hops,
+    )
+
+
+@router.get("/ancestors", tags=["graph"], response_model=OWLClassList)
+async def get_ancestors(
+    request: Request,
+    iri: str,
+    max_hops: Optional[int] = Query(None, ge=1),
+    page: PageParams = Depends(),
+) -> Response:
+    """
+    Get every ancestor of a class, nearest first.
+
+    Args:
+        request (Request): FastAPI request object
+        iri (str): IRI of the class
+        max_hops (Optional[int]): Leave out ancestors further up; unbounded if omitted
+        page (PageParams): Page and field selection
+
+    Returns:
+        Response: Serialized OWLClassList JSON
+    """
+    soli: SOLI = request.app.state.soli
+    closure_index: ClosureIndex = request.app.state.closure_index
+    return class_indices_response(
+        soli, closure_index.ancestors(class_index(soli, iri), max_hops), page
+    )
+
+
+@router.get("/descendants", tags=["graph"], response_model=OWLClassList)
+async def get_descendants(
+    request: Request,
+    iri: str,
+    max_hops: Optional[int] = Query(None, ge=1),
+    page: PageParams = Depends(),
+) -> Response:
+    """
+    Get every descendant of a class once, nearest first.
+
+    Args:
+        request (Request): FastAPI request object
+        iri (str): IRI of the class
+        max_hops (Optional[int]): Leave out descendants further down; unbounded if
+            omitted
+        page (PageParams): Page and field selection
+
+    Returns:
+        Response: Serialized OWLClassList JSON
+    """
+    soli: SOLI = request.app.state.soli
+    closure_index: ClosureIndex = request.app.state.closure_index
+    return class_indices_response(
+        soli, closure_index.descendants(class_index(soli, iri), max_hops), page
+    )
+
+
+@router.get("/lca", tags=["graph"], response_model=OWLClassList)
+async def get_lowest_common_ancestors(
+    request: Request,
+    iri: List[str] = Query(...),
+    page: PageParams = Depends(),
+) -> Response:
+    """
+    Get the lowest common ancestors of classes.  A class counts as its own ancestor,
+    and classes with several parents can have more than one lowest common ancestor.
+
+    Args:
+        request (Request): FastAPI request object
+        iri (List[str]): IRIs of the classes
+        page (PageParams): Page and field selection
+
+    Returns:
+        Response: Serialized OWLClassList JSON, nearest to the classes first
+    """
+    soli: SOLI = request.app.state.soli
+    closure_index: ClosureIndex = request.app.state.closure_index
+    return class_indices_response(
+        soli,
+        closure_index.lowest_common_ancestors(
+            [class_index(soli, class_iri) for class_iri in iri]
+        ),
+        page,
+    )
+
+
+@router.get("/paths", tags=["graph"], response_model=HierarchyPosition)
+async def get_paths(
+    request: Request,
+    iri: str,
+    max_paths: int = Query(DEFAULT_MAX_PATHS, ge=1, le=MAX_PATHS),
+) -> HierarchyPosition:
+    """
+    Get every path from the root of the hierarchy down to a class, with its depth
+    and top-level branches, for breadcrumbs.
+
+    Args:
+        request (Request): FastAPI request object
+        iri (str): IRI of the class
+        max_paths (int): Maximum number of paths
+
+    Returns:
+        HierarchyPosition: Depth, branches and paths to the root of the class
+    """
+    soli: SOLI = request.app.state.soli
+    closure_index: ClosureIndex = request.app.state.closure_index
+    index = class_index(soli, iri)
+    paths, truncated = closure_index.paths_to_root(index, max_paths)
+
+    classes = soli.classes
+    return HierarchyPosition(
+        iri=classes[index].iri,
+        label=classes[index].label,
+        depth=closure_index.depths[index],
+        branches=[
+            soli_type.name.lower() for soli_type in closure_index.branches[index]
+        ],
+        paths=[
+            [
+                PathClass(iri=classes[step].iri, label=classes[step].label)
+                for step in path
+            ]
+            for path in paths
+        ],
+        truncated=truncated,
+    )
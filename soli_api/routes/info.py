@@ -3,13 +3,28 @@ Info routes for the API.
 """
 
 # imports
+import hmac
+import os
+from typing import Dict, Optional
 
 # packages
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Header, HTTPException, Request
 from soli import SOLI
+from starlette.responses import JSONResponse
 
 # project
-from soli_api.models.health import HealthResponse, SOLIGraphInfo
+from soli_api.branches import BRANCH_METRICS
+from soli_api.models.health import (
+    BranchStats,
+    CacheStats,
+    CacheStatsResponse,
+    HealthResponse,
+    LLMCacheStats,
+    LLMRoutingStats,
+    ReloadStatus,
+    SOLIGraphInfo,
+)
+from soli_api.reload import OntologyReloader, ReloadInProgressError
 
 # API router
 router = APIRouter(prefix="/info", tags=["info"])
@@ -40,3 +55,129 @@ async def health(request: Request) -> HealthResponse:
             github_repo_branch=soli.github_repo_branch,
         ),
     )
+
+
+@router.get("/cache", tags=["info"], response_model=CacheStatsResponse)
+async def cache_stats(request: Request) -> CacheStatsResponse:
+    """
+    Get hit, miss and size statistics for the response caches.
+
+    Args:
+        request (Request): FastAPI request object
+
+    Returns:
+        CacheStatsResponse: Pydantic model with statistics for each cache
+    """
+    return CacheStatsResponse(
+        caches={
+            "taxonomy": CacheStats(**request.app.state.taxonomy_cache.stats()),
+            "search": CacheStats(**request.app.state.search_cache.stats()),
+            "render": CacheStats(**request.app.state.render_cache.stats()),
+        },
+        llm=LLMCacheStats(**request.app.state.llm_cache.stats()),
+    )
+
+
+@router.get(
+    "/branches", tags=["info"], response_model=Dict[str, Dict[str, BranchStats]]
+)
+async def branch_stats() -> Dict[str, Dict[str, BranchStats]]:
+    """
+    Get request counts, error counts and latency for each taxonomy branch served by
+    the /taxonomy/{branch} and /search/llm/{branch} routes of this worker.
+
+    Returns:
+        Dict[str, Dict[str, BranchStats]]: Statistics by route and then branch name
+    """
+    return {
+        route: {name: BranchStats(**stats) for name, stats in branches.items()}
+        for route, branches in BRANCH_METRICS.stats().items()
+    }
+
+
+@router.get("/llm", tags=["info"], response_model=LLMRoutingStats)
+async def llm_client_stats(request: Request) -> LLMRoutingStats:
+    """
+    Get the circuit breaker state, latency and call counters of each LLM backend and
+    the routing counters.
+
+    Args:
+        request (Request): FastAPI request object
+
+    Returns:
+        LLMRoutingStats: Pydantic model with backend states and routing counters
+    """
+    llm = request.app.state.soli.llm
+    if llm is None:
+        raise HTTPException(status_code=404, detail="No LLM is configured.")
+    return LLMRoutingStats(**llm.stats())
+
+
+def reload_status(request: Request) -> ReloadStatus:
+    """
+    Get the loaded ontology version and the reload status.
+
+    Args:
+        request (Request): FastAPI request object
+
+    Returns:
+        ReloadStatus: Pydantic model with the version and reload status
+    """
+    reloader: OntologyReloader = request.app.state.reloader
+    return ReloadStatus(
+        ontology_version=request.app.state.ontology_version,
+        ontology_loaded=request.app.state.ontology_loaded,
+        **reloader.stats(),
+    )
+
+
+@router.get("/reload", tags=["info"], response_model=ReloadStatus)
+async def get_reload(request: Request) -> ReloadStatus:
+    """
+    Get the loaded ontology version and the status of background reloads.
+
+    Args:
+        request (Request): FastAPI request object
+
+    Returns:
+        ReloadStatus: Pydantic model with the version and reload status
+    """
+    return reload_status(request)
+
+
+@router.post("/reload", tags=["info"], status_code=202, response_model=ReloadStatus)
+async def start_reload(
+    request: Request, authorization: Optional[str] = Header(None)
+) -> JSONResponse:
+    """
+    Reload the ontology from its source in the background and swap it in once it is
+    indexed.  Requires the admin token as a bearer token.
+
+    Args:
+        request (Request): FastAPI request object
+        authorization (Optional[str]): Authorization header
+
+    Returns:
+        JSONResponse: Reload status
+    """
+    admin_token = request.app.state.config.get("reload", {}).get(
+        "admin_token", None
+    ) or os.getenv("SOLI_API_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Reload is not enabled.")
+    if authorization is None or not hmac.compare_digest(
+        authorization.encode("utf-8"), f"Bearer {admin_token}".encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    reloader: OntologyReloader = request.app.state.reloader
+    try:
+        reloader.start()
+    except ReloadInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+    return JSONResponse(status_code=202, content=reload_status(request).model_dump())
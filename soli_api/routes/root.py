@@ -4,20 +4,46 @@ Root API routes for IRI resolution.
 
 # imports
 import json
+import logging
+from typing import Dict, Iterator, List
 
 # packages
 from fastapi import APIRouter, Request
 from soli import SOLI, OWLClass
-from starlette.responses import JSONResponse, Response
-
-from soli_api.templates.basic_html import render_tailwind_html
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 # project
+from soli_api.materialize import CLASS_MEDIA_TYPES, ClassRenderCache
+from soli_api.models.owl import OWLBatchRequest, OWLBatchResults
 
 
 # API router
 router = APIRouter(prefix="", tags=[])
 
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+def class_response(
+    request: Request, owl_class: OWLClass, response_format: str
+) -> Response:
+    """
+    Serve a rendered class body from the class render cache.
+
+    Args:
+        request (Request): FastAPI request object
+        owl_class (OWLClass): SOLI OWLClass object
+        response_format (str): One of the keys in CLASS_MEDIA_TYPES
+
+    Returns:
+        Response: Rendered class information
+    """
+    render_cache: ClassRenderCache = request.app.state.render_cache
+    return Response(
+        content=render_cache.get(owl_class, response_format),
+        media_type=CLASS_MEDIA_TYPES[response_format],
+    )
+
 
 # redirect GET / to /docs
 @router.get("/", tags=[])
@@ -31,8 +57,76 @@ async def root_redirect() -> Response:
     return Response(status_code=301, headers={"Location": "/docs"})
 
 
+@router.post("/batch", tags=[], response_model=OWLBatchResults)
+async def get_class_batch(
+    request: Request, batch_request: OWLBatchRequest
+) -> StreamingResponse:
+    """
+    Resolve many IRIs in one call, streaming the found classes and then the misses.
+
+    A class that fails to render is listed under failed instead of ending the stream.
+
+    Args:
+        request (Request): FastAPI request object
+        batch_request (OWLBatchRequest): IRIs to resolve and the format to return
+
+    Returns:
+        StreamingResponse: Streamed OWLBatchResults JSON
+    """
+    soli: SOLI = request.app.state.soli
+    render_cache: ClassRenderCache = request.app.state.render_cache
+    response_format = batch_request.format
+
+    # split hits and misses up front; lookups are cheap, rendering is not
+    found: List[OWLClass] = []
+    # each missing IRI once, in request order
+    missing: Dict[str, None] = {}
+    seen = set()
+    for iri in batch_request.iris:
+        owl_class = soli[iri]
+        if owl_class is None:
+            missing[iri] = None
+        elif owl_class.iri not in seen:
+            seen.add(owl_class.iri)
+            found.append(owl_class)
+
+    def stream_results() -> Iterator[bytes]:
+        """
+        Yield the response body one class at a time.
+
+        Returns:
+            Iterator[bytes]: JSON body chunks
+        """
+        failed: List[str] = []
+        separator = b""
+        yield b'{"classes":['
+        for owl_class in found:
+            try:
+                content = render_cache.get(owl_class, response_format)
+            except Exception:  # pylint: disable=broad-except
+                # the headers are sent, so report the class instead of cutting the body
+                LOGGER.exception(
+                    "Could not render %s as %s", owl_class.iri, response_format
+                )
+                failed.append(owl_class.iri)
+                continue
+            if response_format not in ("json", "jsonld"):
+                content = json.dumps(content.decode("utf-8")).encode("utf-8")
+            yield separator + content
+            separator = b","
+        yield (
+            b'],"missing":'
+            + json.dumps(list(missing)).encode("utf-8")
+            + b',"failed":'
+            + json.dumps(failed).encode("utf-8")
+            + b"}"
+        )
+
+    return StreamingResponse(stream_results(), media_type="application/json")
+
+
 @router.get("/{iri}", tags=[], response_model=OWLClass or JSONResponse)
-async def get_class(request: Request, iri: str) -> OWLClass or JSONResponse:
+async def get_class(request: Request, iri: str) -> Response:
     """
     Get class information in JSON format by IRI.
 
@@ -48,7 +142,7 @@ async def get_class(request: Request, iri: str) -> OWLClass or JSONResponse:
     if iri not in soli:
         return JSONResponse(status_code=404, content={"message": "Class not found."})
 
-    return soli[iri]
+    return class_response(request, soli[iri], "json")
 
 
 # add /{iri}/markdown with Response format and .to_markdown()
@@ -68,11 +162,11 @@ async def get_class_markdown(request: Request, iri: str) -> Response:
     if iri not in soli:
         return Response(status_code=404, content="Class not found.")
 
-    return Response(content=soli[iri].to_markdown(), media_type="text/markdown")
+    return class_response(request, soli[iri], "markdown")
 
 
 @router.get("/{iri}/jsonld", tags=[], response_model=None)
-async def get_class_jsonld(request: Request, iri: str) -> JSONResponse:
+async def get_class_jsonld(request: Request, iri: str) -> Response:
     """
     Get class information in JSON-LD format by IRI.
 
@@ -88,7 +182,7 @@ async def get_class_jsonld(request: Request, iri: str) -> JSONResponse:
     if iri not in soli:
         return JSONResponse(status_code=404, content={"message": "Class not found."})
 
-    return JSONResponse(content=soli[iri].to_jsonld(), media_type="application/ld+json")
+    return class_response(request, soli[iri], "jsonld")
 
 
 @router.get("/{iri}/xml", tags=[], response_model=None)
@@ -110,7 +204,7 @@ async def get_class_xml(request: Request, iri: str) -> Response:
             status_code=404, content=json.dumps({"message": "Class not found."})
         )
 
-    return Response(content=soli[iri].to_owl_xml(), media_type="application/xml")
+    return class_response(request, soli[iri], "xml")
 
 
 @router.get("/{iri}/html", tags=[], response_model=None)
@@ -132,6 +226,4 @@ async def get_class_html(request: Request, iri: str) -> Response:
             status_code=404, content=json.dumps({"message": "Class not found."})
         )
 
-    return Response(
-        content=render_tailwind_html(soli[iri], soli), media_type="text/html"
-    )
+    return class_response(request, soli[iri], "html")
@@ -3,13 +3,31 @@ Search routes.
 """
 
 # imports
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 # packages
-from fastapi import APIRouter, Request
-from soli import SOLI
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from rapidfuzz.utils import default_process
+from soli import OWLClass, SOLITypes
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 # project
-from soli_api.models.owl import OWLClassList, OWLSearchResults
+from soli_api.bm25 import tokenize
+from soli_api.branches import BRANCH_METRICS, BRANCHES, SOLIBranch, branch_type
+from soli_api.cache import LRUCache
+from soli_api.executor import SearchExecutor
+from soli_api.llm_batch import BatchQueueFullError, LLMBatchRunner
+from soli_api.llm_cache import LLMSearchCache
+from soli_api.models.llm_batch import LLMBatchJobStatus, LLMBatchRequest
+from soli_api.models.owl import OWLClassList, OWLSearchResults, OWLSuggestions
+from soli_api.pagination import (
+    PageParams,
+    serialize_class_list,
+    serialize_search_results,
+)
+from soli_api.search_engine import SEARCH_FIELDS
+from soli_api.suggest import MAX_SUGGEST_LIMIT, SuggestIndex
 
 # API router
 router = APIRouter(prefix="/search", tags=["search"])
@@ -21,6 +39,9 @@ MAX_QUERY_LENGTH = 1024
 # default depth
 DEFAULT_MAX_DEPTH = 3
 
+# default number of scored results when no limit is given
+DEFAULT_SEARCH_LIMIT = 10
+
 
 def query_length_check(query: str) -> bool:
     """
@@ -35,545 +56,541 @@ def query_length_check(query: str) -> bool:
     return MIN_QUERY_LENGTH <= len(query) <= MAX_QUERY_LENGTH
 
 
-@router.get("/prefix", tags=["search"], response_model=OWLClassList)
-async def search_prefix(request: Request, query: str) -> OWLClassList:
+def search_limit(page: PageParams) -> int:
     """
-    Get class information for labels that start with the query string.
+    Get the number of scored results to request so the page can be filled.
 
     Args:
-        request (Request): FastAPI request object
-        query (str): Query string
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        int: Number of results to request from the search method
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.search_by_prefix(query))
+    return page.stop if page.stop is not None else page.offset + DEFAULT_SEARCH_LIMIT
 
 
-@router.get("/label", tags=["search"], response_model=OWLSearchResults)
-async def search_label(request: Request, query: str) -> OWLSearchResults:
+def search_cache_key(method: str, query: str, page: PageParams) -> tuple:
     """
-    Get class information using the soli-python search_by_label method.
+    Get the search cache key for a query.
+
+    The query is normalized with the same processor the fuzzy scorers apply, so
+    queries differing only in case, punctuation or surrounding whitespace share
+    one entry.
 
     Args:
-        request (Request): FastAPI request object
+        method (str): Search method name
         query (str): Query string
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLSearchResults: Pydantic model with list of classes
+        tuple: Cache key
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
+    return method, default_process(query), page.key()
 
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(results=soli.search_by_label(query))
 
-
-@router.get("/definition", tags=["search"], response_model=OWLSearchResults)
-async def search_definition(request: Request, query: str) -> OWLSearchResults:
+def parse_boosts(boost: Optional[str]) -> Dict[str, float]:
     """
-    Get class information using the soli-python search_by_definition method.
+    Parse field boosts given as comma-separated field:boost pairs.
 
     Args:
-        request (Request): FastAPI request object
-        query (str): Query string
+        boost (Optional[str]): Boosts, e.g. label:4,examples:0
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
-    """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(results=soli.search_by_definition(query))
-
-
-@router.get("/llm/area-of-law", tags=["search"], response_model=OWLSearchResults)
-async def search_llm_area_of_law(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
-    """
-    Get class information using the SOLI areas of law.
+        Dict[str, float]: Boost per field
+
+    Raises:
+        HTTPException: If a field is unknown or a boost is not a non-negative number
+    """
+    boosts: Dict[str, float] = {}
+    for item in (boost or "").split(","):
+        if not item.strip():
+            continue
+
+        field, _, value = item.partition(":")
+        field = field.strip()
+        if field not in SEARCH_FIELDS:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown search field: {field}"
+            )
+        try:
+            boosts[field] = float(value)
+        except ValueError:
+            boosts[field] = -1.0
+        if not 0.0 <= boosts[field] < float("inf"):
+            raise HTTPException(
+                status_code=400, detail=f"Invalid boost for {field}: {value.strip()}"
+            )
+
+    return boosts
+
+
+async def llm_search_response(
+    request: Request,
+    soli_type: SOLITypes,
+    query: str,
+    max_depth: int,
+    page: PageParams,
+) -> Response:
+    """
+    Search a taxonomy branch with the LLM through the LLM search cache.
+
+    The cache holds one ranked list per search, and the page is sliced from it.
 
     Args:
         request (Request): FastAPI request object
+        soli_type (SOLITypes): Taxonomy branch to search
         query (str): Query string
-        max_depth (int): Maximum depth of the search
+        max_depth (int): Maximum depth of the branch
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized search results
     """
     # check query length
     if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_areas_of_law(max_depth=max_depth)
+        return search_results_response([], page)
+
+    llm_cache: LLMSearchCache = request.app.state.llm_cache
+    try:
+        results = await llm_cache.search(
+            request.app.state.soli,
+            request.app.state.closure_index,
+            soli_type,
+            query,
+            max_depth,
         )
-    )
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail="LLM search failed.") from e
+
+    return search_results_response(results, page)
 
 
-@router.get("/llm/asset-types", tags=["search"], response_model=OWLSearchResults)
-async def search_asset_types(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+def branch_types(branch: Optional[List[SOLIBranch]]) -> Tuple[SOLITypes, ...]:
     """
-    Get class information using the SOLI asset types.
+    Get the taxonomy branches selected by branch parameters, in a stable order.
 
     Args:
-        request (Request): FastAPI request object
-        query (str): Query string
-        max_depth (int): Maximum depth
+        branch (Optional[List[SOLIBranch]]): Branch parameters
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Tuple[SOLITypes, ...]: Selected branches
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_asset_types(max_depth=max_depth)
+    return tuple(
+        sorted(
+            {BRANCHES[item.value] for item in branch or []},
+            key=lambda soli_type: soli_type.name,
         )
     )
 
 
-# communication modalities
-@router.get(
-    "/llm/communication-modalities", tags=["search"], response_model=OWLSearchResults
-)
-async def search_communication_modalities(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+def class_list_response(classes: List[OWLClass], page: PageParams) -> Response:
     """
-    Get class information using the SOLI communication modalities.
+    Serialize a page of classes as an OWLClassList response.
 
     Args:
-        request (Request): FastAPI request object
-        query (str): Query string
-        max_depth (int): Maximum depth
+        classes (List[OWLClass]): All classes
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized OWLClassList JSON
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query,
-            search_set=soli.get_communication_modalities(max_depth=max_depth),
-        )
+    return Response(
+        content=serialize_class_list(classes, page), media_type="application/json"
     )
 
 
-# get currencies
-@router.get("/llm/currencies", tags=["search"], response_model=OWLSearchResults)
-async def search_currencies(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+def search_results_response(
+    results: List[Tuple[OWLClass, int | float]], page: PageParams
+) -> Response:
     """
-    Get class information using the SOLI currencies.
+    Serialize a page of scored results as an OWLSearchResults response.
 
     Args:
-        request (Request): FastAPI request object
-        query (str): Query string
-        max_depth (int): Maximum depth
+        results (List[Tuple[OWLClass, int | float]]): All results with scores
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized OWLSearchResults JSON
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_currencies(max_depth=max_depth)
-        )
+    return Response(
+        content=serialize_search_results(results, page),
+        media_type="application/json",
     )
 
 
-# data formats
-@router.get("/llm/data-formats", tags=["search"], response_model=OWLSearchResults)
-async def search_data_formats(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
-    """
-    Get class information using the SOLI data formats.
+@router.get("", tags=["search"], response_model=OWLSearchResults)
+async def search(
+    request: Request,
+    query: str,
+    branch: Optional[List[SOLIBranch]] = Query(
+        None, description="Only return classes in these taxonomy branches"
+    ),
+    boost: Optional[str] = Query(
+        None,
+        description="Comma-separated field:boost pairs overriding the default boosts "
+        "for label, alternative_labels, definition, examples and translations",
+    ),
+    page: PageParams = Depends(),
+) -> Response:
+    """
+    Search labels, alternative labels, definitions, examples and translations in one
+    request, returning a single list ranked by boosted BM25 scores.
 
     Args:
         request (Request): FastAPI request object
         query (str): Query string
-        max_depth (int): Maximum depth
+        branch (Optional[List[SOLIBranch]]): Taxonomy branches to restrict results to
+        boost (Optional[str]): Field boosts, e.g. label:4,examples:0
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized search results
     """
+    boosts = parse_boosts(boost)
+
     # check query length
     if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_data_formats(max_depth=max_depth)
-        )
+        return search_results_response([], page)
+
+    branches = branch_types(branch)
+    search_cache: LRUCache = request.app.state.search_cache
+    cache_key = (
+        "search",
+        tuple(dict.fromkeys(tokenize(query))),
+        tuple(sorted(boosts.items())),
+        branches,
+        page.key(),
     )
+    content = search_cache.get(cache_key)
+    if content is None:
+        search_executor: SearchExecutor = request.app.state.search_executor
+        content = serialize_search_results(
+            await search_executor.run(
+                "search",
+                query,
+                boosts=boosts,
+                branches=branches,
+                limit=search_limit(page),
+            ),
+            page,
+        )
+        search_cache.put(cache_key, content)
 
+    return Response(content=content, media_type="application/json")
 
-# document artifacts
-@router.get("/llm/document-artifacts", tags=["search"], response_model=OWLSearchResults)
-async def search_document_artifacts(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+
+@router.get("/semantic", tags=["search"], response_model=OWLSearchResults)
+async def search_semantic(
+    request: Request,
+    query: str,
+    branch: Optional[List[SOLIBranch]] = Query(
+        None, description="Only return classes in these taxonomy branches"
+    ),
+    page: PageParams = Depends(),
+) -> Response:
     """
-    Get class information using the SOLI document artifacts.
+    Get class information ranked by embedding similarity of their labels and
+    definitions to the query.
 
     Args:
         request (Request): FastAPI request object
         query (str): Query string
-        max_depth (int): Maximum depth
+        branch (Optional[List[SOLIBranch]]): Taxonomy branches to restrict results to
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized search results
     """
+    search_executor: SearchExecutor = request.app.state.search_executor
+    if search_executor.engine.embedding_index is None:
+        return JSONResponse(
+            status_code=503, content={"message": "Semantic search is not enabled."}
+        )
+
     # check query length
     if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_document_artifacts(max_depth=max_depth)
-        )
+        return search_results_response([], page)
+
+    return search_results_response(
+        await search_executor.run(
+            "search_semantic",
+            query,
+            branches=branch_types(branch),
+            limit=search_limit(page),
+        ),
+        page,
     )
 
 
-# engagement terms
-@router.get("/llm/engagement-terms", tags=["search"], response_model=OWLSearchResults)
-async def search_engagement_terms(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+@router.get("/prefix", tags=["search"], response_model=OWLClassList)
+async def search_prefix(
+    request: Request, query: str, page: PageParams = Depends()
+) -> Response:
     """
-    Get class information using the SOLI engagement terms.
+    Get class information for labels that start with the query string.
 
     Args:
         request (Request): FastAPI request object
         query (str): Query string
-        max_depth (int): Maximum depth
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized search results
     """
     # check query length
     if not query_length_check(query):
-        return OWLClassList(classes=[])
+        return class_list_response([], page)
 
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_engagement_terms(max_depth=max_depth)
-        )
+    search_executor: SearchExecutor = request.app.state.search_executor
+    return class_list_response(
+        await search_executor.run("search_by_prefix", query), page
     )
 
 
-# events
-@router.get("/llm/events", tags=["search"], response_model=OWLSearchResults)
-async def search_events(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+@router.get("/suggest", tags=["search"], response_model=OWLSuggestions)
+async def search_suggest(
+    request: Request,
+    query: str,
+    limit: int = Query(10, ge=1, le=MAX_SUGGEST_LIMIT),
+) -> Response:
     """
-    Get class information using the SOLI events.
+    Get typeahead suggestions for labels, preferred labels and alternative labels
+    starting with the query, ignoring case and diacritics.
 
     Args:
         request (Request): FastAPI request object
-        query (str): Query string
-        max_depth (int): Maximum depth
+        query (str): Query prefix
+        limit (int): Maximum number of suggestions
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
-    """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_events(max_depth=max_depth)
-        )
+        Response: Serialized OWLSuggestions JSON
+    """
+    suggestions = []
+    if len(query) <= MAX_QUERY_LENGTH:
+        suggest_index: SuggestIndex = request.app.state.suggest_index
+        suggestions = suggest_index.suggest(query, limit=limit)
+
+    return Response(
+        content=json.dumps(
+            {"suggestions": suggestions}, ensure_ascii=False, separators=(",", ":")
+        ),
+        media_type="application/json",
     )
 
 
-# governmental bodies
-@router.get(
-    "/llm/governmental-bodies", tags=["search"], response_model=OWLSearchResults
-)
-async def search_governmental_bodies(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+@router.get("/label", tags=["search"], response_model=OWLSearchResults)
+async def search_label(
+    request: Request, query: str, page: PageParams = Depends()
+) -> Response:
     """
-    Get class information using the SOLI governmental bodies.
+    Get class information by fuzzy match of the query against labels and alternative
+    labels.
 
     Args:
         request (Request): FastAPI request object
         query (str): Query string
-        max_depth (int): Maximum depth
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized search results
     """
     # check query length
     if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_governmental_bodies(max_depth=max_depth)
+        return search_results_response([], page)
+
+    search_cache: LRUCache = request.app.state.search_cache
+    cache_key = search_cache_key("label", query, page)
+    content = search_cache.get(cache_key)
+    if content is None:
+        search_executor: SearchExecutor = request.app.state.search_executor
+        content = serialize_search_results(
+            await search_executor.run(
+                "search_by_label", query, limit=search_limit(page)
+            ),
+            page,
         )
-    )
+        search_cache.put(cache_key, content)
+
+    return Response(content=content, media_type="application/json")
 
 
-# industries
-@router.get("/llm/industries", tags=["search"], response_model=OWLSearchResults)
-async def search_industries(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+@router.get("/definition", tags=["search"], response_model=OWLSearchResults)
+async def search_definition(
+    request: Request, query: str, page: PageParams = Depends()
+) -> Response:
     """
-    Get class information using the SOLI industries.
+    Get class information ranked by BM25 relevance of their definitions to the query.
 
     Args:
         request (Request): FastAPI request object
         query (str): Query string
-        max_depth (int): Maximum depth
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Response: Serialized search results
     """
     # check query length
     if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_industries(max_depth=max_depth)
+        return search_results_response([], page)
+
+    search_cache: LRUCache = request.app.state.search_cache
+    cache_key = search_cache_key("definition", query, page)
+    content = search_cache.get(cache_key)
+    if content is None:
+        search_executor: SearchExecutor = request.app.state.search_executor
+        content = serialize_search_results(
+            await search_executor.run(
+                "search_by_definition", query, limit=search_limit(page)
+            ),
+            page,
         )
-    )
+        search_cache.put(cache_key, content)
 
+    return Response(content=content, media_type="application/json")
 
-# legal authorities
-@router.get("/llm/legal-authorities", tags=["search"], response_model=OWLSearchResults)
-async def search_legal_authorities(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+
+async def get_batch_summary(
+    request: Request, job_id: str, offset: int = 0
+) -> Dict[str, Any]:
     """
-    Get class information using the SOLI legal authorities.
+    Get a batch job's status and items after an offset, or raise a 404.
 
     Args:
         request (Request): FastAPI request object
-        query (str): Query string
-        max_depth (int): Maximum depth
+        job_id (str): Job ID
+        offset (int): Number of finished items to skip
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        Dict[str, Any]: Job status and items
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_legal_authorities(max_depth=max_depth)
-        )
-    )
+    llm_batch: LLMBatchRunner = request.app.state.llm_batch
+    summary = await llm_batch.summary(job_id, offset)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"Unknown batch job: {job_id}")
+    return summary
 
 
-# locations
-@router.get("/llm/locations", tags=["search"], response_model=OWLSearchResults)
-async def search_locations(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
-    """
-    Get class information using the SOLI locations.
+@router.post(
+    "/llm/batch", tags=["search"], status_code=202, response_model=LLMBatchJobStatus
+)
+async def submit_llm_batch(
+    request: Request, batch_request: LLMBatchRequest
+) -> JSONResponse:
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
+    Start classifying many texts against taxonomy branches with the LLM.
 
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_locations(max_depth=max_depth)
-        )
-    )
+    The job runs in the background; poll GET /search/llm/batch/{job_id} or stream
+    GET /search/llm/batch/{job_id}/stream for the results.
 
+    Args:
+        request (Request): FastAPI request object
+        batch_request (LLMBatchRequest): Texts, branches, depth and limit
 
-# matter narratives
-@router.get("/llm/matter-narratives", tags=["search"], response_model=OWLSearchResults)
-async def search_matter_narratives(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
-    """
-    Get class information using the SOLI matter narratives.
-    """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_matter_narratives(max_depth=max_depth)
+    Returns:
+        JSONResponse: Status of the queued job, with its URL in the Location header
+    """
+    llm_batch: LLMBatchRunner = request.app.state.llm_batch
+    try:
+        job = await llm_batch.submit(
+            request.app.state.soli,
+            request.app.state.closure_index,
+            batch_request.texts,
+            tuple(
+                dict.fromkeys(
+                    BRANCHES[branch.value] for branch in batch_request.branches
+                )
+            ),
+            batch_request.max_depth,
+            batch_request.limit,
         )
+    except BatchQueueFullError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "60"}
+        ) from e
+
+    return JSONResponse(
+        status_code=202,
+        content=job.summary(),
+        headers={"Location": f"/search/llm/batch/{job.job_id}"},
     )
 
 
-# matter narrative formats
-@router.get(
-    "/llm/matter-narrative-formats", tags=["search"], response_model=OWLSearchResults
-)
-async def search_matter_narrative_formats(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+@router.get("/llm/batch/{job_id}", tags=["search"], response_model=LLMBatchJobStatus)
+async def get_llm_batch(
+    request: Request,
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Number of finished items to skip"),
+) -> JSONResponse:
     """
-    Get class information using the SOLI matter narrative formats.
-    """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query,
-            search_set=soli.get_matter_narrative_formats(max_depth=max_depth),
-        )
-    )
+    Get the status of a batch job and the items finished after an offset.
 
+    Args:
+        request (Request): FastAPI request object
+        job_id (str): Job ID
+        offset (int): Number of finished items to skip
 
-# objectives
-@router.get("/llm/objectives", tags=["search"], response_model=OWLSearchResults)
-async def search_objectives(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
-    """
-    Get class information using the SOLI objectives.
+    Returns:
+        JSONResponse: Job status and items
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_objectives(max_depth=max_depth)
-        )
-    )
+    return JSONResponse(content=await get_batch_summary(request, job_id, offset))
 
 
-@router.get("/llm/player-actors", tags=["search"], response_model=OWLSearchResults)
-async def search_player_actors(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+@router.get("/llm/batch/{job_id}/stream", tags=["search"])
+async def stream_llm_batch(
+    request: Request,
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Number of finished items to skip"),
+) -> StreamingResponse:
     """
-    Get class information using the SOLI player actors.
+    Stream a batch job's items as newline-delimited JSON as they finish, ending
+    with the job status once the job is done.
 
     Args:
         request (Request): FastAPI request object
-        query (str): Query string
-        max_depth (int): Maximum depth
+        job_id (str): Job ID
+        offset (int): Number of finished items to skip
 
     Returns:
-        OWLClassList: Pydantic model with list of classes
+        StreamingResponse: One LLMBatchItem per line, then the status without items
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_player_actors(max_depth=max_depth)
-        )
-    )
+    # fail with a 404 before the stream starts
+    await get_batch_summary(request, job_id, offset)
+    llm_batch: LLMBatchRunner = request.app.state.llm_batch
 
+    async def stream_items() -> AsyncIterator[bytes]:
+        """
+        Yield each finished item, then the final status.
 
-# standards compatibilities
-@router.get(
-    "/llm/standards-compatibilities", tags=["search"], response_model=OWLSearchResults
-)
-async def search_standards_compatibilities(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
-    """
-    Get class information using the SOLI standards compatibilities.
-    """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
+        Returns:
+            AsyncIterator[bytes]: JSON lines
+        """
+        async for line in llm_batch.stream_items(job_id, offset):
+            yield json.dumps(line).encode("utf-8") + b"\n"
 
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query,
-            search_set=soli.get_standards_compatibilities(max_depth=max_depth),
-        )
-    )
+    return StreamingResponse(stream_items(), media_type="application/x-ndjson")
 
 
-# statuses
-@router.get("/llm/statuses", tags=["search"], response_model=OWLSearchResults)
-async def search_statuses(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
+@router.get("/llm/{branch}", tags=["search"], response_model=OWLSearchResults)
+async def search_llm_branch(
+    request: Request,
+    branch: str = Path(..., description="Branch name, e.g. area_of_law or area-of-law"),
+    query: str = Query(...),
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    page: PageParams = Depends(),
+) -> Response:
     """
-    Get class information using the SOLI statuses.
-    """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_statuses(max_depth=max_depth)
-        )
-    )
+    Get class information using the LLM over a taxonomy branch.
 
+    Args:
+        request (Request): FastAPI request object
+        branch (str): Branch name or alias, as in BRANCH_PATHS
+        query (str): Query string
+        max_depth (int): Maximum depth of the search
+        page (PageParams): Page and field selection
 
-# system identifiers
-@router.get("/llm/system-identifiers", tags=["search"], response_model=OWLSearchResults)
-async def search_system_identifiers(
-    request: Request, query: str, max_depth: int = DEFAULT_MAX_DEPTH
-) -> OWLSearchResults:
-    """
-    Get class information using the SOLI system identifiers.
+    Returns:
+        Response: Serialized search results
     """
-    # check query length
-    if not query_length_check(query):
-        return OWLClassList(classes=[])
-
-    soli: SOLI = request.app.state.soli
-    return OWLSearchResults(
-        results=await soli.search_by_llm(
-            query=query, search_set=soli.get_system_identifiers(max_depth=max_depth)
-        )
-    )
+    soli_type = branch_type(branch)
+    with BRANCH_METRICS.track("llm", soli_type):
+        return await llm_search_response(request, soli_type, query, max_depth, page)
@@ -3,387 +3,129 @@ Taxonomy routes for the SOLI API.
 """
 
 # imports
+import itertools
+import json
+from typing import Iterable
 
 # packages
-from fastapi import APIRouter, Request
-from soli import SOLI
+from fastapi import APIRouter, Depends, Path, Request
+from soli import SOLI, SOLITypes
+from starlette.responses import Response, StreamingResponse
 
 # project
+from soli_api.branches import BRANCH_METRICS, branch_type
+from soli_api.cache import LRUCache
+from soli_api.closure import ClosureIndex
+from soli_api.materialize import ClassRenderCache
 from soli_api.models.owl import OWLClassList
+from soli_api.pagination import PageParams, project_class, serialize_class_list
 
 # API router
 router = APIRouter(prefix="/taxonomy", tags=["graph"])
 
+# media type for streamed taxonomy responses
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-@router.get("/actor_player", tags=["graph"], response_model=OWLClassList)
-async def get_actor_player(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Actor Player.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_player_actors(max_depth=max_depth))
-
-
-@router.get("/area_of_law", tags=["graph"], response_model=OWLClassList)
-async def get_area_of_law(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Area of Law.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_areas_of_law(max_depth=max_depth))
-
-
-@router.get("/asset_type", tags=["graph"], response_model=OWLClassList)
-async def get_asset_type(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Asset Type.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_asset_types(max_depth=max_depth))
-
-
-@router.get("/communication_modality", tags=["graph"], response_model=OWLClassList)
-async def get_communication_modality(
-    request: Request, max_depth: int = 1
-) -> OWLClassList:
-    """
-    Get all classes of type Communication Modality.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_communication_modalities(max_depth=max_depth))
-
-
-@router.get("/currency", tags=["graph"], response_model=OWLClassList)
-async def get_currency(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Currency.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_currencies(max_depth=max_depth))
-
-
-@router.get("/data_format", tags=["graph"], response_model=OWLClassList)
-async def get_data_format(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Data Format.
 
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
+def branch_indices(
+    request: Request, soli_type: SOLITypes, max_depth: int
+) -> Iterable[int]:
     """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_data_formats(max_depth=max_depth))
+    Get the classes under a SOLI type from the closure index, without walking the
+    graph.
 
-
-@router.get("/document_artifact", tags=["graph"], response_model=OWLClassList)
-async def get_document_artifact(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Document Artifact.
+    Each class is listed once, nearest to the root first and then by class index.
 
     Args:
         request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
+        soli_type (SOLITypes): SOLI type at the root of the taxonomy branch
+        max_depth (int): Maximum number of hops below the root; negative means
+            unbounded
 
     Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
+        Iterable[int]: Class indices
     """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_document_artifacts(max_depth=max_depth))
+    closure_index: ClosureIndex = request.app.state.closure_index
+    return closure_index.branch(
+        soli_type, max_hops=max_depth if max_depth >= 0 else None
+    )
 
 
-@router.get("/engagement_terms", tags=["graph"], response_model=OWLClassList)
-async def get_engagement_terms(request: Request, max_depth: int = 1) -> OWLClassList:
+def taxonomy_response(
+    request: Request, soli_type: SOLITypes, max_depth: int, page: PageParams
+) -> Response:
     """
-    Get all classes of type Engagement Terms.
+    Serve a page of the classes under a SOLI type, either as cached OWLClassList JSON
+    or, when the client accepts application/x-ndjson, streamed one class per line.
 
     Args:
         request (Request): FastAPI request object
+        soli_type (SOLITypes): SOLI type at the root of the taxonomy branch
         max_depth (int): Maximum depth to traverse the graph
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
+        Response: Serialized OWLClassList JSON or streamed NDJSON
     """
     soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_engagement_terms(max_depth=max_depth))
-
-
-@router.get("/event", tags=["graph"], response_model=OWLClassList)
-async def get_event(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Event.
 
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
+    # stream classes one at a time without building the full list
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        render_cache: ClassRenderCache = request.app.state.render_cache
+        page_classes = (
+            soli.classes[index]
+            for index in itertools.islice(
+                branch_indices(request, soli_type, max_depth), page.offset, page.stop
+            )
+        )
+        return StreamingResponse(
+            (
+                (
+                    render_cache.get(owl_class, "json")
+                    if page.fields is None
+                    else json.dumps(
+                        project_class(owl_class, page.fields), ensure_ascii=False
+                    ).encode("utf-8")
+                )
+                + b"\n"
+                for owl_class in page_classes
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
 
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_events(max_depth=max_depth))
+    taxonomy_cache: LRUCache = request.app.state.taxonomy_cache
+    content = taxonomy_cache.get_or_set(
+        (soli_type, max_depth, page.key()),
+        lambda: serialize_class_list(
+            [
+                soli.classes[index]
+                for index in branch_indices(request, soli_type, max_depth)
+            ],
+            page,
+        ),
+    )
+    return Response(content=content, media_type="application/json")
 
 
-@router.get("/forums_venues", tags=["graph"], response_model=OWLClassList)
-async def get_forums_venues(request: Request, max_depth: int = 1) -> OWLClassList:
+@router.get("/{branch}", tags=["graph"], response_model=OWLClassList)
+async def get_branch(
+    request: Request,
+    branch: str = Path(..., description="Branch name, e.g. area_of_law"),
+    max_depth: int = 1,
+    page: PageParams = Depends(),
+) -> Response:
     """
-    Get all classes of type Forums Venues.
+    Get all classes in a taxonomy branch.
 
     Args:
         request (Request): FastAPI request object
+        branch (str): Branch name, as in BRANCH_PATHS
         max_depth (int): Maximum depth to traverse the graph
+        page (PageParams): Page and field selection
 
     Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_forum_venues(max_depth=max_depth))
-
-
-@router.get("/governmental_body", tags=["graph"], response_model=OWLClassList)
-async def get_governmental_body(request: Request, max_depth: int = 1) -> OWLClassList:
+        Response: Serialized OWLClassList JSON or streamed NDJSON
     """
-    Get all classes of type Governmental Body.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_governmental_bodies(max_depth=max_depth))
-
-
-@router.get("/industry", tags=["graph"], response_model=OWLClassList)
-async def get_industry(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Industry.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_industries(max_depth=max_depth))
-
-
-@router.get("/language", tags=["graph"], response_model=OWLClassList)
-async def get_language(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Language.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_languages(max_depth=max_depth))
-
-
-@router.get("/legal_authorities", tags=["graph"], response_model=OWLClassList)
-async def get_legal_authorities(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Legal Authorities.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_legal_authorities(max_depth=max_depth))
-
-
-@router.get("/legal_entity", tags=["graph"], response_model=OWLClassList)
-async def get_legal_entity(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Legal Entity.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_legal_entities(max_depth=max_depth))
-
-
-@router.get("/location", tags=["graph"], response_model=OWLClassList)
-async def get_location(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Location.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_locations(max_depth=max_depth))
-
-
-@router.get("/matter_narrative", tags=["graph"], response_model=OWLClassList)
-async def get_matter_narrative(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Matter Narrative.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_matter_narratives(max_depth=max_depth))
-
-
-@router.get("/matter_narrative_format", tags=["graph"], response_model=OWLClassList)
-async def get_matter_narrative_format(
-    request: Request, max_depth: int = 1
-) -> OWLClassList:
-    """
-    Get all classes of type Matter Narrative Format.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_matter_narrative_formats(max_depth=max_depth))
-
-
-@router.get("/objectives", tags=["graph"], response_model=OWLClassList)
-async def get_objectives(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Objectives.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_objectives(max_depth=max_depth))
-
-
-@router.get("/service", tags=["graph"], response_model=OWLClassList)
-async def get_service(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Service.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_services(max_depth=max_depth))
-
-
-@router.get("/standards_compatibility", tags=["graph"], response_model=OWLClassList)
-async def get_standards_compatibility(
-    request: Request, max_depth: int = 1
-) -> OWLClassList:
-    """
-    Get all classes of type Standards Compatibility.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_standards_compatibilities(max_depth=max_depth))
-
-
-@router.get("/status", tags=["graph"], response_model=OWLClassList)
-async def get_status(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type Status.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_statuses(max_depth=max_depth))
-
-
-@router.get("/system_identifiers", tags=["graph"], response_model=OWLClassList)
-async def get_system_identifiers(request: Request, max_depth: int = 1) -> OWLClassList:
-    """
-    Get all classes of type System Identifiers.
-
-    Args:
-        request (Request): FastAPI request object
-        max_depth (int): Maximum depth to traverse the graph
-
-    Returns:
-        OWLClassList: Pydantic model with list of OWLClass objects
-    """
-    soli: SOLI = request.app.state.soli
-    return OWLClassList(classes=soli.get_system_identifiers(max_depth=max_depth))
+    soli_type = branch_type(branch)
+    with BRANCH_METRICS.track("taxonomy", soli_type):
+        return taxonomy_response(request, soli_type, max_depth, page)
@@ -0,0 +1,372 @@
+"""
+Precomputed search structures over the loaded SOLI graph.
+"""
+
+# imports
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# packages
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+from soli import SOLI, OWLClass, SOLITypes
+
+# project
+from soli_api.bm25 import BM25Index, tokenize, top_k
+from soli_api.closure import ClosureIndex
+from soli_api.embeddings import EmbeddingIndex
+from soli_api.graph_index import GraphIndex
+
+# text of each field searched by SearchEngine.search
+SEARCH_FIELDS: Dict[str, Callable[[OWLClass], Iterable[Optional[str]]]] = {
+    "label": lambda owl_class: (owl_class.label, owl_class.preferred_label),
+    "alternative_labels": lambda owl_class: owl_class.alternative_labels,
+    "definition": lambda owl_class: (owl_class.definition,),
+    "examples": lambda owl_class: owl_class.examples,
+    "translations": lambda owl_class: owl_class.translations.values(),
+}
+
+# default boost for each field
+DEFAULT_FIELD_BOOSTS: Dict[str, float] = {
+    "label": 3.0,
+    "alternative_labels": 2.0,
+    "definition": 1.0,
+    "examples": 0.5,
+    "translations": 1.0,
+}
+
+
+class SearchEngine:
+    """
+    Search the SOLI graph using structures built once at startup.
+
+    soli-python rebuilds and re-normalizes its label list on every label search.  Here
+    the labels and alternative labels are normalized once into a contiguous list, so a
+    query is normalized once and scored against every label in a single
+    process.cdist call, which releases the GIL and can use several threads, followed
+    by a partial selection of the top k.
+    """
+
+    def __init__(
+        self,
+        soli: SOLI,
+        workers: int = 1,
+        embedding_index: Optional[EmbeddingIndex] = None,
+        closure_index: Optional[ClosureIndex] = None,
+    ) -> None:
+        """
+        Build the search structures.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            workers (int): Threads used to score labels; -1 for all cores
+            embedding_index (Optional[EmbeddingIndex]): Class embeddings for semantic
+                search; None disables it
+            closure_index (Optional[ClosureIndex]): Precomputed descendants used for
+                branch membership; None builds one from the graph
+
+        Returns:
+            None
+        """
+        self.soli = soli
+        self.workers = workers
+        self.embedding_index = embedding_index
+
+        # labels first, then alternative labels, in the order soli-python searches them
+        self._labels: List[str] = list(soli.label_to_index) + list(
+            soli.alt_label_to_index
+        )
+        self._num_labels = len(soli.label_to_index)
+
+        # normalized labels with the processor the scorer would otherwise apply per call
+        self._processed_labels: List[str] = [
+            default_process(label) for label in self._labels
+        ]
+        self._processed_primary_labels = self._processed_labels[: self._num_labels]
+
+        # classes for each label, by label only and including alternative labels
+        self._label_classes: List[Tuple[int, ...]] = []
+        self._label_alt_classes: List[Tuple[int, ...]] = []
+        for label in self._labels:
+            label_indices = tuple(soli.label_to_index.get(label, []))
+            self._label_classes.append(label_indices)
+            self._label_alt_classes.append(
+                label_indices + tuple(soli.alt_label_to_index.get(label, []))
+            )
+
+        # normalized display label per class for fuzzy candidate retrieval
+        self._processed_class_labels: List[str] = [
+            default_process(owl_class.label or owl_class.preferred_label or "")
+            for owl_class in soli.classes
+        ]
+
+        # inverted index per field, keyed by class index
+        self.field_indexes: Dict[str, BM25Index] = {}
+        for field, field_text in SEARCH_FIELDS.items():
+            self.field_indexes[field] = BM25Index(
+                (class_index, " ".join(text for text in field_text(owl_class) if text))
+                for class_index, owl_class in enumerate(soli.classes)
+            )
+        self.definition_index = self.field_indexes["definition"]
+
+        # class indices in each top-level branch, as returned by get_areas_of_law etc.
+        if closure_index is None:
+            closure_index = ClosureIndex(GraphIndex(soli))
+        self.branch_members: Dict[SOLITypes, FrozenSet[int]] = {
+            soli_type: frozenset(closure_index.branch(soli_type))
+            for soli_type in SOLITypes
+        }
+
+    def search_by_prefix(self, prefix: str) -> List[OWLClass]:
+        """
+        Search for classes with a label starting with the prefix.
+
+        Args:
+            prefix (str): Label prefix
+
+        Returns:
+            List[OWLClass]: Matching classes
+        """
+        return self.soli.search_by_prefix(prefix)
+
+    def _top_labels(
+        self, query: str, choices: List[str], limit: int
+    ) -> List[Tuple[float, int]]:
+        """
+        Score every choice in one call and keep the best, ties going to earlier choices.
+
+        Args:
+            query (str): Normalized query
+            choices (List[str]): Normalized labels
+            limit (int): Number of labels to keep
+
+        Returns:
+            List[Tuple[float, int]]: Scores and positions of the best labels
+        """
+        scores = process.cdist(
+            [query],
+            choices,
+            scorer=fuzz.WRatio,
+            processor=None,
+            dtype=np.float64,
+            workers=self.workers,
+        )[0]
+
+        # partial selection of the kth best score, then order only the labels above it
+        if limit < len(scores):
+            kth_score = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            positions = np.flatnonzero(scores >= kth_score)
+        else:
+            positions = np.arange(len(scores))
+        positions = positions[np.lexsort((positions, -scores[positions]))][:limit]
+        return [(float(scores[position]), int(position)) for position in positions]
+
+    def search_by_label(
+        self, label: str, include_alt_labels: bool = True, limit: int = 10
+    ) -> List[Tuple[OWLClass, int | float]]:
+        """
+        Search for classes by fuzzy label match, scoring every label in one pass.
+
+        Results match the first limit results of SOLI.search_by_label, which can
+        overrun the limit: the top labels by WRatio, ordered by score and then label
+        length, expanded to their classes without duplicates.
+
+        Args:
+            label (str): Label to search for
+            include_alt_labels (bool): Whether to include alternative labels
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Tuple[OWLClass, int | float]]: Classes with their scores
+        """
+        choices = (
+            self._processed_labels
+            if include_alt_labels
+            else self._processed_primary_labels
+        )
+        if limit <= 0 or not choices:
+            return []
+
+        candidates = self._top_labels(default_process(label), choices, limit)
+        candidates.sort(key=lambda match: (-match[0], len(self._labels[match[1]])))
+
+        label_classes = (
+            self._label_alt_classes if include_alt_labels else self._label_classes
+        )
+        results: List[Tuple[OWLClass, int | float]] = []
+        seen_classes = set()
+        for score, position in candidates:
+            for class_index in label_classes[position]:
+                if class_index not in seen_classes:
+                    seen_classes.add(class_index)
+                    results.append((self.soli.classes[class_index], score))
+
+                if len(results) >= limit:
+                    return results
+
+        return results
+
+    def search_by_definition(
+        self, definition: str, limit: int = 10
+    ) -> List[Tuple[OWLClass, int | float]]:
+        """
+        Search for classes by definition with the BM25 inverted index.
+
+        Only classes whose definitions share at least one stemmed term with the query
+        are returned.
+
+        Args:
+            definition (str): Definition text to search for
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Tuple[OWLClass, int | float]]: Classes with their BM25 scores
+        """
+        return [
+            (self.soli.classes[class_index], score)
+            for class_index, score in self.definition_index.search(
+                definition, limit=limit
+            )
+        ]
+
+    def search(
+        self,
+        query: str,
+        boosts: Optional[Dict[str, float]] = None,
+        branches: Optional[Tuple[SOLITypes, ...]] = None,
+        limit: int = 10,
+    ) -> List[Tuple[OWLClass, int | float]]:
+        """
+        Search labels, alternative labels, definitions, examples and translations at
+        once, summing boosted BM25 scores per class into one top-k list.
+
+        Args:
+            query (str): Query text
+            boosts (Optional[Dict[str, float]]): Boost per field; fields left out use
+                DEFAULT_FIELD_BOOSTS and a boost of 0 skips the field
+            branches (Optional[Tuple[SOLITypes, ...]]): Only return classes in these
+                top-level branches; None for all classes
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Tuple[OWLClass, int | float]]: Classes with their combined scores
+        """
+        field_boosts = {**DEFAULT_FIELD_BOOSTS, **(boosts or {})}
+        tokens = list(dict.fromkeys(tokenize(query)))
+
+        allowed = self.allowed_classes(branches)
+
+        return [
+            (self.soli.classes[class_index], score)
+            for class_index, score in top_k(
+                [
+                    (boost, self.field_indexes[field].postings(token))
+                    for field, boost in field_boosts.items()
+                    for token in tokens
+                ],
+                limit,
+                allowed=allowed,
+            )
+        ]
+
+    def allowed_classes(
+        self, branches: Optional[Tuple[SOLITypes, ...]]
+    ) -> Optional[FrozenSet[int]]:
+        """
+        Get the class indices in any of the given top-level branches.
+
+        Args:
+            branches (Optional[Tuple[SOLITypes, ...]]): Branches; None or empty for all
+
+        Returns:
+            Optional[FrozenSet[int]]: Class indices, or None for no restriction
+        """
+        if not branches:
+            return None
+        return frozenset().union(
+            *(self.branch_members[soli_type] for soli_type in branches)
+        )
+
+    def search_semantic(
+        self,
+        query: str,
+        branches: Optional[Tuple[SOLITypes, ...]] = None,
+        limit: int = 10,
+    ) -> List[Tuple[OWLClass, int | float]]:
+        """
+        Search for classes by cosine similarity of their embeddings to the query.
+
+        Args:
+            query (str): Query text
+            branches (Optional[Tuple[SOLITypes, ...]]): Only return classes in these
+                top-level branches; None for all classes
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Tuple[OWLClass, int | float]]: Classes with their similarities
+
+        Raises:
+            RuntimeError: If semantic search is not enabled
+        """
+        if self.embedding_index is None:
+            raise RuntimeError("Semantic search is not enabled.")
+
+        allowed = self.allowed_classes(branches)
+        rows = None if allowed is None else np.fromiter(sorted(allowed), dtype=np.int64)
+        return [
+            (self.soli.classes[class_index], score)
+            for class_index, score in self.embedding_index.search(
+                query, limit=limit, rows=rows
+            )
+        ]
+
+    def retrieve(self, query: str, candidates: FrozenSet[int], limit: int) -> List[int]:
+        """
+        Narrow a candidate set to the classes most likely to match a query.
+
+        Candidates are ranked by the boosted multi-field BM25 score used by search();
+        if fewer than limit candidates share a term with the query, the rest are
+        filled by fuzzy label similarity.
+
+        Args:
+            query (str): Query text
+            candidates (FrozenSet[int]): Class indices to choose from
+            limit (int): Maximum number of classes to return
+
+        Returns:
+            List[int]: Class indices, best first
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        retrieved = [
+            class_index
+            for class_index, _ in top_k(
+                [
+                    (boost, self.field_indexes[field].postings(token))
+                    for field, boost in DEFAULT_FIELD_BOOSTS.items()
+                    for token in tokens
+                ],
+                limit,
+                allowed=candidates,
+            )
+        ]
+        if len(retrieved) >= limit:
+            return retrieved
+
+        seen = set(retrieved)
+        remaining = [
+            class_index for class_index in candidates if class_index not in seen
+        ]
+        retrieved.extend(
+            remaining[position]
+            for _, _, position in process.extract(
+                default_process(query),
+                [
+                    self._processed_class_labels[class_index]
+                    for class_index in remaining
+                ],
+                scorer=fuzz.WRatio,
+                processor=None,
+                limit=limit - len(retrieved),
+            )
+        )
+        return retrieved
@@ -0,0 +1,360 @@
+"""
+Pre-forking server that shares one loaded SOLI graph across worker processes.
+
+`uvicorn --workers N` spawns fresh interpreters, so every worker loads its own copy of
+the graph.  This runner loads the graph and its derived caches once in the parent,
+moves them out of the garbage collector's reach with gc.freeze() so collections in the
+workers do not touch (and copy) their pages, then forks workers that serve from the
+inherited copy-on-write memory on a shared listening socket:
+
+    python -m soli_api.serve --workers 8
+
+On SIGHUP, or every reload.poll_interval seconds, the parent reloads the graph and
+replaces the workers one at a time, so every worker moves to the same graph and the
+workers again share one copy of it.
+"""
+
+# imports
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# packages
+import uvicorn
+
+# project
+from soli_api.api import app, initialize_state, reload_state
+from soli_api.api_config import load_config
+
+# a worker exiting sooner than this after it was forked counts as a quick failure
+MIN_WORKER_UPTIME = 10.0
+
+# delay before replacing a worker after its first quick failure; doubles each time
+RESPAWN_BACKOFF = 0.5
+
+# longest delay before replacing a worker
+MAX_RESPAWN_BACKOFF = 30.0
+
+# stop replacing a worker slot after this many quick failures in a row
+MAX_QUICK_FAILURES = 5
+
+# longest sleep between checks for exited workers and reload requests
+SUPERVISE_INTERVAL = 0.5
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+def fork_worker(server_config: uvicorn.Config, sock: socket.socket) -> int:
+    """
+    Fork a worker process serving the preloaded app on the shared socket.
+
+    Args:
+        server_config (uvicorn.Config): uvicorn server configuration
+        sock (socket.socket): Bound listening socket
+
+    Returns:
+        int: Worker process ID
+    """
+    pid = os.fork()
+    if pid == 0:
+        # uvicorn installs its own SIGINT/SIGTERM handlers in the worker
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+        uvicorn.Server(server_config).run(sockets=[sock])
+        os._exit(0)
+
+    return pid
+
+
+def respawn_delay(quick_failures: int) -> float:
+    """
+    Get how long to wait before replacing a worker after repeated quick failures.
+
+    Args:
+        quick_failures (int): Number of quick failures in a row for the slot
+
+    Returns:
+        float: Delay in seconds; 0 if the last worker did not fail quickly
+    """
+    if quick_failures == 0:
+        return 0.0
+    return min(RESPAWN_BACKOFF * 2 ** (quick_failures - 1), MAX_RESPAWN_BACKOFF)
+
+
+def reload_graph(reload_status: Dict[str, Any]) -> bool:
+    """
+    Reload the graph in the parent and put it on the app state for new workers.
+
+    Runs on the supervising loop, so exited workers are replaced only once it returns;
+    running workers keep serving the current graph meanwhile.
+
+    Args:
+        reload_status (Dict[str, Any]): Reload status inherited by workers, updated
+            in place
+
+    Returns:
+        bool: True if a new graph was swapped in
+    """
+    reload_status["last_started"] = time.time()
+    reload_status["last_error"] = None
+    LOGGER.info("Reloading SOLI ontology in the parent process")
+    try:
+        state = reload_state(app)
+    except Exception as e:  # pylint: disable=broad-except
+        # keep forking workers on the current graph
+        LOGGER.exception("SOLI ontology reload failed")
+        reload_status["last_result"] = "failed"
+        reload_status["last_error"] = str(e)
+        reload_status["last_finished"] = time.time()
+        return False
+
+    if state is None:
+        reload_status["last_result"] = "unchanged"
+        reload_status["last_finished"] = time.time()
+        return False
+
+    # let the collector free the old graph, then freeze the new one for the workers
+    gc.unfreeze()
+    for name, value in state.items():
+        setattr(app.state, name, value)
+    del state
+    gc.collect()
+    gc.freeze()
+
+    reload_status["reloads"] += 1
+    reload_status["last_result"] = "swapped"
+    reload_status["last_finished"] = time.time()
+    LOGGER.info(
+        "Swapped in SOLI ontology %s; replacing workers",
+        app.state.ontology_version,
+    )
+    return True
+
+
+def serve(workers: int, host: str, port: int) -> None:
+    """
+    Load the graph once, then fork and supervise the worker processes.
+
+    Workers that exit unexpectedly are replaced until the parent receives SIGINT or
+    SIGTERM, which is forwarded to every worker.  A worker slot whose workers keep
+    exiting soon after starting is replaced with exponential backoff, and abandoned
+    after MAX_QUICK_FAILURES quick failures in a row.
+
+    After the graph is reloaded, each worker still serving an older graph is
+    replaced in turn: a new worker is forked for its slot, then the old one is sent
+    SIGTERM and finishes its requests.  The next slot is replaced once it has exited.
+
+    Args:
+        workers (int): Number of worker processes
+        host (str): Bind address
+        port (int): Bind port
+
+    Returns:
+        None
+
+    Raises:
+        SystemExit: If every worker slot was abandoned
+    """
+    # load the graph and derived state before forking so workers share it
+    app.state.config = load_config()
+    initialize_state(app)
+
+    # workers forward reload requests here and report this status
+    poll_interval = app.state.config.get("reload", {}).get("poll_interval", None)
+    reload_status: Dict[str, Any] = {
+        "reloads": 0,
+        "poll_interval": poll_interval,
+        "last_started": None,
+        "last_finished": None,
+        "last_result": None,
+        "last_error": None,
+    }
+    app.state.reload_parent = os.getpid()
+    app.state.reload_status = reload_status
+    gc.collect()
+    gc.freeze()
+
+    # bind once in the parent; every worker accepts on the same socket
+    server_config = uvicorn.Config(app, host=host, port=port)
+    sock = server_config.bind_socket()
+
+    # slot, fork time and graph generation of each running worker
+    worker_slots: Dict[int, Tuple[int, float, int]] = {}
+    # quick failures in a row and scheduled respawn time of each slot
+    quick_failures: Dict[int, int] = {slot: 0 for slot in range(workers)}
+    respawn_at: Dict[int, float] = {}
+    stopping = False
+
+    # graph generation, pending reload and the worker being replaced after a reload
+    generation = 0
+    reload_requested = False
+    next_poll = time.monotonic() + poll_interval if poll_interval else None
+    retiring: Optional[int] = None
+
+    def stop(signum: int, _frame) -> None:
+        """
+        Forward a shutdown signal to the workers and stop replacing them.
+
+        Args:
+            signum (int): Signal number
+
+        Returns:
+            None
+        """
+        nonlocal stopping
+        stopping = True
+        respawn_at.clear()
+        for worker_pid in worker_slots:
+            os.kill(worker_pid, signum)
+
+    def request_reload(_signum: int, _frame) -> None:
+        """
+        Reload the graph on the next pass of the supervising loop.
+
+        Returns:
+            None
+        """
+        nonlocal reload_requested
+        reload_requested = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGHUP, request_reload)
+
+    def start_worker(slot: int) -> None:
+        """
+        Fork a worker for a slot.
+
+        Args:
+            slot (int): Worker slot
+
+        Returns:
+            None
+        """
+        worker_slots[fork_worker(server_config, sock)] = (
+            slot,
+            time.monotonic(),
+            generation,
+        )
+
+    for slot in range(workers):
+        start_worker(slot)
+
+    while worker_slots or respawn_at:
+        # reload on request or when the poll interval has elapsed
+        now = time.monotonic()
+        if next_poll is not None and next_poll <= now:
+            reload_requested = True
+            next_poll = now + poll_interval
+        if reload_requested and not stopping:
+            reload_requested = False
+            if reload_graph(reload_status):
+                generation += 1
+
+        # replace one worker still serving an older graph at a time
+        if retiring is None and not stopping:
+            outdated = sorted(
+                (slot, pid)
+                for pid, (slot, _, worker_generation) in worker_slots.items()
+                if worker_generation < generation
+            )
+            if outdated:
+                slot, retiring = outdated[0]
+                start_worker(slot)
+                os.kill(retiring, signal.SIGTERM)
+
+        # fork replacements whose backoff has elapsed
+        now = time.monotonic()
+        for slot, start_time in list(respawn_at.items()):
+            if start_time <= now:
+                del respawn_at[slot]
+                start_worker(slot)
+
+        # reap an exited worker, or sleep until the next check; a signal does not
+        # interrupt a blocking wait, so poll to notice reload requests
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        if pid == 0:
+            timeout = SUPERVISE_INTERVAL
+            if respawn_at:
+                timeout = min(timeout, min(respawn_at.values()) - time.monotonic())
+            time.sleep(max(timeout, 0.0))
+            continue
+
+        if pid not in worker_slots:
+            continue
+        slot, started, _ = worker_slots.pop(pid)
+        if pid == retiring:
+            retiring = None
+            continue
+        if stopping:
+            continue
+
+        if time.monotonic() - started < MIN_WORKER_UPTIME:
+            quick_failures[slot] += 1
+        else:
+            quick_failures[slot] = 0
+
+        if quick_failures[slot] >= MAX_QUICK_FAILURES:
+            LOGGER.error(
+                "Worker slot %d failed %d times in a row within %.0f seconds of "
+                "starting; not replacing it",
+                slot,
+                quick_failures[slot],
+                MIN_WORKER_UPTIME,
+            )
+            continue
+
+        delay = respawn_delay(quick_failures[slot])
+        if delay > 0:
+            LOGGER.warning(
+                "Worker %d in slot %d exited after %.1f seconds; replacing it in "
+                "%.1f seconds",
+                pid,
+                slot,
+                time.monotonic() - started,
+                delay,
+            )
+        respawn_at[slot] = time.monotonic() + delay
+
+    sock.close()
+
+    if not stopping:
+        LOGGER.error("Every worker slot was abandoned; shutting down")
+        raise SystemExit(1)
+
+
+def main() -> None:
+    """
+    Run the pre-forking server with bind settings from config.json.
+
+    Returns:
+        None
+    """
+    api_config = load_config().get("api", {})
+    parser = argparse.ArgumentParser(
+        description="Serve the SOLI API from workers sharing one loaded graph."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Number of workers"
+    )
+    parser.add_argument(
+        "--host", type=str, default=api_config.get("bind_ip", "0.0.0.0")
+    )
+    parser.add_argument("--port", type=int, default=api_config.get("bind_port", 8000))
+    args = parser.parse_args()
+
+    serve(args.workers, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Local snapshots of the parsed SOLI graph for fast, offline startup.
+
+A snapshot holds the parsed classes, label indices, class edges, triples and the label
+prefix trie as plain Python structures, so loading it skips fetching and parsing the
+OWL file entirely.
+
+Build one from the configured source with:
+
+    python -m soli_api.snapshot --output soli.snapshot
+"""
+
+# imports
+import argparse
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# packages
+import marisa_trie
+import soli as soli_package
+from alea_llm_client import BaseAIModel
+from soli import SOLI, OWLClass
+
+# project
+from soli_api.api_config import load_config
+
+# bump when the snapshot layout changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+# logger
+LOGGER = logging.getLogger("soli_api")
+
+
+def snapshot_source(soli_config: Dict[str, Any]) -> str:
+    """
+    Get the source key a snapshot must match to be used for a configuration.
+
+    Args:
+        soli_config (Dict[str, Any]): SOLI configuration dictionary
+
+    Returns:
+        str: Source key
+    """
+    if soli_config["source"] == "http":
+        return f"http:{soli_config.get('url', '')}"
+
+    return (
+        f"{soli_config['source']}:{soli_config['repository']}@{soli_config['branch']}"
+    )
+
+
+def load_source(
+    soli_config: Dict[str, Any],
+    llm: Optional[BaseAIModel] = None,
+    use_cache: bool = True,
+) -> SOLI:
+    """
+    Load and parse the SOLI graph from its configured source.
+
+    Args:
+        soli_config (Dict[str, Any]): SOLI configuration dictionary
+        llm (Optional[BaseAIModel]): LLM to attach to the SOLI instance
+        use_cache (bool): Whether soli-python may read its local copy of the OWL file
+
+    Returns:
+        SOLI: Loaded SOLI instance
+    """
+    if soli_config["source"] == "http":
+        return SOLI(
+            source_type="http",
+            http_url=soli_config["url"],
+            use_cache=use_cache,
+            llm=llm,
+        )
+
+    return SOLI(
+        source_type=soli_config["source"],
+        github_repo_owner=soli_config["repository"].split("/")[0],
+        github_repo_name=soli_config["repository"].split("/")[1],
+        github_repo_branch=soli_config["branch"],
+        use_cache=use_cache,
+        llm=llm,
+    )
+
+
+def save_snapshot(soli: SOLI, path: str | Path, source: str) -> None:
+    """
+    Write a snapshot of a loaded SOLI graph.
+
+    The file is written to a temporary path and renamed so readers never see a
+    partial snapshot.
+
+    Args:
+        soli (SOLI): SOLI graph object
+        path (str | Path): Snapshot file path
+        source (str): Source key from snapshot_source()
+
+    Returns:
+        None
+    """
+    fields = tuple(OWLClass.model_fields.keys())
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "soli_version": soli_package.__version__,
+        "source": source,
+        "created": time.time(),
+        "fields": fields,
+        "source_type": soli.source_type,
+        "http_url": soli.http_url,
+        "github_repo_owner": soli.github_repo_owner,
+        "github_repo_name": soli.github_repo_name,
+        "github_repo_branch": soli.github_repo_branch,
+        "title": soli.title,
+        "description": soli.description,
+        "classes": [
+            tuple(getattr(owl_class, field) for field in fields)
+            for owl_class in soli.classes
+        ],
+        "iri_to_index": soli.iri_to_index,
+        "label_to_index": soli.label_to_index,
+        "alt_label_to_index": soli.alt_label_to_index,
+        "class_edges": soli.class_edges,
+        "triples": soli.triples,
+        "label_trie": (
+            soli._label_trie.tobytes()  # pylint: disable=protected-access
+            if soli._label_trie is not None  # pylint: disable=protected-access
+            else None
+        ),
+    }
+
+    snapshot_path = Path(path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = snapshot_path.with_name(f".{snapshot_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as output_file:
+        pickle.dump(snapshot, output_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, snapshot_path)
+
+
+def load_snapshot(
+    path: str | Path,
+    source: str,
+    max_age: Optional[float] = None,
+    llm: Optional[BaseAIModel] = None,
+) -> Optional[SOLI]:
+    """
+    Load a SOLI graph from a snapshot if it exists and is not stale.
+
+    A snapshot is stale if it was built by a different snapshot format or soli-python
+    version, from a different source, or more than max_age seconds ago.
+
+    Args:
+        path (str | Path): Snapshot file path
+        source (str): Source key from snapshot_source()
+        max_age (Optional[float]): Maximum snapshot age in seconds; None means no limit
+        llm (Optional[BaseAIModel]): LLM to attach to the SOLI instance
+
+    Returns:
+        Optional[SOLI]: Loaded SOLI instance, or None if the snapshot is missing, stale
+            or unreadable
+    """
+    snapshot_path = Path(path)
+    if not snapshot_path.exists():
+        LOGGER.info("Snapshot not found: %s", snapshot_path)
+        return None
+
+    try:
+        with open(snapshot_path, "rb") as input_file:
+            snapshot = pickle.load(input_file)
+    except (
+        OSError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+    ) as e:
+        LOGGER.warning("Could not read snapshot %s: %s", snapshot_path, e)
+        return None
+
+    if not isinstance(snapshot, dict):
+        LOGGER.warning("Snapshot is not a snapshot dictionary: %s", snapshot_path)
+        return None
+
+    if (
+        snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION
+        or snapshot.get("soli_version") != soli_package.__version__
+        or snapshot.get("fields") != tuple(OWLClass.model_fields.keys())
+        or snapshot.get("source") != source
+    ):
+        LOGGER.info("Snapshot does not match configuration: %s", snapshot_path)
+        return None
+
+    if max_age is not None and time.time() - snapshot.get("created", 0) > max_age:
+        LOGGER.info("Snapshot is older than %d seconds: %s", max_age, snapshot_path)
+        return None
+
+    # build the instance directly instead of through SOLI.__init__, which loads the OWL
+    try:
+        soli = SOLI.__new__(SOLI)
+        soli.source_type = snapshot["source_type"]
+        soli.http_url = snapshot["http_url"]
+        soli.github_repo_owner = snapshot["github_repo_owner"]
+        soli.github_repo_name = snapshot["github_repo_name"]
+        soli.github_repo_branch = snapshot["github_repo_branch"]
+        soli.use_cache = True
+        soli.tree = None
+        soli.parser = None
+        soli.title = snapshot["title"]
+        soli.description = snapshot["description"]
+        soli.classes = [
+            OWLClass.model_construct(**dict(zip(snapshot["fields"], values)))
+            for values in snapshot["classes"]
+        ]
+        soli.iri_to_index = snapshot["iri_to_index"]
+        soli.label_to_index = snapshot["label_to_index"]
+        soli.alt_label_to_index = snapshot["alt_label_to_index"]
+        soli.class_edges = snapshot["class_edges"]
+        soli.triples = snapshot["triples"]
+        soli._cached_triples = tuple(  # pylint: disable=protected-access
+            snapshot["triples"]
+        )
+        soli._label_trie = (  # pylint: disable=protected-access
+            marisa_trie.Trie().frombytes(snapshot["label_trie"])
+            if snapshot["label_trie"] is not None
+            else None
+        )
+        soli._prefix_cache = {}  # pylint: disable=protected-access
+        soli.llm = llm
+    except (
+        KeyError,
+        TypeError,
+        ValueError,
+        RuntimeError,
+        AttributeError,
+        ImportError,
+        pickle.UnpicklingError,
+    ) as e:
+        LOGGER.warning("Could not restore snapshot %s: %s", snapshot_path, e)
+        return None
+
+    LOGGER.info("Loaded SOLI graph from snapshot: %s", snapshot_path)
+    return soli
+
+
+def main() -> None:
+    """
+    Build a snapshot from the source configured in config.json.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        description="Build a local snapshot of the SOLI graph."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Snapshot file path; defaults to soli.snapshot.path in config.json",
+    )
+    args = parser.parse_args()
+
+    soli_config = load_config()["soli"]
+    output_path = args.output or soli_config.get("snapshot", {}).get("path", None)
+    if output_path is None:
+        parser.error("--output is required when soli.snapshot.path is not configured")
+
+    soli = load_source(soli_config)
+    save_snapshot(soli, output_path, snapshot_source(soli_config))
+    print(f"Wrote snapshot with {len(soli)} classes to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
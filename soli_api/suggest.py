@@ -0,0 +1,208 @@
+"""
+Precomputed prefix index for typeahead suggestions.
+"""
+
+# imports
+import bisect
+import heapq
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+# packages
+from soli import SOLI, OWLClass
+
+# maximum number of suggestions per query
+MAX_SUGGEST_LIMIT = 25
+
+# prefixes up to this length have their top suggestions precomputed
+DEFAULT_PRECOMPUTE_LENGTH = 3
+
+# label kinds in ranking order
+LABEL_PRIORITY = {"label": 0, "preferred_label": 1, "alternative_label": 2}
+
+# start of each word after the first
+WORD_START_PATTERN = re.compile(r"(?<=[\W_])\w")
+
+# index entry: (folded key, rank, class index, matched label)
+SuggestEntry = Tuple[str, Tuple[bool, int, int], int, str]
+
+
+def fold_text(text: str) -> str:
+    """
+    Fold case and strip diacritics so "État" and "etat" match.
+
+    Args:
+        text (str): Text to fold
+
+    Returns:
+        str: Folded text
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
+
+
+def display_label(owl_class: OWLClass) -> str:
+    """
+    Get the label shown for a class in suggestions.
+
+    Args:
+        owl_class (OWLClass): SOLI OWLClass object
+
+    Returns:
+        str: Label, preferred label, first alternative label or IRI
+    """
+    return (
+        owl_class.label
+        or owl_class.preferred_label
+        or (owl_class.alternative_labels[0] if owl_class.alternative_labels else None)
+        or owl_class.iri
+    )
+
+
+class SuggestIndex:
+    """
+    Sorted index of folded label suffixes starting at each word boundary.
+
+    Matches are ranked by whole-label matches before word matches, then by shorter
+    labels, then by label kind (label, preferred label, alternative label), and each
+    class is returned at most once with the best-ranked label that matched.
+    """
+
+    def __init__(
+        self, soli: SOLI, precompute_length: int = DEFAULT_PRECOMPUTE_LENGTH
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            soli (SOLI): SOLI graph object
+            precompute_length (int): Precompute top suggestions for prefixes up to this length
+
+        Returns:
+            None
+        """
+        self.soli = soli
+        self.precompute_length = precompute_length
+
+        entries: List[SuggestEntry] = []
+        for class_index, owl_class in enumerate(soli.classes):
+            labels = [
+                ("label", owl_class.label),
+                ("preferred_label", owl_class.preferred_label),
+            ]
+            labels.extend(
+                ("alternative_label", alt_label)
+                for alt_label in owl_class.alternative_labels
+            )
+            for kind, text in labels:
+                if not text:
+                    continue
+                folded = fold_text(text)
+                starts = [0] + [
+                    match.start() for match in WORD_START_PATTERN.finditer(folded)
+                ]
+                for start in starts:
+                    rank = (start > 0, len(folded), LABEL_PRIORITY[kind])
+                    entries.append((folded[start:], rank, class_index, text))
+
+        entries.sort(key=lambda entry: entry[0])
+        self._keys = [entry[0] for entry in entries]
+        self._entries = entries
+
+        # top suggestions for every short prefix
+        buckets: Dict[str, List[SuggestEntry]] = {}
+        for entry in entries:
+            for length in range(1, min(precompute_length, len(entry[0])) + 1):
+                buckets.setdefault(entry[0][:length], []).append(entry)
+        self._precomputed: Dict[str, List[SuggestEntry]] = {
+            prefix: self._top(bucket, MAX_SUGGEST_LIMIT)
+            for prefix, bucket in buckets.items()
+        }
+
+    @staticmethod
+    def _top(candidates: List[SuggestEntry], limit: int) -> List[SuggestEntry]:
+        """
+        Select the best-ranked entry for each class, up to limit classes.
+
+        Args:
+            candidates (List[SuggestEntry]): Matching entries
+            limit (int): Maximum number of entries
+
+        Returns:
+            List[SuggestEntry]: Best-ranked entries, one per class
+        """
+        # most ranges are small; take a generous head before falling back to a full sort
+        head_size = limit * 4
+        ordered = (
+            heapq.nsmallest(head_size, candidates, key=lambda entry: entry[1])
+            if len(candidates) > head_size
+            else sorted(candidates, key=lambda entry: entry[1])
+        )
+        top = SuggestIndex._dedupe(ordered, limit)
+        if len(top) < limit and len(ordered) < len(candidates):
+            top = SuggestIndex._dedupe(
+                sorted(candidates, key=lambda entry: entry[1]), limit
+            )
+        return top
+
+    @staticmethod
+    def _dedupe(ordered: List[SuggestEntry], limit: int) -> List[SuggestEntry]:
+        """
+        Keep the first entry for each class, up to limit entries.
+
+        Args:
+            ordered (List[SuggestEntry]): Entries in rank order
+            limit (int): Maximum number of entries
+
+        Returns:
+            List[SuggestEntry]: First entry per class
+        """
+        seen = set()
+        top = []
+        for entry in ordered:
+            if entry[2] not in seen:
+                seen.add(entry[2])
+                top.append(entry)
+                if len(top) >= limit:
+                    break
+        return top
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Get ranked, deduplicated suggestions for a query prefix.
+
+        Args:
+            query (str): Query prefix
+            limit (int): Maximum number of suggestions, capped at MAX_SUGGEST_LIMIT
+
+        Returns:
+            List[Dict[str, str]]: Suggestions with iri, label and matched_label
+        """
+        prefix = fold_text(query).strip()
+        limit = max(0, min(limit, MAX_SUGGEST_LIMIT))
+        if not prefix or limit == 0:
+            return []
+
+        if len(prefix) <= self.precompute_length:
+            top = self._precomputed.get(prefix, [])[:limit]
+        else:
+            lower = bisect.bisect_left(self._keys, prefix)
+            upper = bisect.bisect_left(
+                self._keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=lower
+            )
+            top = self._top(self._entries[lower:upper], limit)
+
+        suggestions = []
+        for _, _, class_index, matched_label in top:
+            owl_class = self.soli.classes[class_index]
+            suggestions.append(
+                {
+                    "iri": owl_class.iri,
+                    "label": display_label(owl_class),
+                    "matched_label": matched_label,
+                }
+            )
+        return suggestions
@@ -4,31 +4,11 @@ $(document).ready(function () {
         datumTokenizer: Bloodhound.tokenizers.obj.whitespace('label'),
         queryTokenizer: Bloodhound.tokenizers.whitespace,
         remote: {
-            url: '/search/prefix?query=%QUERY',
+            url: '/search/suggest?query=%QUERY&limit=10',
             wildcard: '%QUERY',
             transform: function (response) {
-                // track seen IRIs
-                let seen = {};
-                let search_results = [];
-
-                for (let c of response.classes) {
-                    // check if we've seen it already
-                    if (seen[c.iri]) {
-                        // skip it
-                    } else {
-                        seen[c.iri] = true;
-
-                        let label = c.label || c.preferred_label || (c.alternative_labels && c.alternative_labels[0]) || c.iri;
-                        search_results.push({
-                            label: label,
-                            iri: c.iri,
-                            alternative_labels: c.alternative_labels.join(', '),
-                            definition: c.definition || 'No definition available'
-                        });
-                    }
-                }
-
-                return search_results;
+                // suggestions are already ranked and deduplicated by IRI
+                return response.suggestions;
             }
         }
     });
@@ -45,12 +25,14 @@ $(document).ready(function () {
             limit: 10,
             templates: {
                 suggestion: function (data) {
+                    let matched = data.matched_label !== data.label
+                        ? `<span class="text-sm font-light text-[--color-text-muted] truncate">Matched: ${data.matched_label}</span>`
+                        : '';
                     return `
                         <div class="flex flex-col">
                             <span class="font-semibold text-[--color-primary]">${data.label}</span>
                             <span class="text-sm font-semibold text-[--color-text-secondary] truncate">${data.iri}</span>
-                            <span class="text-sm font-light text-[--color-text-muted] truncate">Synonyms: ${data.alternative_labels}</span>
-                            <span class="text-sm font-light text-[--color-text-muted] truncate">Definition: ${data.definition}</span>
+                            ${matched}
                         </div>
                     `;
                 },
@@ -0,0 +1,137 @@
+"""
+Shared fixtures for the SOLI API tests.
+"""
+
+# imports
+from typing import Callable, Dict, List, Optional, Sequence
+
+# packages
+import pytest
+from soli import SOLI, OWLClass
+
+# small ontology for tests that need soli-python's own parsing and rendering
+TEST_OWL = """<?xml version="1.0"?>
+<rdf:RDF xmlns="https://soli.openlegalstandard.org/"
+     xml:base="https://soli.openlegalstandard.org/"
+     xmlns:dc="http://purl.org/dc/elements/1.1/"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+     xmlns:skos="http://www.w3.org/2004/02/skos/core#">
+    <owl:Ontology rdf:about="https://soli.openlegalstandard.org/">
+        <dc:title>Test Ontology</dc:title>
+        <dc:description>Test ontology for the SOLI API</dc:description>
+    </owl:Ontology>
+    <owl:Class rdf:about="https://soli.openlegalstandard.org/Property">
+        <rdfs:label>Property</rdfs:label>
+    </owl:Class>
+    <owl:Class rdf:about="https://soli.openlegalstandard.org/Lease">
+        <rdfs:subClassOf rdf:resource="https://soli.openlegalstandard.org/Property"/>
+        <rdfs:label>Lease</rdfs:label>
+        <skos:altLabel>Tenancy</skos:altLabel>
+        <skos:definition>An agreement to rent property.</skos:definition>
+    </owl:Class>
+    <owl:Class rdf:about="https://soli.openlegalstandard.org/Sublease">
+        <rdfs:subClassOf rdf:resource="https://soli.openlegalstandard.org/Lease"/>
+        <rdfs:label>Sous-location à bail</rdfs:label>
+        <skos:prefLabel>Sublease</skos:prefLabel>
+        <rdfs:seeAlso>https://soli.openlegalstandard.org/Property</rdfs:seeAlso>
+        <skos:definition>A "lease" granted by a tenant.</skos:definition>
+    </owl:Class>
+</rdf:RDF>
+"""
+
+
+class FakeGraph:
+    """
+    Minimal stand-in for a loaded SOLI graph, built from class names and parents.
+    """
+
+    def __init__(
+        self,
+        parents: Dict[str, Sequence[str]],
+        see_also: Optional[Dict[str, Sequence[str]]] = None,
+    ) -> None:
+        """
+        Create one class per name, with sub_class_of and parent_class_of edges.
+
+        Args:
+            parents (Dict[str, Sequence[str]]): Parent names of each class name, in
+                class index order
+            see_also (Optional[Dict[str, Sequence[str]]]): see_also names of classes
+
+        Returns:
+            None
+        """
+        see_also = see_also or {}
+        children: Dict[str, List[str]] = {name: [] for name in parents}
+        for name, class_parents in parents.items():
+            for parent in class_parents:
+                children.setdefault(parent, []).append(name)
+
+        self.classes = [
+            OWLClass(
+                iri=self.iri(name),
+                label=name,
+                sub_class_of=[self.iri(parent) for parent in class_parents],
+                parent_class_of=[self.iri(child) for child in children[name]],
+                see_also=[self.iri(other) for other in see_also.get(name, [])],
+            )
+            for name, class_parents in parents.items()
+        ]
+        self.iri_to_index = {
+            owl_class.iri: index for index, owl_class in enumerate(self.classes)
+        }
+
+    @staticmethod
+    def iri(name: str) -> str:
+        """
+        Get the IRI of a class name.
+
+        Args:
+            name (str): Class name
+
+        Returns:
+            str: Full IRI
+        """
+        return SOLI.normalize_iri(name)
+
+    def index(self, name: str) -> int:
+        """
+        Get the class index of a class name.
+
+        Args:
+            name (str): Class name
+
+        Returns:
+            int: Class index
+        """
+        return self.iri_to_index[self.iri(name)]
+
+    normalize_iri = staticmethod(SOLI.normalize_iri)
+
+
+@pytest.fixture(name="make_graph")
+def fixture_make_graph() -> Callable[..., FakeGraph]:
+    """
+    Get a factory for fake graphs.
+
+    Returns:
+        Callable[..., FakeGraph]: FakeGraph constructor
+    """
+    return FakeGraph
+
+
+@pytest.fixture(name="parsed_soli")
+def fixture_parsed_soli(monkeypatch: pytest.MonkeyPatch) -> SOLI:
+    """
+    Parse TEST_OWL with soli-python, without fetching anything.
+
+    Returns:
+        SOLI: SOLI graph object
+    """
+    monkeypatch.setattr(SOLI, "load_owl", staticmethod(lambda **_: TEST_OWL))
+    # any LLM object keeps soli-python from creating its default client
+    return SOLI(
+        source_type="http", http_url="https://example.org/soli.owl", llm=object()
+    )
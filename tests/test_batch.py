@@ -0,0 +1,132 @@
+"""
+Tests for resolving many IRIs with POST /batch.
+"""
+
+# imports
+import json
+
+# packages
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from soli import SOLI, OWLClass
+
+# project
+import soli_api.routes.root
+from soli_api.materialize import CLASS_MEDIA_TYPES, ClassRenderCache, render_class
+from soli_api.models.owl import MAX_BATCH_SIZE
+
+
+@pytest.fixture(name="app")
+def fixture_app(parsed_soli: SOLI) -> FastAPI:
+    """
+    Create an app serving the root routes over the parsed test ontology.
+
+    Returns:
+        FastAPI: App
+    """
+    app = FastAPI()
+    app.state.soli = parsed_soli
+    app.state.render_cache = ClassRenderCache(parsed_soli)
+    app.include_router(soli_api.routes.root.router)
+    return app
+
+
+@pytest.fixture(name="client")
+def fixture_client(app: FastAPI) -> TestClient:
+    """
+    Create a client for the app.
+
+    Returns:
+        TestClient: Client for the app
+    """
+    return TestClient(app)
+
+
+def test_found_and_missing(client: TestClient, parsed_soli: SOLI) -> None:
+    lease, sublease = parsed_soli["Lease"], parsed_soli["Sublease"]
+    response = client.post(
+        "/batch",
+        json={"iris": ["Lease", "missing-a", lease.iri, "Sublease", "missing-a", "b"]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+    body = response.json()
+    assert [owl_class["iri"] for owl_class in body["classes"]] == [
+        lease.iri,
+        sublease.iri,
+    ]
+    assert body["classes"][1] == json.loads(sublease.model_dump_json())
+    assert body["missing"] == ["missing-a", "b"]
+    assert body["failed"] == []
+
+
+def test_empty_batch(client: TestClient) -> None:
+    response = client.post("/batch", json={"iris": []})
+    assert response.json() == {"classes": [], "missing": [], "failed": []}
+
+
+@pytest.mark.parametrize("response_format", list(CLASS_MEDIA_TYPES))
+def test_formats(client: TestClient, parsed_soli: SOLI, response_format: str) -> None:
+    response = client.post(
+        "/batch",
+        json={"iris": ["Lease", "Sublease", "missing"], "format": response_format},
+    )
+    assert response.status_code == 200
+
+    expected = []
+    for owl_class in (parsed_soli["Lease"], parsed_soli["Sublease"]):
+        content = render_class(owl_class, parsed_soli, response_format)
+        expected.append(
+            json.loads(content)
+            if response_format in ("json", "jsonld")
+            else content.decode("utf-8")
+        )
+    assert response.json() == {
+        "classes": expected,
+        "missing": ["missing"],
+        "failed": [],
+    }
+
+
+def test_unknown_format(client: TestClient) -> None:
+    response = client.post("/batch", json={"iris": ["Lease"], "format": "csv"})
+    assert response.status_code == 422
+
+
+def test_size_limit(client: TestClient) -> None:
+    iris = ["Lease"] * MAX_BATCH_SIZE
+    response = client.post("/batch", json={"iris": iris})
+    assert response.status_code == 200
+    assert len(response.json()["classes"]) == 1
+
+    response = client.post("/batch", json={"iris": iris + ["Lease"]})
+    assert response.status_code == 422
+
+
+def test_bad_item_does_not_cut_stream(
+    app: FastAPI, client: TestClient, parsed_soli: SOLI
+) -> None:
+    render_cache: ClassRenderCache = app.state.render_cache
+    get = render_cache.get
+
+    def fail_lease(owl_class: OWLClass, response_format: str) -> bytes:
+        if owl_class.label == "Lease":
+            raise ValueError("cannot render")
+        return get(owl_class, response_format)
+
+    render_cache.get = fail_lease  # type: ignore
+    response = client.post(
+        "/batch", json={"iris": ["Property", "Lease", "Sublease", "missing"]}
+    )
+    assert response.status_code == 200
+
+    # the body is still one complete JSON document
+    body = json.loads(response.content)
+    assert [owl_class["label"] for owl_class in body["classes"]] == [
+        "Property",
+        "Sous-location à bail",
+    ]
+    assert body["missing"] == ["missing"]
+    assert body["failed"] == [parsed_soli["Lease"].iri]
@@ -0,0 +1,136 @@
+"""
+Tests for the BM25 definition index.
+"""
+
+# imports
+import math
+import random
+from typing import Dict, List, Tuple
+
+# packages
+import pytest
+
+# project
+from soli_api.bm25 import BM25Index, stem, tokenize, top_k
+
+DOCUMENTS = [
+    (0, "A lease is a contract granting use of real property."),
+    (1, "The leasing of equipment under a master lease agreement."),
+    (2, "A sale of goods between merchants."),
+    (3, "Real property held in trust for a beneficiary."),
+    (4, "A contract for the sale of real property, including leased land."),
+]
+
+
+def brute_force_scores(
+    weighted_postings: List[Tuple[float, List[Tuple[float, int]]]],
+) -> Dict[int, float]:
+    """
+    Sum every boosted posting weight per document without pruning.
+
+    Args:
+        weighted_postings (List[Tuple[float, List[Tuple[float, int]]]]): Boost and
+            postings for each list
+
+    Returns:
+        Dict[int, float]: Score of each document
+    """
+    scores: Dict[int, float] = {}
+    for boost, postings in weighted_postings:
+        for weight, doc_id in postings:
+            scores[doc_id] = scores.get(doc_id, 0.0) + boost * weight
+    return scores
+
+
+@pytest.mark.parametrize(
+    "token, expected",
+    [
+        ("lease", "leas"),
+        ("leases", "leas"),
+        ("leased", "leas"),
+        ("leasing", "leas"),
+        ("class", "class"),
+        ("status", "status"),
+        ("ratification", "ratificat"),
+    ],
+)
+def test_stem(token: str, expected: str) -> None:
+    assert stem(token) == expected
+
+
+def test_tokenize_folds_and_drops_stop_words() -> None:
+    assert tokenize("The Leases of Émigré-owned Land") == [
+        "leas",
+        "emigr",
+        "own",
+        "land",
+    ]
+
+
+def test_search_matches_word_forms() -> None:
+    index = BM25Index(DOCUMENTS)
+    results = [doc_id for doc_id, _ in index.search("leasing", limit=10)]
+    assert set(results) == {0, 1, 4}
+
+
+def test_search_ranks_by_bm25() -> None:
+    index = BM25Index(DOCUMENTS)
+    doc_lengths = {doc_id: len(tokenize(text)) for doc_id, text in DOCUMENTS}
+    average_length = sum(doc_lengths.values()) / len(doc_lengths)
+    matching = [doc_id for doc_id, text in DOCUMENTS if "sal" in tokenize(text)]
+    idf = math.log(1.0 + (len(DOCUMENTS) - len(matching) + 0.5) / (len(matching) + 0.5))
+
+    expected = {}
+    for doc_id in matching:
+        count = tokenize(DOCUMENTS[doc_id][1]).count("sal")
+        norm = 1.0 - 0.75 + 0.75 * doc_lengths[doc_id] / average_length
+        expected[doc_id] = idf * count * 2.2 / (count + 1.2 * norm)
+
+    results = index.search("sale", limit=10)
+    assert [doc_id for doc_id, _ in results] == sorted(
+        expected, key=lambda doc_id: -expected[doc_id]
+    )
+    for doc_id, score in results:
+        assert score == pytest.approx(expected[doc_id])
+
+
+def test_search_unknown_term_and_empty_query() -> None:
+    index = BM25Index(DOCUMENTS)
+    assert not index.search("zebra")
+    assert not index.search("the of")
+    assert not index.search("lease", limit=0)
+
+
+def test_top_k_matches_brute_force() -> None:
+    rng = random.Random(7)
+    for _ in range(200):
+        weighted_postings = []
+        for _ in range(rng.randint(1, 5)):
+            doc_ids = rng.sample(range(30), rng.randint(1, 15))
+            postings = sorted(
+                ((rng.uniform(0.01, 5.0), doc_id) for doc_id in doc_ids),
+                key=lambda posting: -posting[0],
+            )
+            weighted_postings.append((rng.uniform(0.1, 3.0), postings))
+        limit = rng.randint(1, 10)
+
+        scores = brute_force_scores(weighted_postings)
+        expected = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = top_k(weighted_postings, limit)
+
+        assert [doc_id for doc_id, _ in results] == [
+            doc_id for doc_id, _ in expected[:limit]
+        ]
+        for doc_id, score in results:
+            assert score == pytest.approx(scores[doc_id])
+
+
+def test_top_k_allowed_documents() -> None:
+    index = BM25Index(DOCUMENTS)
+    results = top_k([(1.0, index.postings("real"))], 10, allowed={3, 4})
+    assert {doc_id for doc_id, _ in results} == {3, 4}
+
+
+def test_top_k_skips_zero_boost() -> None:
+    index = BM25Index(DOCUMENTS)
+    assert not top_k([(0.0, index.postings("real"))], 10)
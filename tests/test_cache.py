@@ -0,0 +1,145 @@
+"""
+Tests for the LRU response cache.
+"""
+
+# packages
+import pytest
+
+# project
+from soli_api import cache as cache_module
+from soli_api.cache import LRUCache
+
+
+class FakeClock:
+    """
+    Monotonic clock that only moves when advanced.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """
+    Replace the clock used for cache expiry.
+
+    Returns:
+        FakeClock: Clock to advance in the test
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_get_and_put() -> None:
+    cache = LRUCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", b"1")
+    assert cache.get("a") == b"1"
+    assert "a" in cache
+    assert len(cache) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used() -> None:
+    cache = LRUCache(max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")
+    cache.put("c", b"3")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_contains_does_not_update_recency() -> None:
+    cache = LRUCache(max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    assert "a" in cache
+    cache.put("c", b"3")
+
+    assert "a" not in cache
+    assert "b" in cache
+
+
+def test_put_replaces_value() -> None:
+    cache = LRUCache(max_entries=2, max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("a", b"12")
+    assert cache.get("a") == b"12"
+    assert cache.stats()["bytes"] == 2
+    assert cache.stats()["evictions"] == 0
+
+
+def test_max_bytes() -> None:
+    cache = LRUCache(max_entries=10, max_bytes=6)
+    cache.put("a", b"123")
+    cache.put("b", b"123")
+    cache.put("c", b"1")
+
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 4
+
+    # a value larger than the whole cache is not stored and evicts nothing
+    cache.put("d", b"1234567")
+    assert "d" not in cache
+    assert len(cache) == 2
+
+
+def test_zero_entries_disables_caching() -> None:
+    cache = LRUCache(max_entries=0)
+    cache.put("a", b"1")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_expires_entries(clock: FakeClock) -> None:
+    cache = LRUCache(max_entries=2, ttl=10.0)
+    cache.put("a", b"1")
+
+    clock.now += 9.9
+    assert cache.get("a") == b"1"
+
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["bytes"] == 0
+
+
+def test_ttl_restarts_on_put(clock: FakeClock) -> None:
+    cache = LRUCache(max_entries=2, ttl=10.0)
+    cache.put("a", b"1")
+    clock.now += 8.0
+    cache.put("a", b"2")
+    clock.now += 8.0
+    assert cache.get("a") == b"2"
+
+
+def test_get_or_set() -> None:
+    cache = LRUCache(max_entries=2)
+    calls = []
+
+    def factory() -> bytes:
+        calls.append(1)
+        return b"value"
+
+    assert cache.get_or_set("a", factory) == b"value"
+    assert cache.get_or_set("a", factory) == b"value"
+    assert len(calls) == 1
+
+
+def test_clear() -> None:
+    cache = LRUCache(max_entries=2)
+    cache.put("a", b"1")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
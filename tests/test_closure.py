@@ -0,0 +1,219 @@
+"""
+Tests for the transitive closure of the class hierarchy.
+"""
+
+# imports
+from typing import Callable
+
+# packages
+import pytest
+from soli import SOLITypes
+from soli.graph import SOLI_TYPE_IRIS
+
+# project
+from soli_api.closure import ClosureIndex
+from soli_api.graph_index import GraphIndex
+
+# short IRI of the Area of Law branch root
+AREA_OF_LAW = SOLI_TYPE_IRIS[SOLITypes.AREA_OF_LAW]
+
+# short IRI of the Location branch root
+LOCATION = SOLI_TYPE_IRIS[SOLITypes.LOCATION]
+
+
+@pytest.fixture(name="graph")
+def fixture_graph(make_graph: Callable):
+    """
+    Build a hierarchy with several parents per class under two branch roots:
+
+        thing
+        ├── AREA_OF_LAW ── property ── real_property ──┐
+        │              └── contract ── lease ──────────┴── residential_lease
+        └── LOCATION ── us ── ny ── residential_lease
+
+    Returns:
+        FakeGraph: Graph
+    """
+    return make_graph(
+        {
+            "thing": [],
+            AREA_OF_LAW: ["thing"],
+            LOCATION: ["thing"],
+            "property": [AREA_OF_LAW],
+            "contract": [AREA_OF_LAW],
+            "real_property": ["property"],
+            "lease": ["contract"],
+            "us": [LOCATION],
+            "ny": ["us"],
+            "residential_lease": ["real_property", "lease", "ny"],
+        }
+    )
+
+
+@pytest.fixture(name="closure")
+def fixture_closure(graph) -> ClosureIndex:
+    """
+    Build the closure of the graph.
+
+    Returns:
+        ClosureIndex: Closure
+    """
+    return ClosureIndex(GraphIndex(graph))
+
+
+def names(graph, indices) -> list:
+    """
+    Get the class names of class indices.
+
+    Returns:
+        list: Names
+    """
+    return [graph.classes[index].label for index in indices]
+
+
+def test_ancestors_with_several_parents(graph, closure: ClosureIndex) -> None:
+    ancestors = closure.ancestors(graph.index("residential_lease"))
+    assert ancestors == {
+        graph.index("real_property"): 1,
+        graph.index("lease"): 1,
+        graph.index("ny"): 1,
+        graph.index("property"): 2,
+        graph.index("contract"): 2,
+        graph.index("us"): 2,
+        graph.index(AREA_OF_LAW): 3,
+        graph.index(LOCATION): 3,
+        graph.index("thing"): 4,
+    }
+    assert names(graph, closure.ancestors(graph.index("residential_lease"), 1)) == [
+        "real_property",
+        "lease",
+        "ny",
+    ]
+
+
+def test_descendants(graph, closure: ClosureIndex) -> None:
+    descendants = closure.descendants(graph.index(AREA_OF_LAW))
+    assert names(graph, descendants) == [
+        "property",
+        "contract",
+        "real_property",
+        "lease",
+        "residential_lease",
+    ]
+    assert names(graph, closure.descendants(graph.index(AREA_OF_LAW), 1)) == [
+        "property",
+        "contract",
+    ]
+    assert closure.descendant_set(graph.index("lease")) == {
+        graph.index("residential_lease")
+    }
+
+
+def test_is_a_and_distance(graph, closure: ClosureIndex) -> None:
+    lease = graph.index("residential_lease")
+    assert closure.is_a(lease, graph.index("contract"))
+    assert closure.is_a(lease, lease)
+    assert not closure.is_a(graph.index("contract"), lease)
+    assert closure.distance(lease, graph.index("thing")) == 4
+    assert closure.distance(lease, lease) == 0
+    assert closure.distance(graph.index("us"), graph.index("contract")) is None
+
+
+def test_lowest_common_ancestors(graph, closure: ClosureIndex) -> None:
+    assert names(
+        graph,
+        closure.lowest_common_ancestors(
+            [graph.index("real_property"), graph.index("lease")]
+        ),
+    ) == [AREA_OF_LAW]
+    assert names(
+        graph,
+        closure.lowest_common_ancestors(
+            [graph.index("residential_lease"), graph.index("us")]
+        ),
+    ) == ["us"]
+    assert names(
+        graph,
+        closure.lowest_common_ancestors(
+            [graph.index("residential_lease"), graph.index("contract")]
+        ),
+    ) == ["contract"]
+
+
+def test_several_lowest_common_ancestors(make_graph: Callable) -> None:
+    # both c and d are children of a and b, so a and b are both lowest
+    graph = make_graph(
+        {"root": [], "a": ["root"], "b": ["root"], "c": ["a", "b"], "d": ["a", "b"]}
+    )
+    closure = ClosureIndex(GraphIndex(graph))
+    assert names(
+        graph, closure.lowest_common_ancestors([graph.index("c"), graph.index("d")])
+    ) == ["a", "b"]
+    assert closure.common_ancestors([graph.index("c"), graph.index("d")]) == {
+        graph.index("a"): 2,
+        graph.index("b"): 2,
+        graph.index("root"): 4,
+    }
+
+
+def test_no_common_ancestor(make_graph: Callable) -> None:
+    graph = make_graph({"a": [], "b": []})
+    closure = ClosureIndex(GraphIndex(graph))
+    assert not closure.lowest_common_ancestors([graph.index("a"), graph.index("b")])
+
+
+def test_cycles(make_graph: Callable) -> None:
+    # a -> b -> c -> a, with d under c and a root above a
+    graph = make_graph(
+        {"root": [], "a": ["root", "c"], "b": ["a"], "c": ["b"], "d": ["c"]}
+    )
+    closure = ClosureIndex(GraphIndex(graph))
+
+    # a class in a cycle is never its own ancestor or descendant
+    for name in ("a", "b", "c"):
+        assert graph.index(name) not in closure.ancestors(graph.index(name))
+        assert graph.index(name) not in closure.descendants(graph.index(name))
+
+    assert closure.ancestors(graph.index("d")) == {
+        graph.index("c"): 1,
+        graph.index("b"): 2,
+        graph.index("a"): 3,
+        graph.index("root"): 4,
+    }
+    assert closure.depths[graph.index("d")] == 4
+    # b, c and a are each other's ancestors, so all three are lowest
+    assert names(
+        graph, closure.lowest_common_ancestors([graph.index("b"), graph.index("d")])
+    ) == ["b", "c", "a"]
+
+    paths, truncated = closure.paths_to_root(graph.index("d"))
+    assert [names(graph, path) for path in paths] == [["root", "a", "b", "c", "d"]]
+    assert not truncated
+
+
+def test_depths_and_branches(graph, closure: ClosureIndex) -> None:
+    assert closure.depths[graph.index("thing")] == 0
+    assert closure.depths[graph.index("lease")] == 3
+    assert closure.depths[graph.index("residential_lease")] == 4
+    assert closure.branches[graph.index("residential_lease")] == (
+        SOLITypes.AREA_OF_LAW,
+        SOLITypes.LOCATION,
+    )
+    assert closure.branches[graph.index(AREA_OF_LAW)] == (SOLITypes.AREA_OF_LAW,)
+    assert not closure.branches[graph.index("thing")]
+
+
+def test_paths_to_root(graph, closure: ClosureIndex) -> None:
+    paths, truncated = closure.paths_to_root(graph.index("residential_lease"))
+    assert [names(graph, path) for path in paths] == [
+        ["thing", AREA_OF_LAW, "property", "real_property", "residential_lease"],
+        ["thing", AREA_OF_LAW, "contract", "lease", "residential_lease"],
+        ["thing", LOCATION, "us", "ny", "residential_lease"],
+    ]
+    assert not truncated
+
+    paths, truncated = closure.paths_to_root(
+        graph.index("residential_lease"), max_paths=2
+    )
+    assert len(paths) == 2
+    assert truncated
@@ -0,0 +1,128 @@
+"""
+Tests for the embedding index behind semantic search.
+"""
+
+# imports
+from pathlib import Path
+from typing import Callable
+
+# packages
+import numpy as np
+import pytest
+
+# project
+from soli_api.embeddings import EmbeddingIndex, HashingEmbedder
+
+
+@pytest.fixture(name="graph")
+def fixture_graph(make_graph: Callable):
+    """
+    Build a graph whose labels are the embedded texts.
+
+    Returns:
+        FakeGraph: Graph
+    """
+    return make_graph(
+        {
+            "residential lease": [],
+            "commercial lease": [],
+            "criminal procedure": [],
+            "patent infringement": [],
+        }
+    )
+
+
+@pytest.fixture(name="index")
+def fixture_index(graph) -> EmbeddingIndex:
+    """
+    Embed the graph with the hashing embedder.
+
+    Returns:
+        EmbeddingIndex: Index
+    """
+    return EmbeddingIndex.build(graph, HashingEmbedder(64))
+
+
+def test_hashing_embedder_is_deterministic() -> None:
+    texts = ["residential lease", "Leasing of land", ""]
+    vectors = HashingEmbedder(64).embed(texts)
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (3, 64)
+    assert np.array_equal(vectors, HashingEmbedder(64).embed(texts))
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0)
+    assert not vectors[2].any()
+
+
+def test_save_and_load_round_trip(index: EmbeddingIndex, tmp_path: Path) -> None:
+    path = str(tmp_path / "embeddings.npy")
+    index.save(path, "v1")
+    assert sorted(file.name for file in tmp_path.iterdir()) == [
+        "embeddings.npy",
+        "embeddings.npy.json",
+    ]
+
+    loaded = EmbeddingIndex.load(path, HashingEmbedder(64), "v1", 4)
+    assert loaded is not None
+    assert isinstance(loaded.matrix, np.memmap)
+    assert np.array_equal(loaded.matrix, index.matrix)
+
+
+@pytest.mark.parametrize(
+    "embedder, version, num_classes",
+    [
+        (HashingEmbedder(32), "v1", 4),
+        (HashingEmbedder(64), "v2", 4),
+        (HashingEmbedder(64), "v1", 5),
+    ],
+    ids=["model", "ontology_version", "shape"],
+)
+def test_load_rejects_stale_matrix(
+    index: EmbeddingIndex,
+    tmp_path: Path,
+    embedder: HashingEmbedder,
+    version: str,
+    num_classes: int,
+) -> None:
+    path = str(tmp_path / "embeddings.npy")
+    index.save(path, "v1")
+    assert EmbeddingIndex.load(path, embedder, version, num_classes) is None
+
+
+def test_load_missing_matrix(tmp_path: Path) -> None:
+    path = str(tmp_path / "embeddings.npy")
+    assert EmbeddingIndex.load(path, HashingEmbedder(64), "v1", 4) is None
+
+
+def test_search(graph, index: EmbeddingIndex) -> None:
+    results = index.search("lease", limit=2)
+    assert sorted(class_index for class_index, _ in results) == [
+        graph.index("residential lease"),
+        graph.index("commercial lease"),
+    ]
+    assert results[0][1] >= results[1][1] > 0.0
+
+    # every class, best first
+    results = index.search("patent infringement", limit=10)
+    assert len(results) == 4
+    assert results[0][0] == graph.index("patent infringement")
+    assert [score for _, score in results] == sorted(
+        (score for _, score in results), reverse=True
+    )
+
+    assert not index.search("lease", limit=0)
+    assert not index.search("", limit=2)
+
+
+def test_search_rows(graph, index: EmbeddingIndex) -> None:
+    rows = np.array(
+        [graph.index("commercial lease"), graph.index("criminal procedure")],
+        dtype=np.int64,
+    )
+    results = index.search("residential lease", limit=1, rows=rows)
+    assert [class_index for class_index, _ in results] == [
+        graph.index("commercial lease")
+    ]
+    assert {class_index for class_index, _ in index.search("lease", rows=rows)} == {
+        graph.index("commercial lease"),
+        graph.index("criminal procedure"),
+    }
@@ -0,0 +1,121 @@
+"""
+Tests for the bounded search pool and its backpressure.
+"""
+
+# imports
+import asyncio
+import threading
+from typing import List
+
+# packages
+import httpx
+import pytest
+from fastapi import FastAPI
+from soli import OWLClass
+
+# project
+import soli_api.routes.search
+from soli_api.api import search_queue_full_handler
+from soli_api.executor import SearchExecutor, SearchQueueFullError
+
+
+class FakeEngine:
+    """
+    Search engine whose prefix search waits to be released and whose label search
+    fails.
+    """
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.lease = OWLClass(iri="https://example.org/Lease", label="Lease")
+
+    def search_by_prefix(self, _prefix: str) -> List[OWLClass]:
+        self.release.wait(5.0)
+        return [self.lease]
+
+    def search_by_label(self, _query: str, limit: int = 10) -> list:
+        raise ValueError(f"search failed with limit {limit}")
+
+
+@pytest.fixture(name="engine")
+def fixture_engine() -> FakeEngine:
+    """
+    Create the fake engine, releasing any search still waiting at teardown.
+
+    Yields:
+        FakeEngine: Engine
+    """
+    engine = FakeEngine()
+    yield engine
+    engine.release.set()
+
+
+def test_full_queue_returns_503(engine: FakeEngine) -> None:
+    app = FastAPI()
+    app.add_exception_handler(
+        SearchQueueFullError, search_queue_full_handler  # type: ignore
+    )
+    app.include_router(soli_api.routes.search.router)
+    search_executor = SearchExecutor(engine, max_workers=1, max_pending=1)
+    app.state.search_executor = search_executor
+
+    async def run() -> tuple:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            first = asyncio.ensure_future(
+                client.get("/search/prefix", params={"query": "lease"})
+            )
+            while search_executor.pending == 0:
+                await asyncio.sleep(0.01)
+
+            rejected = await client.get("/search/prefix", params={"query": "lease"})
+            engine.release.set()
+            return await first, rejected
+
+    try:
+        first, rejected = asyncio.run(run())
+    finally:
+        search_executor.shutdown()
+
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "1"
+    assert "queue is full" in rejected.json()["message"]
+
+    assert first.status_code == 200
+    assert [owl_class["label"] for owl_class in first.json()["classes"]] == ["Lease"]
+    assert search_executor.pending == 0
+
+
+def test_search_error_reaches_caller(engine: FakeEngine) -> None:
+    search_executor = SearchExecutor(engine, max_workers=1, max_pending=1)
+
+    async def run(limit: int) -> list:
+        return await asyncio.wait_for(
+            search_executor.run("search_by_label", "lease", limit=limit), timeout=5.0
+        )
+
+    try:
+        with pytest.raises(ValueError, match="limit 3"):
+            asyncio.run(run(3))
+        # the failed search frees its place in the queue for the next one
+        assert search_executor.pending == 0
+        with pytest.raises(ValueError, match="limit 5"):
+            asyncio.run(run(5))
+    finally:
+        search_executor.shutdown()
+
+
+def test_unsupported_method(engine: FakeEngine) -> None:
+    search_executor = SearchExecutor(engine)
+    try:
+        with pytest.raises(ValueError, match="Unsupported search method"):
+            asyncio.run(search_executor.run("shutdown"))
+        assert search_executor.pending == 0
+    finally:
+        search_executor.shutdown()
+
+
+def test_invalid_mode(engine: FakeEngine) -> None:
+    with pytest.raises(ValueError, match="Invalid executor mode"):
+        SearchExecutor(engine, mode="greenlet")
@@ -0,0 +1,137 @@
+"""
+Tests for the CSR adjacency and neighborhood search.
+"""
+
+# imports
+from typing import Callable
+
+# packages
+import pytest
+
+# project
+from soli_api.graph_index import CSRAdjacency, GraphIndex
+
+
+@pytest.fixture(name="graph")
+def fixture_graph(make_graph: Callable):
+    """
+    Build a small hierarchy:
+
+        root
+        ├── a ── a1, a2
+        └── b ── b1, b2, b3
+
+    with a see_also edge from a1 to b1, and an edge to a class outside the graph.
+
+    Returns:
+        FakeGraph: Graph
+    """
+    return make_graph(
+        {
+            "root": [],
+            "a": ["root"],
+            "b": ["root"],
+            "a1": ["a"],
+            "a2": ["a"],
+            "b1": ["b"],
+            "b2": ["b"],
+            "b3": ["b", "missing"],
+        },
+        see_also={"a1": ["b1", "b1"]},
+    )
+
+
+def test_csr_adjacency() -> None:
+    adjacency = CSRAdjacency([[1, 2], [], [0]])
+    assert list(adjacency.offsets) == [0, 2, 2, 3]
+    assert list(adjacency.neighbors(0)) == [1, 2]
+    assert not adjacency.neighbors(1)
+    assert list(adjacency.neighbors(2)) == [0]
+    assert len(adjacency) == 3
+
+
+def test_graph_index_drops_unknown_and_duplicate_edges(graph) -> None:
+    index = GraphIndex(graph)
+    assert list(index.adjacency["sub_class_of"].neighbors(graph.index("b3"))) == [
+        graph.index("b")
+    ]
+    assert list(index.adjacency["see_also"].neighbors(graph.index("a1"))) == [
+        graph.index("b1")
+    ]
+    assert index.num_edges() == 7 + 7 + 1
+
+
+def test_neighborhood_hops(graph) -> None:
+    index = GraphIndex(graph)
+    distances, truncated = index.neighborhood(
+        [graph.index("a")], relations=("parent_class_of",), hops=1
+    )
+    assert distances == {
+        graph.index("a"): 0,
+        graph.index("a1"): 1,
+        graph.index("a2"): 1,
+    }
+    assert not truncated
+
+    distances, _ = index.neighborhood(
+        [graph.index("a1")], relations=("sub_class_of", "see_also"), hops=2
+    )
+    assert distances == {
+        graph.index("a1"): 0,
+        graph.index("a"): 1,
+        graph.index("b1"): 1,
+        graph.index("root"): 2,
+        graph.index("b"): 2,
+    }
+
+
+def test_neighborhood_zero_hops_returns_seeds(graph) -> None:
+    index = GraphIndex(graph)
+    distances, truncated = index.neighborhood(
+        [graph.index("a"), graph.index("b"), graph.index("a")], hops=0
+    )
+    assert distances == {graph.index("a"): 0, graph.index("b"): 0}
+    assert not truncated
+
+
+def test_neighborhood_truncates_at_max_nodes(graph) -> None:
+    index = GraphIndex(graph)
+    distances, truncated = index.neighborhood(
+        [graph.index("root")], relations=("parent_class_of",), hops=2, max_nodes=4
+    )
+    assert truncated
+    assert len(distances) == 4
+    # breadth-first, so every class at hop 1 is kept before any at hop 2
+    assert list(distances.items())[:3] == [
+        (graph.index("root"), 0),
+        (graph.index("a"), 1),
+        (graph.index("b"), 1),
+    ]
+    assert list(distances.values())[3] == 2
+
+
+def test_neighborhood_exact_max_nodes_is_not_truncated(graph) -> None:
+    index = GraphIndex(graph)
+    distances, truncated = index.neighborhood(
+        [graph.index("a")], relations=("parent_class_of",), hops=1, max_nodes=3
+    )
+    assert len(distances) == 3
+    assert not truncated
+
+
+def test_neighborhood_truncates_seeds(graph) -> None:
+    index = GraphIndex(graph)
+    distances, truncated = index.neighborhood(
+        [graph.index("a1"), graph.index("a2"), graph.index("b1")], hops=0, max_nodes=2
+    )
+    assert list(distances) == [graph.index("a1"), graph.index("a2")]
+    assert truncated
+
+
+def test_edges_between_nodes(graph) -> None:
+    index = GraphIndex(graph)
+    nodes = [graph.index("a"), graph.index("a1"), graph.index("b1")]
+    assert index.edges(nodes, relations=("sub_class_of", "see_also")) == [
+        (graph.index("a1"), graph.index("a"), "sub_class_of"),
+        (graph.index("a1"), graph.index("b1"), "see_also"),
+    ]
@@ -0,0 +1,124 @@
+"""
+Tests for the conditional GET middleware.
+"""
+
+# packages
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+# project
+from soli_api.http_cache import ConditionalGetMiddleware, route_family
+
+
+@pytest.fixture(name="client")
+def fixture_client() -> TestClient:
+    """
+    Create an app with one known class, a validated search route and the middleware.
+
+    Returns:
+        TestClient: Client for the app
+    """
+    app = FastAPI()
+    app.add_middleware(ConditionalGetMiddleware)  # type: ignore
+    app.state.ontology_version = "v1"
+    app.state.ontology_loaded = 1_700_000_000.0
+
+    @app.get("/search/label")
+    async def search_label(limit: int) -> dict:
+        return {"limit": limit}
+
+    @app.get("/search")
+    async def search(query: str) -> dict:
+        return {"query": query}
+
+    @app.get("/{iri}")
+    async def get_class(iri: str) -> dict:
+        if iri != "known":
+            raise HTTPException(status_code=404, detail=f"IRI not found: {iri}")
+        return {"iri": iri}
+
+    return TestClient(app)
+
+
+def test_validators_on_success(client: TestClient) -> None:
+    response = client.get("/known")
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+
+
+def test_matching_etag_returns_304(client: TestClient) -> None:
+    etag = client.get("/known").headers["etag"]
+    response = client.get("/known", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_other_etag_returns_200(client: TestClient) -> None:
+    response = client.get("/known", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+def test_wildcard_on_existing_resource_returns_304(client: TestClient) -> None:
+    response = client.get("/known", headers={"If-None-Match": "*"})
+    assert response.status_code == 304
+
+
+def test_wildcard_on_missing_resource_returns_404(client: TestClient) -> None:
+    response = client.get("/missing", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "IRI not found: missing"
+    assert "etag" not in response.headers
+
+
+def test_matching_etag_on_missing_resource_returns_404(client: TestClient) -> None:
+    assert "etag" not in client.get("/missing").headers
+    etag = client.get("/known").headers["etag"]
+    response = client.get("/missing", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+
+def test_if_modified_since_on_missing_resource_returns_404(client: TestClient) -> None:
+    response = client.get(
+        "/missing", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == 404
+
+
+def test_if_modified_since_on_existing_resource_returns_304(
+    client: TestClient,
+) -> None:
+    response = client.get(
+        "/known", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == 304
+
+
+def test_validation_error_under_conditional_headers_returns_422(
+    client: TestClient,
+) -> None:
+    for headers in (
+        {"If-None-Match": "*"},
+        {"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    ):
+        response = client.get("/search/label", params={"limit": "x"}, headers=headers)
+        assert response.status_code == 422
+
+
+def test_route_family() -> None:
+    assert route_family("/search") == "search"
+    assert route_family("/search/label") == "search"
+    assert route_family("/search/llm/area_of_law") == "llm"
+    assert route_family("/search/llm") == "llm"
+    assert route_family("/searches") == "root"
+    assert route_family("/taxonomy/area_of_law") == "taxonomy"
+    assert route_family("/R8pNPutX0TN6DlEqkyZuxSw") == "root"
+    assert route_family("/docs") is None
+
+
+def test_combined_search_uses_search_policy(client: TestClient) -> None:
+    response = client.get("/search", params={"query": "lease"})
+    assert response.headers["cache-control"] == "public, max-age=3600"
+    assert client.get("/known").headers["cache-control"] == "public, max-age=86400"
@@ -0,0 +1,212 @@
+"""
+Tests for batch LLM jobs.
+"""
+
+# imports
+import asyncio
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+# packages
+import pytest
+from soli import OWLClass, SOLITypes
+
+# project
+from soli_api import llm_batch as llm_batch_module
+from soli_api.llm_batch import LLMBatchRunner, LLMBatchStore
+from soli_api.llm_cache import LLMSearchCache
+
+
+class FakeSOLI:
+    """
+    Graph with a fixed branch.
+    """
+
+    def __init__(self) -> None:
+        self.classes = [
+            OWLClass(iri=f"https://example.org/{name}", label=name)
+            for name in ("Lease", "Sale", "Trust")
+        ]
+
+
+class FakeClosure:
+    """
+    Closure where every branch holds the first classes of FakeSOLI, one per hop.
+    """
+
+    def branch(self, _soli_type: SOLITypes, max_hops: Optional[int] = None) -> dict:
+        return {index: index + 1 for index in range(3)[:max_hops]}
+
+
+class FakeLLM:
+    """
+    Packed LLM search that records concurrency and fails on request.
+    """
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.calls = 0
+        self.limits: List[int] = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(
+        self,
+        _soli: FakeSOLI,
+        queries: Sequence[str],
+        search_set: List[OWLClass],
+        limit: int = 10,
+    ) -> List[List[Tuple[OWLClass, int]]]:
+        self.calls += 1
+        self.limits.append(limit)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if "fail" in queries:
+            raise RuntimeError("Error searching with LLM.")
+        return [[(search_set[0], 9)][:limit] for _ in queries]
+
+
+@pytest.fixture(name="fake_llm")
+def fixture_fake_llm(monkeypatch: pytest.MonkeyPatch) -> FakeLLM:
+    """
+    Replace the packed LLM search.
+
+    Returns:
+        FakeLLM: Fake search
+    """
+    fake_llm = FakeLLM()
+    monkeypatch.setattr(llm_batch_module, "search_by_llm_packed", fake_llm)
+    return fake_llm
+
+
+def make_runner(path: Optional[Path], **kwargs) -> LLMBatchRunner:
+    """
+    Create a runner whose cache and job store share a database file.
+
+    Args:
+        path (Optional[Path]): Database path; None for no persistence
+
+    Returns:
+        LLMBatchRunner: Runner
+    """
+    return LLMBatchRunner(
+        LLMSearchCache(str(path) if path is not None else None, "model", "v1"),
+        store=LLMBatchStore(str(path)) if path is not None else None,
+        **kwargs,
+    )
+
+
+def test_job_runs_with_bounded_concurrency(fake_llm: FakeLLM) -> None:
+    runner = make_runner(None, batch_size=2, max_concurrency=3, backoff=0.001)
+    texts = [f"text {number}" for number in range(40)]
+
+    async def run() -> dict:
+        job = await runner.submit(
+            FakeSOLI(),
+            FakeClosure(),
+            texts,
+            (SOLITypes.AREA_OF_LAW, SOLITypes.ACTOR_PLAYER),
+            2,
+            5,
+        )
+        await runner._tasks[job.job_id]  # pylint: disable=protected-access
+        return await runner.summary(job.job_id)
+
+    summary = asyncio.run(run())
+    assert summary["status"] == "completed"
+    assert summary["completed"] == summary["total"] == 80
+    assert fake_llm.calls == 40
+    assert fake_llm.peak == 3
+
+
+def test_failed_chunks_release_their_slots(fake_llm: FakeLLM) -> None:
+    runner = make_runner(
+        None, batch_size=1, max_concurrency=1, max_retries=1, backoff=0.001
+    )
+
+    async def run() -> dict:
+        job = await runner.submit(
+            FakeSOLI(),
+            FakeClosure(),
+            ["fail", "a", "b"],
+            (SOLITypes.AREA_OF_LAW,),
+            2,
+            5,
+        )
+        await runner._tasks[job.job_id]  # pylint: disable=protected-access
+        return await runner.summary(job.job_id)
+
+    summary = asyncio.run(run())
+    assert summary["status"] == "completed"
+    assert summary["failed"] == 1
+    assert fake_llm.calls == 4
+
+
+def test_cached_results_skip_the_llm(tmp_path: Path, fake_llm: FakeLLM) -> None:
+    runner = make_runner(tmp_path / "llm.sqlite")
+
+    async def run() -> dict:
+        for _ in range(2):
+            job = await runner.submit(
+                FakeSOLI(), FakeClosure(), ["a", "b"], (SOLITypes.AREA_OF_LAW,), 2, 5
+            )
+            await runner._tasks[job.job_id]  # pylint: disable=protected-access
+        return await runner.summary(job.job_id)
+
+    summary = asyncio.run(run())
+    assert summary["cached"] == 2
+    assert fake_llm.calls == 1
+
+
+def test_jobs_share_full_ranked_lists(tmp_path: Path, fake_llm: FakeLLM) -> None:
+    runner = make_runner(tmp_path / "llm.sqlite")
+    cache = runner.llm_cache
+    ranked = [("https://example.org/Lease", 9), ("https://example.org/Sale", 7)]
+    cache.put(cache.cache_key(SOLITypes.AREA_OF_LAW, "a", 2), ranked)
+
+    async def run() -> dict:
+        job = await runner.submit(
+            FakeSOLI(), FakeClosure(), ["a", "b"], (SOLITypes.AREA_OF_LAW,), 2, 1
+        )
+        await runner._tasks[job.job_id]  # pylint: disable=protected-access
+        return await runner.summary(job.job_id)
+
+    # cached lists are cut to the job's limit
+    items = {item["index"]: item["results"] for item in asyncio.run(run())["items"]}
+    assert items[0] == [["https://example.org/Lease", 9]]
+
+    # the LLM is asked for the cache's full list, whatever the job's limit
+    assert fake_llm.limits == [cache.result_limit]
+
+
+def test_other_worker_reads_job_from_store(tmp_path: Path, fake_llm: FakeLLM) -> None:
+    fake_llm.delay = 0.05
+    path = tmp_path / "llm.sqlite"
+    worker = make_runner(path, batch_size=1, max_concurrency=1)
+    other_worker = make_runner(path, poll_interval=0.01)
+
+    async def run() -> Tuple[Optional[dict], List[dict], dict]:
+        job = await worker.submit(
+            FakeSOLI(), FakeClosure(), ["a", "b", "c"], (SOLITypes.AREA_OF_LAW,), 2, 5
+        )
+        queued = await other_worker.summary(job.job_id)
+        lines = [line async for line in other_worker.stream_items(job.job_id)]
+        return queued, lines, await other_worker.summary(job.job_id, offset=1)
+
+    queued, lines, summary = asyncio.run(run())
+    assert queued is not None
+    assert queued["status"] == "queued"
+    assert [line["index"] for line in lines[:-1]] == [0, 1, 2]
+    assert lines[-1]["status"] == "completed"
+    assert lines[-1]["items"] == []
+    assert summary["completed"] == 3
+    assert len(summary["items"]) == 2
+
+
+def test_unknown_job(tmp_path: Path) -> None:
+    runner = make_runner(tmp_path / "llm.sqlite")
+    assert asyncio.run(runner.summary("missing")) is None
@@ -0,0 +1,295 @@
+"""
+Tests for the persistent LLM search cache.
+"""
+
+# imports
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Tuple
+
+# packages
+import pytest
+from soli import OWLClass, SOLITypes
+from soli.graph import SOLI_TYPE_IRIS
+
+# project
+from soli_api import llm_cache as llm_cache_module
+from soli_api.closure import ClosureIndex
+from soli_api.graph_index import GraphIndex
+from soli_api.llm_cache import LLMSearchCache, SingleFlight, normalize_query
+from soli_api.pagination import PageParams
+from soli_api.rerank import CandidateRetriever
+from soli_api.routes.search import llm_search_response
+
+# short IRI of the Area of Law branch root
+AREA_OF_LAW = SOLI_TYPE_IRIS[SOLITypes.AREA_OF_LAW]
+
+
+class FakeSOLI:
+    """
+    Graph with a fixed branch and an LLM search that counts its calls.
+    """
+
+    def __init__(self) -> None:
+        self.classes = [
+            OWLClass(iri=f"https://example.org/{name}", label=name)
+            for name in ("Lease", "Sale", "Trust")
+        ]
+        self.calls = 0
+
+    def __getitem__(self, iri: str) -> Optional[OWLClass]:
+        for owl_class in self.classes:
+            if owl_class.iri == iri:
+                return owl_class
+        return None
+
+    async def search_by_llm(
+        self, query: str, search_set: List[OWLClass], limit: int = 10
+    ) -> List[Tuple[OWLClass, int]]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return [(owl_class, 10 - rank) for rank, owl_class in enumerate(search_set)][
+            :limit
+        ]
+
+
+class FakeClosure:
+    """
+    Closure where every branch holds the first classes of FakeSOLI, one per hop.
+    """
+
+    def branch(self, _soli_type: SOLITypes, max_hops: Optional[int] = None) -> dict:
+        return {index: index + 1 for index in range(3)[:max_hops]}
+
+
+def make_cache(path: Optional[Path], ttl: Optional[float] = 60.0) -> LLMSearchCache:
+    """
+    Create a cache for a test model and ontology version.
+
+    Args:
+        path (Optional[Path]): Database path; None for no persistence
+        ttl (Optional[float]): Entry lifetime in seconds
+
+    Returns:
+        LLMSearchCache: Cache
+    """
+    return LLMSearchCache(
+        str(path) if path is not None else None, "model-a", "v1", ttl=ttl
+    )
+
+
+def test_normalize_query() -> None:
+    assert normalize_query("  Real   Property\tLease ") == "real property lease"
+
+
+def test_cache_key_normalizes_query() -> None:
+    cache = make_cache(None)
+    assert cache.cache_key(
+        SOLITypes.AREA_OF_LAW, "Real  Property", 2
+    ) == cache.cache_key(SOLITypes.AREA_OF_LAW, "real property", 2)
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        (SOLITypes.ACTOR_PLAYER, "real property", 2, None),
+        (SOLITypes.AREA_OF_LAW, "real property", 3, None),
+        (SOLITypes.AREA_OF_LAW, "real property", 2, "v2"),
+        (SOLITypes.AREA_OF_LAW, "personal property", 2, None),
+    ],
+)
+def test_cache_key_distinguishes_searches(other: tuple) -> None:
+    cache = make_cache(None)
+    assert cache.cache_key(
+        SOLITypes.AREA_OF_LAW, "real property", 2
+    ) != cache.cache_key(*other)
+
+
+def test_cache_key_includes_model_version_and_result_limit() -> None:
+    cache = make_cache(None)
+    key = cache.cache_key(SOLITypes.AREA_OF_LAW, "q", 2)
+    assert (
+        LLMSearchCache(None, "model-b", "v1").cache_key(SOLITypes.AREA_OF_LAW, "q", 2)
+        != key
+    )
+    assert (
+        LLMSearchCache(None, "model-a", "v1", result_limit=5).cache_key(
+            SOLITypes.AREA_OF_LAW, "q", 2
+        )
+        != key
+    )
+
+    cache.set_ontology("v2", None)
+    assert cache.cache_key(SOLITypes.AREA_OF_LAW, "q", 2) != key
+    assert cache.cache_key(SOLITypes.AREA_OF_LAW, "q", 2, "v1") == key
+
+
+def test_put_and_get(tmp_path: Path) -> None:
+    cache = make_cache(tmp_path / "llm.sqlite")
+    cache.put("key", [("https://example.org/Lease", 9)])
+    assert cache.get("key") == [("https://example.org/Lease", 9)]
+    assert cache.get("other") is None
+
+    # shared with another connection to the same file
+    assert make_cache(tmp_path / "llm.sqlite").get("key") == [
+        ("https://example.org/Lease", 9)
+    ]
+
+
+def test_expired_entries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = make_cache(tmp_path / "llm.sqlite", ttl=10.0)
+    cache.put("key", [("https://example.org/Lease", 9)])
+
+    now = llm_cache_module.time.time()
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: now + 10.0)
+    assert cache.get("key") is None
+    assert cache.purge_expired() == 1
+
+
+def test_search_caches_results(tmp_path: Path) -> None:
+    cache = make_cache(tmp_path / "llm.sqlite")
+    soli = FakeSOLI()
+
+    first = asyncio.run(
+        cache.search(soli, FakeClosure(), SOLITypes.AREA_OF_LAW, "lease", 2)
+    )
+    second = asyncio.run(
+        cache.search(soli, FakeClosure(), SOLITypes.AREA_OF_LAW, "Lease", 2)
+    )
+
+    assert first == second
+    assert [owl_class.label for owl_class, _ in first] == ["Lease", "Sale"]
+    assert soli.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_pages_slice_one_ranked_list(tmp_path: Path) -> None:
+    cache = LLMSearchCache(str(tmp_path / "llm.sqlite"), "model-a", "v1")
+    soli = FakeSOLI()
+    request = SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                llm_cache=cache, soli=soli, closure_index=FakeClosure()
+            )
+        )
+    )
+
+    async def get_page(offset: int, limit: int) -> list:
+        response = await llm_search_response(
+            request,
+            SOLITypes.AREA_OF_LAW,
+            "lease",
+            2,
+            PageParams(limit=limit, offset=offset, fields="label"),
+        )
+        return json.loads(response.body)["results"]
+
+    assert asyncio.run(get_page(0, 1)) == [[{"label": "Lease"}, 10]]
+    assert asyncio.run(get_page(1, 1)) == [[{"label": "Sale"}, 9]]
+    assert asyncio.run(get_page(0, 5)) == [
+        [{"label": "Lease"}, 10],
+        [{"label": "Sale"}, 9],
+    ]
+    assert soli.calls == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_search_asks_for_result_limit() -> None:
+    cache = LLMSearchCache(None, "model-a", "v1", result_limit=1)
+    results = asyncio.run(
+        cache.search(FakeSOLI(), FakeClosure(), SOLITypes.AREA_OF_LAW, "lease", 2)
+    )
+    assert [owl_class.label for owl_class, _ in results] == ["Lease"]
+
+
+def test_search_coalesces_concurrent_calls() -> None:
+    cache = make_cache(None)
+    soli = FakeSOLI()
+
+    async def search_twice() -> list:
+        return await asyncio.gather(
+            cache.search(soli, FakeClosure(), SOLITypes.AREA_OF_LAW, "lease", 2),
+            cache.search(soli, FakeClosure(), SOLITypes.AREA_OF_LAW, "lease", 2),
+        )
+
+    first, second = asyncio.run(search_twice())
+    assert first == second
+    assert soli.calls == 1
+    assert cache.stats()["coalesced"] == 1
+
+
+def test_search_returns_results_when_store_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = make_cache(tmp_path / "llm.sqlite")
+    soli = FakeSOLI()
+
+    def fail_put(_key: str, _results: list) -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "put", fail_put)
+    results = asyncio.run(
+        cache.search(soli, FakeClosure(), SOLITypes.AREA_OF_LAW, "lease", 2)
+    )
+    assert [owl_class.label for owl_class, _ in results] == ["Lease", "Sale"]
+
+
+def test_single_flight_survives_cancelled_caller() -> None:
+    single_flight = SingleFlight()
+    calls = []
+
+    async def factory() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run() -> str:
+        first = asyncio.ensure_future(single_flight.run("key", factory))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(single_flight.run("key", factory))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+    assert len(calls) == 1
+    assert len(single_flight) == 0
+
+
+def test_search_set_lists_each_class_once(make_graph: Callable) -> None:
+    graph = make_graph(
+        {
+            AREA_OF_LAW: [],
+            "property": [AREA_OF_LAW],
+            "contract": [AREA_OF_LAW],
+            "lease": ["property", "contract"],
+            "sublease": ["lease"],
+        }
+    )
+    closure_index = ClosureIndex(GraphIndex(graph))
+
+    search_set, candidates = LLMSearchCache._search_set(
+        graph, closure_index, SOLITypes.AREA_OF_LAW, "lease", -1, None
+    )
+    assert [owl_class.label for owl_class in search_set] == [
+        "property",
+        "contract",
+        "lease",
+        "sublease",
+    ]
+    assert candidates == search_set
+
+    search_set, _ = LLMSearchCache._search_set(
+        graph, closure_index, SOLITypes.AREA_OF_LAW, "lease", 1, None
+    )
+    assert [owl_class.label for owl_class in search_set] == ["property", "contract"]
+
+    # the whole branch fits, so narrowing only drops duplicates
+    retriever = CandidateRetriever(SimpleNamespace(soli=graph), max_candidates=10)
+    lease = graph.classes[graph.index("lease")]
+    contract = graph.classes[graph.index("contract")]
+    assert retriever.narrow("lease", [lease, contract, lease]) == [lease, contract]
@@ -0,0 +1,205 @@
+"""
+Tests for the managed LLM client's circuit breaker and wait queue.
+"""
+
+# imports
+import asyncio
+from typing import Any, List
+
+# packages
+import pytest
+
+# project
+from soli_api import llm_client as llm_client_module
+from soli_api.llm_client import (
+    CircuitBreaker,
+    LLMCircuitOpenError,
+    LLMQueueFullError,
+    LLMTimeoutError,
+    ManagedLLM,
+)
+
+
+class FakeClock:
+    """
+    Monotonic clock that only moves when advanced.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeModel:
+    """
+    Model without an HTTP endpoint.
+    """
+
+    model = "fake-model"
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """
+    Replace the clock used by the circuit breaker.
+
+    Returns:
+        FakeClock: Clock to advance in the test
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(llm_client_module.time, "monotonic", clock)
+    return clock
+
+
+async def succeed(delay: float = 0.0) -> str:
+    await asyncio.sleep(delay)
+    return "ok"
+
+
+async def fail() -> None:
+    raise ValueError("provider error")
+
+
+def test_breaker_opens_at_threshold(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30.0
+
+    clock.now += 10.0
+    assert breaker.retry_after() == 20.0
+
+
+def test_breaker_success_resets_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_breaker_half_open_allows_one_trial(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    clock.now += 30.0
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_breaker_failed_trial_reopens(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30.0
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.retry_after() == 30.0
+
+
+def test_breaker_released_trial_can_be_claimed_again(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    clock.now += 30.0
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.allow()
+
+
+def test_call_opens_breaker_and_fails_fast() -> None:
+    llm = ManagedLLM(FakeModel(), failure_threshold=2, reset_timeout=30.0)
+
+    async def run() -> None:
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await llm.call(fail)
+        with pytest.raises(LLMCircuitOpenError):
+            await llm.call(succeed)
+
+    asyncio.run(run())
+    assert llm.stats()["failures"] == 2
+    assert llm.stats()["rejected"] == 1
+    assert llm.stats()["state"] == "open"
+
+
+def test_call_timeout_counts_against_breaker() -> None:
+    llm = ManagedLLM(FakeModel(), timeout=0.01, failure_threshold=1)
+
+    async def run() -> None:
+        with pytest.raises(LLMTimeoutError):
+            await llm.call(succeed, 1.0)
+
+    asyncio.run(run())
+    assert llm.stats()["timeouts"] == 1
+    assert llm.breaker.state == "open"
+
+
+def test_queue_full_is_refused() -> None:
+    llm = ManagedLLM(FakeModel(), max_concurrency=1, max_queue=1)
+
+    async def run() -> List[Any]:
+        return await asyncio.gather(
+            llm.call(succeed, 0.05),
+            llm.call(succeed, 0.05),
+            llm.call(succeed, 0.05),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert results[:2] == ["ok", "ok"]
+    assert isinstance(results[2], LLMQueueFullError)
+    assert results[2].status_code == 429
+
+
+def test_queue_wait_timeout_does_not_touch_breaker() -> None:
+    llm = ManagedLLM(
+        FakeModel(),
+        max_concurrency=1,
+        max_queue=10,
+        queue_timeout=0.02,
+        timeout=1.0,
+        failure_threshold=1,
+    )
+
+    async def run() -> List[Any]:
+        return await asyncio.gather(
+            llm.call(succeed, 0.1),
+            llm.call(succeed, 0.1),
+            llm.call(succeed, 0.1),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert results[0] == "ok"
+    assert all(isinstance(result, LLMQueueFullError) for result in results[1:])
+    assert llm.stats()["queue_timeouts"] == 2
+    assert llm.stats()["timeouts"] == 0
+    assert llm.breaker.failures == 0
+    assert llm.breaker.state == "closed"
+
+
+def test_call_timeout_excludes_queue_wait() -> None:
+    llm = ManagedLLM(FakeModel(), max_concurrency=1, queue_timeout=1.0, timeout=0.08)
+
+    async def run() -> List[Any]:
+        return await asyncio.gather(
+            llm.call(succeed, 0.05), llm.call(succeed, 0.05), return_exceptions=True
+        )
+
+    # the second call waits 0.05 seconds and runs for 0.05, within its own timeout
+    assert asyncio.run(run()) == ["ok", "ok"]
+    assert llm.stats()["active"] == 0
+    assert llm.stats()["queued"] == 0
+    assert len(llm.latency) == 2
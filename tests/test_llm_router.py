@@ -0,0 +1,122 @@
+"""
+Tests for routing LLM calls across several backends.
+"""
+
+# imports
+import asyncio
+from typing import List, Optional
+
+# packages
+import pytest
+
+# project
+from soli_api.llm_client import LLMCircuitOpenError, ManagedLLM
+from soli_api.llm_router import LLMRouter
+
+
+class FakeModel:
+    """
+    Local stand-in for an LLM backend, answering with its name after a delay.
+    """
+
+    def __init__(
+        self, model: str, delay: float = 0.0, error: Optional[Exception] = None
+    ) -> None:
+        self.model = model
+        self.delay = delay
+        self.error = error
+        self.started: List[float] = []
+        self.cancelled = 0
+
+    async def _json_async(self, prompt: str) -> dict:
+        self.started.append(asyncio.get_running_loop().time())
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return {"model": self.model, "prompt": prompt}
+
+
+def backend(model: str, **kwargs) -> ManagedLLM:
+    """
+    Wrap a fake model in the managed client.
+
+    Returns:
+        ManagedLLM: Backend
+    """
+    return ManagedLLM(FakeModel(model, **kwargs), failure_threshold=1)
+
+
+def test_failover_to_next_backend() -> None:
+    router = LLMRouter([backend("a", error=ValueError("provider error")), backend("b")])
+    result = asyncio.run(router.json_async("lease"))
+    assert result == {"model": "b", "prompt": "lease"}
+    assert router.failovers == 1
+    assert router.backends[0].breaker.state == "open"
+
+
+def test_every_backend_failing_raises_last_error() -> None:
+    router = LLMRouter(
+        [
+            backend("a", error=ValueError("first")),
+            backend("b", error=KeyError("second")),
+        ]
+    )
+    with pytest.raises(KeyError):
+        asyncio.run(router.json_async("lease"))
+
+
+def test_open_backends_are_skipped() -> None:
+    first, second = backend("a"), backend("b")
+    first.breaker.record_failure()
+    router = LLMRouter([first, second])
+
+    assert router.ranked_backends() == [second]
+    assert asyncio.run(router.json_async("lease"))["model"] == "b"
+    assert not first.llm.started
+    assert router.failovers == 0
+
+    second.breaker.record_failure()
+    with pytest.raises(LLMCircuitOpenError):
+        asyncio.run(router.json_async("lease"))
+
+
+def test_ranked_backends_by_median_latency() -> None:
+    first, second, third = backend("a"), backend("b"), backend("c")
+    for _ in range(5):
+        first.latency.record(0.5)
+        second.latency.record(0.1)
+    router = LLMRouter([first, second, third])
+    assert router.ranked_backends() == [second, first, third]
+
+
+def test_hedge_after_p95_delay() -> None:
+    slow, fast = backend("a", delay=1.0), backend("b")
+    for seconds in (0.02, 0.03, 0.05):
+        slow.latency.record(seconds)
+    router = LLMRouter([slow, fast], hedge=True, hedge_min_delay=0.01)
+    assert router.hedge_delay(slow) == 0.05
+
+    async def run() -> dict:
+        result = await router.json_async("lease")
+        # let the cancelled call unwind
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run())["model"] == "b"
+    assert fast.llm.started[0] - slow.llm.started[0] == pytest.approx(0.05, abs=0.03)
+    assert slow.llm.cancelled == 1
+    assert router.hedged == 1
+    assert router.hedge_wins == 1
+    assert router.failovers == 0
+
+
+def test_no_hedge_when_first_backend_answers_in_time() -> None:
+    first, second = backend("a", delay=0.01), backend("b")
+    router = LLMRouter([first, second], hedge=True, hedge_min_delay=0.2)
+    assert asyncio.run(router.json_async("lease"))["model"] == "a"
+    assert not second.llm.started
+    assert router.hedged == 0
@@ -0,0 +1,202 @@
+"""
+Tests for materialized class renderings behind IRI resolution.
+"""
+
+# imports
+import json
+from typing import List, Tuple
+
+# packages
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from soli import SOLI, OWLClass
+from starlette.responses import JSONResponse, Response
+
+# project
+import soli_api.routes.root
+from soli_api import materialize as materialize_module
+from soli_api.materialize import (
+    CLASS_MEDIA_TYPES,
+    DEFAULT_EAGER_FORMATS,
+    ClassRenderCache,
+)
+from soli_api.templates.basic_html import render_tailwind_html
+
+# route suffix of each class format
+FORMAT_PATHS = {
+    "json": "",
+    "jsonld": "/jsonld",
+    "xml": "/xml",
+    "markdown": "/markdown",
+    "html": "/html",
+}
+
+
+@pytest.fixture(name="renders")
+def fixture_renders(monkeypatch: pytest.MonkeyPatch) -> List[Tuple[str, str]]:
+    """
+    Record every class rendering.
+
+    Returns:
+        List[Tuple[str, str]]: IRI and format of each rendering
+    """
+    renders: List[Tuple[str, str]] = []
+    render_class = materialize_module.render_class
+
+    def record(owl_class: OWLClass, soli: SOLI, response_format: str) -> bytes:
+        renders.append((owl_class.iri, response_format))
+        return render_class(owl_class, soli, response_format)
+
+    monkeypatch.setattr(materialize_module, "render_class", record)
+    return renders
+
+
+def baseline_client(soli: SOLI) -> TestClient:
+    """
+    Serve classes the way the routes did before rendered bodies were cached.
+
+    Args:
+        soli (SOLI): SOLI graph object
+
+    Returns:
+        TestClient: Client for the app
+    """
+    app = FastAPI()
+
+    @app.get("/{iri}", response_model=OWLClass)
+    async def get_class(iri: str) -> OWLClass:
+        return soli[iri]
+
+    @app.get("/{iri}/markdown", response_model=None)
+    async def get_class_markdown(iri: str) -> Response:
+        return Response(content=soli[iri].to_markdown(), media_type="text/markdown")
+
+    @app.get("/{iri}/jsonld", response_model=None)
+    async def get_class_jsonld(iri: str) -> JSONResponse:
+        return JSONResponse(
+            content=soli[iri].to_jsonld(), media_type="application/ld+json"
+        )
+
+    @app.get("/{iri}/xml", response_model=None)
+    async def get_class_xml(iri: str) -> Response:
+        return Response(content=soli[iri].to_owl_xml(), media_type="application/xml")
+
+    @app.get("/{iri}/html", response_model=None)
+    async def get_class_html(iri: str) -> Response:
+        return Response(
+            content=render_tailwind_html(soli[iri], soli), media_type="text/html"
+        )
+
+    return TestClient(app)
+
+
+def cached_client(soli: SOLI, mode: str) -> TestClient:
+    """
+    Serve classes from a render cache in the given mode.
+
+    Args:
+        soli (SOLI): SOLI graph object
+        mode (str): Materialization mode
+
+    Returns:
+        TestClient: Client for the app
+    """
+    app = FastAPI()
+    app.state.soli = soli
+    app.state.render_cache = ClassRenderCache(soli, mode=mode)
+    if mode == "eager":
+        app.state.render_cache.materialize()
+    app.include_router(soli_api.routes.root.router)
+    return TestClient(app)
+
+
+def iri_path(owl_class: OWLClass) -> str:
+    """
+    Get the short IRI a class is resolved by.
+
+    Args:
+        owl_class (OWLClass): SOLI OWLClass object
+
+    Returns:
+        str: Path segment
+    """
+    return owl_class.iri.rsplit("/", 1)[-1]
+
+
+def test_eager_renders_at_startup(
+    parsed_soli: SOLI, renders: List[Tuple[str, str]]
+) -> None:
+    cache = ClassRenderCache(parsed_soli, mode="eager")
+    assert cache.materialize() == len(parsed_soli.classes) * len(DEFAULT_EAGER_FORMATS)
+    assert len(renders) == len(parsed_soli.classes) * len(DEFAULT_EAGER_FORMATS)
+
+    renders.clear()
+    for owl_class in parsed_soli.classes:
+        for response_format in DEFAULT_EAGER_FORMATS:
+            cache.get(owl_class, response_format)
+    assert not renders
+    assert cache.stats()["entries"] == 0
+
+    # other formats are rendered on first access
+    owl_class = parsed_soli.classes[0]
+    cache.get(owl_class, "html")
+    cache.get(owl_class, "html")
+    assert renders == [(owl_class.iri, "html")]
+
+
+def test_lazy_renders_on_first_access(
+    parsed_soli: SOLI, renders: List[Tuple[str, str]]
+) -> None:
+    cache = ClassRenderCache(parsed_soli, mode="lazy")
+    assert not renders
+
+    owl_class = parsed_soli.classes[1]
+    first = cache.get(owl_class, "markdown")
+    assert cache.get(owl_class, "markdown") is first
+    assert renders == [(owl_class.iri, "markdown")]
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["hits"] == 1
+
+    cache.clear()
+    cache.get(owl_class, "markdown")
+    assert len(renders) == 2
+
+
+def test_off_never_caches(parsed_soli: SOLI, renders: List[Tuple[str, str]]) -> None:
+    cache = ClassRenderCache(parsed_soli, mode="off")
+    owl_class = parsed_soli.classes[1]
+    assert cache.get(owl_class, "json") == cache.get(owl_class, "json")
+    assert renders == [(owl_class.iri, "json")] * 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalid_mode(parsed_soli: SOLI) -> None:
+    with pytest.raises(ValueError, match="Invalid materialize mode"):
+        ClassRenderCache(parsed_soli, mode="always")
+
+
+@pytest.mark.parametrize("mode", ["off", "lazy", "eager"])
+def test_same_bytes_as_baseline(parsed_soli: SOLI, mode: str) -> None:
+    baseline = baseline_client(parsed_soli)
+    client = cached_client(parsed_soli, mode)
+    for owl_class in parsed_soli.classes:
+        for response_format, suffix in FORMAT_PATHS.items():
+            path = f"/{iri_path(owl_class)}{suffix}"
+            expected = baseline.get(path)
+            # twice, so cached bodies are compared as well as fresh ones
+            for _ in range(2):
+                response = client.get(path)
+                assert response.status_code == 200
+                assert response.content == expected.content, path
+                assert response.headers["content-type"] == (
+                    expected.headers["content-type"]
+                )
+                assert response.headers["content-type"].startswith(
+                    CLASS_MEDIA_TYPES[response_format]
+                )
+
+    # the non-ASCII label and quoted definition survive unescaped, as before
+    body = client.get("/Sublease").content
+    assert "Sous-location à bail".encode("utf-8") in body
+    assert json.loads(body)["definition"] == 'A "lease" granted by a tenant.'
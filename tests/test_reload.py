@@ -0,0 +1,98 @@
+"""
+Tests for reloading the ontology from its source.
+"""
+
+# imports
+import signal
+from typing import Any, Callable, Dict, List, Tuple
+
+# packages
+import pytest
+from fastapi import FastAPI
+
+# project
+import soli_api.api
+from soli_api import reload as reload_module
+from soli_api.http_cache import ontology_version
+from soli_api.reload import ParentReloader
+
+
+@pytest.fixture(name="app")
+def fixture_app(make_graph: Callable) -> FastAPI:
+    """
+    Build an app whose state holds a loaded graph with a snapshot configured.
+
+    Returns:
+        FastAPI: App
+    """
+    app = FastAPI()
+    app.state.config = {"soli": {"source": "http", "snapshot": {"path": "x.pickle"}}}
+    app.state.soli = make_graph({"root": [], "a": ["root"]})
+    app.state.soli.llm = None
+    app.state.ontology_version = ontology_version(app.state.soli)
+    return app
+
+
+@pytest.fixture(name="calls")
+def fixture_calls(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """
+    Record state builds and snapshot writes instead of running them.
+
+    Returns:
+        List[str]: Names of the recorded calls
+    """
+    calls: List[str] = []
+
+    def build_state(_config, soli, version=None) -> Dict[str, Any]:
+        calls.append("build_state")
+        return {"soli": soli, "ontology_version": version, "search_engine": None}
+
+    def save_snapshot(*_args) -> None:
+        calls.append("save_snapshot")
+
+    monkeypatch.setattr(soli_api.api, "build_state", build_state)
+    monkeypatch.setattr(soli_api.api, "save_snapshot", save_snapshot)
+    monkeypatch.setattr(soli_api.api, "load_retriever", lambda *args: None)
+    return calls
+
+
+def test_unchanged_ontology_is_not_rebuilt(
+    app: FastAPI,
+    calls: List[str],
+    make_graph: Callable,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        soli_api.api,
+        "load_source",
+        lambda *args, **kwargs: make_graph({"root": [], "a": ["root"]}),
+    )
+    assert soli_api.api.prepare_reload(app) is None
+    assert not calls
+
+
+def test_changed_ontology_is_rebuilt_and_saved(
+    app: FastAPI,
+    calls: List[str],
+    make_graph: Callable,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    graph = make_graph({"root": [], "a": ["root"], "b": ["root"]})
+    monkeypatch.setattr(soli_api.api, "load_source", lambda *args, **kwargs: graph)
+    assert soli_api.api.prepare_reload(app) is not None
+    assert calls == ["build_state", "save_snapshot"]
+
+
+def test_parent_reloader_signals_parent(monkeypatch: pytest.MonkeyPatch) -> None:
+    signals: List[Tuple[int, int]] = []
+    monkeypatch.setattr(
+        reload_module.os, "kill", lambda pid, signum: signals.append((pid, signum))
+    )
+    reloader = ParentReloader(1234, {"reloads": 2, "last_result": "swapped"})
+    reloader.start()
+    assert signals == [(1234, signal.SIGHUP)]
+    assert reloader.stats() == {
+        "in_progress": False,
+        "reloads": 2,
+        "last_result": "swapped",
+    }
@@ -0,0 +1,104 @@
+"""
+Tests for the precomputed label search against soli-python's own search.
+"""
+
+# imports
+from typing import Callable, Dict, List
+
+# packages
+import pytest
+from soli import SOLI
+
+# project
+from soli_api.search_engine import SearchEngine
+
+# label and alternative labels of each class, by class name
+LABELS: Dict[str, List[str]] = {
+    "lease": ["Lease", "Tenancy", "Rental Agreement"],
+    "lease_instrument": ["Lease"],
+    "residential_lease": ["Residential Lease", "Rental Agreement"],
+    "commercial_lease": ["Commercial Lease"],
+    "lease_a": ["Lease A"],
+    "lease_b": ["Lease B"],
+    "lease_c": ["Lease C"],
+    "release": ["Release"],
+    "property": ["Property"],
+    "real_property": ["Real Property", "Realty"],
+    "personal_property": ["Personal Property", "Chattel"],
+    "contract": ["Contract"],
+    "contract_law": ["Contract Law", "Law of Contracts"],
+    "unlabeled": [""],
+}
+
+
+@pytest.fixture(name="soli")
+def fixture_soli(make_graph: Callable) -> SOLI:
+    """
+    Build a SOLI instance over classes with shared labels and alternative labels,
+    without loading the ontology.
+
+    Returns:
+        SOLI: SOLI graph object
+    """
+    graph = make_graph({name: [] for name in LABELS})
+
+    soli = SOLI.__new__(SOLI)
+    soli.classes = graph.classes
+    soli.iri_to_index = graph.iri_to_index
+    soli.label_to_index = {}
+    soli.alt_label_to_index = {}
+    for index, (label, *alternative_labels) in enumerate(LABELS.values()):
+        owl_class = soli.classes[index]
+        owl_class.label = label or None
+        owl_class.alternative_labels = alternative_labels
+        if label:
+            soli.label_to_index.setdefault(label, []).append(index)
+        for alternative_label in alternative_labels:
+            soli.alt_label_to_index.setdefault(alternative_label, []).append(index)
+    return soli
+
+
+@pytest.mark.parametrize("workers", [1, -1])
+@pytest.mark.parametrize("include_alt_labels", [True, False])
+@pytest.mark.parametrize(
+    "query",
+    ["lease", "Lease", "lease b", "property", "rental", "contracts", "xyz", ""],
+)
+def test_search_by_label_matches_soli(
+    soli: SOLI, workers: int, include_alt_labels: bool, query: str
+) -> None:
+    engine = SearchEngine(soli, workers=workers)
+    for limit in (1, 2, 3, 5, 10, 50):
+        # soli-python can overrun the limit by one class per remaining label
+        expected = soli.search_by_label(
+            query, include_alt_labels=include_alt_labels, limit=limit
+        )[:limit]
+        results = engine.search_by_label(
+            query, include_alt_labels=include_alt_labels, limit=limit
+        )
+        assert [(owl_class.iri, score) for owl_class, score in results] == [
+            (owl_class.iri, score) for owl_class, score in expected
+        ], (query, limit)
+
+
+def test_search_by_label_ties_go_to_earlier_labels(soli: SOLI) -> None:
+    engine = SearchEngine(soli)
+    # Lease A, Lease B and Lease C score the same; the limit cuts after Lease B
+    results = engine.search_by_label("lease x", include_alt_labels=False, limit=4)
+    assert [owl_class.label for owl_class, _ in results] == [
+        "Lease",
+        "Lease",
+        "Lease A",
+        "Lease B",
+    ]
+    assert results[0][1] > results[2][1] == results[3][1]
+
+
+def test_search_by_label_shared_labels(soli: SOLI) -> None:
+    engine = SearchEngine(soli)
+    results = engine.search_by_label("Rental Agreement", limit=2)
+    assert [owl_class.iri for owl_class, _ in results] == [
+        SOLI.normalize_iri("lease"),
+        SOLI.normalize_iri("residential_lease"),
+    ]
+    assert not engine.search_by_label("lease", limit=0)
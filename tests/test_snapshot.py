@@ -0,0 +1,157 @@
+"""
+Tests for local snapshots of the parsed SOLI graph.
+"""
+
+# imports
+import pickle
+from pathlib import Path
+from typing import Any, Dict
+
+# packages
+import pytest
+from soli import SOLI
+
+# project
+from soli_api import api as api_module
+from soli_api import snapshot as snapshot_module
+from soli_api.snapshot import load_snapshot, save_snapshot
+
+# source key the test snapshots are built for
+SOURCE = "http:https://example.org/soli.owl"
+
+# stand-in for the configured LLM
+LLM = object()
+
+
+@pytest.fixture(name="path")
+def fixture_path(parsed_soli: SOLI, tmp_path: Path) -> Path:
+    """
+    Write a snapshot of the test ontology.
+
+    Returns:
+        Path: Snapshot file path
+    """
+    path = tmp_path / "snapshots" / "soli.snapshot"
+    save_snapshot(parsed_soli, path, SOURCE)
+    return path
+
+
+def rewrite_snapshot(path: Path, **changes: Any) -> None:
+    """
+    Change fields of a saved snapshot.
+
+    Args:
+        path (Path): Snapshot file path
+        **changes (Any): Snapshot fields to replace
+
+    Returns:
+        None
+    """
+    with open(path, "rb") as input_file:
+        snapshot: Dict[str, Any] = pickle.load(input_file)
+    snapshot.update(changes)
+    with open(path, "wb") as output_file:
+        pickle.dump(snapshot, output_file)
+
+
+def test_round_trip(parsed_soli: SOLI, path: Path) -> None:
+    assert [file.name for file in path.parent.iterdir()] == ["soli.snapshot"]
+
+    loaded = load_snapshot(path, SOURCE, llm=LLM)
+    assert loaded is not None
+    assert loaded.llm is LLM
+    assert (loaded.title, loaded.description) == (
+        parsed_soli.title,
+        parsed_soli.description,
+    )
+    assert [owl_class.model_dump() for owl_class in loaded.classes] == [
+        owl_class.model_dump() for owl_class in parsed_soli.classes
+    ]
+    assert loaded.iri_to_index == parsed_soli.iri_to_index
+    assert loaded.label_to_index == parsed_soli.label_to_index
+    assert loaded.alt_label_to_index == parsed_soli.alt_label_to_index
+    assert loaded.class_edges == parsed_soli.class_edges
+    assert loaded.triples == parsed_soli.triples
+
+    # the lookups soli-python builds while parsing work on the restored graph
+    assert loaded[parsed_soli.classes[1].iri].label == "Lease"
+    assert [owl_class.label for owl_class in loaded.search_by_prefix("Le")] == ["Lease"]
+    assert loaded.get_triples_by_predicate(
+        "skos:altLabel"
+    ) == parsed_soli.get_triples_by_predicate("skos:altLabel")
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"format_version": snapshot_module.SNAPSHOT_FORMAT_VERSION + 1},
+        {"soli_version": "0.0.0"},
+        {"fields": ("iri", "label")},
+        {"source": "http:https://example.org/other.owl"},
+    ],
+    ids=["format_version", "soli_version", "fields", "source"],
+)
+def test_stale_snapshot(path: Path, changes: Dict[str, Any]) -> None:
+    rewrite_snapshot(path, **changes)
+    assert load_snapshot(path, SOURCE) is None
+
+
+def test_max_age(path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert load_snapshot(path, SOURCE, max_age=60.0) is not None
+
+    now = snapshot_module.time.time()
+    monkeypatch.setattr(snapshot_module.time, "time", lambda: now + 61.0)
+    assert load_snapshot(path, SOURCE, max_age=60.0) is None
+    assert load_snapshot(path, SOURCE) is not None
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"not a pickle", pickle.dumps(["not", "a", "dict"])],
+    ids=["empty", "garbage", "not_a_dict"],
+)
+def test_corrupt_snapshot(path: Path, content: bytes) -> None:
+    path.write_bytes(content)
+    assert load_snapshot(path, SOURCE) is None
+
+
+def test_truncated_snapshot(path: Path) -> None:
+    path.write_bytes(path.read_bytes()[:100])
+    assert load_snapshot(path, SOURCE) is None
+
+
+def test_missing_field(path: Path) -> None:
+    rewrite_snapshot(path, classes=None)
+    assert load_snapshot(path, SOURCE) is None
+
+
+def test_missing_snapshot(tmp_path: Path) -> None:
+    assert load_snapshot(tmp_path / "soli.snapshot", SOURCE) is None
+
+
+def test_initialize_falls_back_to_source(
+    parsed_soli: SOLI, path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    loads = []
+
+    def load_source(*_args, **_kwargs) -> SOLI:
+        loads.append(1)
+        return parsed_soli
+
+    monkeypatch.setattr(api_module, "load_source", load_source)
+    soli_config = {
+        "source": "http",
+        "url": "https://example.org/soli.owl",
+        "snapshot": {"path": str(path)},
+    }
+    llm_config = {"type": "none"}
+
+    # a fresh snapshot is used as is
+    assert api_module.initialize_soli(soli_config, llm_config) is not parsed_soli
+    assert not loads
+
+    # a corrupt one is replaced from the source
+    path.write_bytes(b"not a pickle")
+    assert api_module.initialize_soli(soli_config, llm_config) is parsed_soli
+    assert len(loads) == 1
+    assert load_snapshot(path, SOURCE) is not None
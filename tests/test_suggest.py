@@ -0,0 +1,125 @@
+"""
+Tests for the typeahead prefix index.
+"""
+
+# imports
+from typing import Callable, Dict, List, Optional, Tuple
+
+# packages
+import pytest
+
+# project
+from soli_api.suggest import MAX_SUGGEST_LIMIT, SuggestIndex, fold_text
+
+# label, preferred label and alternative labels of each class, by class name
+LABELS: Dict[str, Tuple[Optional[str], Optional[str], List[str]]] = {
+    "lease": ("Lease", None, ["Lease Agreement", "Leasehold"]),
+    "commercial_lease": ("Commercial Lease", None, []),
+    "leasehold": ("Leasehold Estate", None, []),
+    "leasing": (None, "Leasing Contract", []),
+    "tenancy": ("Tenancy", None, ["Lease of Land"]),
+    "release": ("Release", None, []),
+    "etat": ("État Civil", None, []),
+}
+
+
+@pytest.fixture(name="graph")
+def fixture_graph(make_graph: Callable):
+    """
+    Build a graph with labels, preferred labels and alternative labels.
+
+    Returns:
+        FakeGraph: Graph
+    """
+    graph = make_graph({name: [] for name in LABELS})
+    for owl_class, (label, preferred_label, alternative_labels) in zip(
+        graph.classes, LABELS.values()
+    ):
+        owl_class.label = label
+        owl_class.preferred_label = preferred_label
+        owl_class.alternative_labels = alternative_labels
+    return graph
+
+
+@pytest.fixture(name="index", params=[0, 3, 10], ids=["search", "short", "long"])
+def fixture_index(request: pytest.FixtureRequest, graph) -> SuggestIndex:
+    """
+    Build the index with no, short and long precomputed prefixes, so queries take
+    both the precomputed and the sorted-search paths.
+
+    Returns:
+        SuggestIndex: Index
+    """
+    return SuggestIndex(graph, precompute_length=request.param)
+
+
+def test_fold_text() -> None:
+    assert fold_text("État Civil") == "etat civil"
+    assert fold_text("STRASSE") == fold_text("Straße")
+
+
+def test_prefix_ranking(index: SuggestIndex) -> None:
+    # whole-label matches first, shorter labels first, then word matches
+    assert [
+        (suggestion["label"], suggestion["matched_label"])
+        for suggestion in index.suggest("lease")
+    ] == [
+        ("Lease", "Lease"),
+        ("Tenancy", "Lease of Land"),
+        ("Leasehold Estate", "Leasehold Estate"),
+        ("Commercial Lease", "Commercial Lease"),
+    ]
+
+    # labels of the same length go before preferred labels
+    assert [suggestion["label"] for suggestion in index.suggest("lea")] == [
+        "Lease",
+        "Tenancy",
+        "Leasehold Estate",
+        "Leasing Contract",
+        "Commercial Lease",
+    ]
+
+    # matches only start at word boundaries
+    assert [suggestion["label"] for suggestion in index.suggest("rel")] == ["Release"]
+    assert not index.suggest("ease")
+
+
+def test_one_suggestion_per_class(graph, index: SuggestIndex) -> None:
+    suggestions = index.suggest("leaseh")
+    assert [suggestion["iri"] for suggestion in suggestions] == [
+        graph.iri("lease"),
+        graph.iri("leasehold"),
+    ]
+    # the best-ranked label that matched
+    assert suggestions[0]["label"] == "Lease"
+    assert suggestions[0]["matched_label"] == "Leasehold"
+
+    suggestions = index.suggest("l")
+    assert len({suggestion["iri"] for suggestion in suggestions}) == len(suggestions)
+
+
+@pytest.mark.parametrize("query", ["etat", "ÉTAT", "État c", "  etat  ", "civil"])
+def test_case_and_diacritics(graph, index: SuggestIndex, query: str) -> None:
+    assert index.suggest(query) == [
+        {
+            "iri": graph.iri("etat"),
+            "label": "État Civil",
+            "matched_label": "État Civil",
+        }
+    ]
+
+
+def test_limit(make_graph: Callable, index: SuggestIndex) -> None:
+    assert [suggestion["label"] for suggestion in index.suggest("lease", limit=2)] == [
+        "Lease",
+        "Tenancy",
+    ]
+    assert not index.suggest("lease", limit=0)
+    assert not index.suggest("", limit=5)
+
+    graph = make_graph({f"lease {number:02d}": [] for number in range(40)})
+    for precompute_length in (0, 3):
+        suggestions = SuggestIndex(graph, precompute_length).suggest("lease", limit=100)
+        assert [suggestion["label"] for suggestion in suggestions] == [
+            f"lease {number:02d}" for number in range(MAX_SUGGEST_LIMIT)
+        ]
@@ -0,0 +1,131 @@
+"""
+Tests for the taxonomy branch listings.
+"""
+
+# imports
+import json
+from typing import Callable
+
+# packages
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from soli import SOLITypes
+from soli.graph import SOLI_TYPE_IRIS
+
+# project
+import soli_api.routes.taxonomy
+from soli_api.branches import BranchMetrics
+from soli_api.cache import LRUCache
+from soli_api.closure import ClosureIndex
+from soli_api.graph_index import GraphIndex
+from soli_api.materialize import ClassRenderCache
+
+# short IRI of the Area of Law branch root
+AREA_OF_LAW = SOLI_TYPE_IRIS[SOLITypes.AREA_OF_LAW]
+
+
+@pytest.fixture(name="client")
+def fixture_client(make_graph: Callable) -> TestClient:
+    """
+    Serve the taxonomy routes over a branch where one class has two parents.
+
+    Returns:
+        TestClient: Client for the app
+    """
+    graph = make_graph(
+        {
+            AREA_OF_LAW: [],
+            "property": [AREA_OF_LAW],
+            "contract": [AREA_OF_LAW],
+            "lease": ["property", "contract"],
+            "sublease": ["lease"],
+        }
+    )
+    app = FastAPI()
+    app.include_router(soli_api.routes.taxonomy.router)
+    app.state.soli = graph
+    app.state.closure_index = ClosureIndex(GraphIndex(graph))
+    app.state.taxonomy_cache = LRUCache()
+    app.state.render_cache = ClassRenderCache(graph, mode="off")
+    return TestClient(app)
+
+
+def labels(classes: list) -> list:
+    """
+    Get the labels of serialized classes.
+
+    Returns:
+        list: Labels
+    """
+    return [owl_class["label"] for owl_class in classes]
+
+
+def test_branch_lists_each_class_once(client: TestClient) -> None:
+    response = client.get("/taxonomy/area_of_law", params={"max_depth": 3})
+    assert response.status_code == 200
+    assert labels(response.json()["classes"]) == [
+        "property",
+        "contract",
+        "lease",
+        "sublease",
+    ]
+
+
+def test_branch_max_depth(client: TestClient) -> None:
+    response = client.get("/taxonomy/area_of_law")
+    assert labels(response.json()["classes"]) == ["property", "contract"]
+
+    response = client.get("/taxonomy/area_of_law", params={"max_depth": -1})
+    assert len(response.json()["classes"]) == 4
+
+    response = client.get("/taxonomy/area_of_law", params={"max_depth": 0})
+    assert not response.json()["classes"]
+
+
+def test_branch_page(client: TestClient) -> None:
+    response = client.get(
+        "/taxonomy/area_of_law",
+        params={"max_depth": 3, "offset": 1, "limit": 2, "fields": "label"},
+    )
+    assert response.json() == {"classes": [{"label": "contract"}, {"label": "lease"}]}
+
+
+def test_branch_ndjson(client: TestClient) -> None:
+    response = client.get(
+        "/taxonomy/area_of_law",
+        params={"max_depth": 3, "offset": 2},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert labels(json.loads(line) for line in response.text.splitlines()) == [
+        "lease",
+        "sublease",
+    ]
+
+
+def test_unknown_branch(client: TestClient) -> None:
+    assert client.get("/taxonomy/unknown").status_code == 404
+
+
+def test_branch_metrics(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    metrics = BranchMetrics()
+    monkeypatch.setattr(soli_api.routes.taxonomy, "BRANCH_METRICS", metrics)
+    client.get("/taxonomy/area_of_law")
+    client.get("/taxonomy/area-of-law", params={"max_depth": 3})
+    client.get("/taxonomy/unknown")
+
+    stats = metrics.stats()
+    assert list(stats) == ["taxonomy"]
+    assert stats["taxonomy"]["area_of_law"]["requests"] == 2
+    assert stats["taxonomy"]["area_of_law"]["errors"] == 0
+    assert stats["taxonomy"]["area_of_law"]["p95"] > 0
+
+
+def test_branch_metrics_count_errors() -> None:
+    metrics = BranchMetrics()
+    with pytest.raises(ValueError):
+        with metrics.track("llm", SOLITypes.AREA_OF_LAW):
+            raise ValueError("failed")
+    assert metrics.stats()["llm"]["area_of_law"]["requests"] == 1
+    assert metrics.stats()["llm"]["area_of_law"]["errors"] == 1